@@ -3,12 +3,13 @@ Production Async Redis Cache with Circuit Breaker & Connection Pooling
 Reliability Level: HIGH
 """
 import asyncio
+import hashlib
 import time
-from typing import Any, Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, List
 import logging
 from datetime import datetime
 from redis.asyncio import ConnectionPool, Redis
-from redis.exceptions import RedisError, ConnectionError
+from redis.exceptions import RedisError, ConnectionError, NoScriptError
 
 from .cache_keys import CacheKeyBuilder, CacheNamespace
 from .serializer import CacheSerializer, SerializationType
@@ -83,23 +84,23 @@ class AsyncRedisCache:
             "connection_errors": 0
         }
         
+        # SHA1 of each Lua script run through eval_script
+        self._script_shas: Dict[str, str] = {}
+        
         # Don't connect immediately - use lazy connection
         self._is_connected = False
 
     async def _ensure_connected(self):
-        """Ensure Redis connection is established"""
-        if self._is_connected and self.redis_client:
-            try:
-                await self.redis_client.ping()
-                return True
-            except (ConnectionError, RedisError):
-                self._is_connected = False
-                self.redis_client = None
-                self.connection_pool = None
+        """
+        Ensure Redis connection is established
         
-        if not self._is_connected:
-            return await self._connect()
-        return True
+        No PING per operation: the pool checks idle connections itself
+        (health_check_interval), and a failed operation marks the client
+        disconnected so the next call reconnects.
+        """
+        if self._is_connected and self.redis_client:
+            return True
+        return await self._connect()
 
     async def _connect(self) -> bool:
         """Establish connection to Redis"""
@@ -122,7 +123,7 @@ class AsyncRedisCache:
             )
             
             # Create Redis client with connection pool
-            self.redis_client = Redis.from_pool(self.connection_pool)
+            self.redis_client = Redis(connection_pool=self.connection_pool)
             
             # Test connection
             await self.redis_client.ping()
@@ -266,6 +267,39 @@ class AsyncRedisCache:
             
         return await self._execute_with_circuit_breaker(_flush_pattern)
 
+    async def pipeline(self, build: Callable[[Any], None], transaction: bool = True) -> List[Any]:
+        """
+        Queue commands with build(pipe) and send them in one round trip
+        (MULTI/EXEC when transaction is True). Values are raw bytes: callers
+        that pipeline do their own encoding.
+        """
+        self._metrics["operations"] += 1
+
+        async def _pipeline():
+            pipe = self.redis_client.pipeline(transaction=transaction)
+            build(pipe)
+            return await pipe.execute()
+
+        return await self._execute_with_circuit_breaker(_pipeline)
+
+    async def eval_script(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """
+        Run a Lua script atomically on the server. EVALSHA first, so the
+        script body is only sent again after a server restart or SCRIPT FLUSH.
+        """
+        self._metrics["operations"] += 1
+        sha = self._script_shas.get(script)
+        if sha is None:
+            sha = self._script_shas[script] = hashlib.sha1(script.encode('utf-8')).hexdigest()
+
+        async def _eval_script():
+            try:
+                return await self.redis_client.evalsha(sha, len(keys), *keys, *args)
+            except NoScriptError:
+                return await self.redis_client.eval(script, len(keys), *keys, *args)
+
+        return await self._execute_with_circuit_breaker(_eval_script)
+
     # Utility Methods
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
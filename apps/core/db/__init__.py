@@ -11,6 +11,9 @@ from .decorators import (
     with_timeout,
     circuit_breaker
 )
+from .optimistic import cas_update, optimistic_update
+from .counting import CountMode, CountResult, CountStrategy
+from .partitions import MonthlyPartitioner
 from .manager import SafeManager, UserManager, SermonManager, EventManager, DonationManager
 
 __all__ = [
@@ -31,5 +34,11 @@ __all__ = [
     'UserManager',
     'SermonManager',
     'EventManager',
-    'DonationManager'
+    'DonationManager',
+    'cas_update',
+    'optimistic_update',
+    'CountMode',
+    'CountResult',
+    'CountStrategy',
+    'MonthlyPartitioner'
 ]
\ No newline at end of file
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+from enum import Enum
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+
+logger = logging.getLogger('core.db.counting')
+
+
+class CountMode(str, Enum):
+    """How paginated list totals are obtained."""
+    EXACT = "exact"          # COUNT(*) every time
+    CACHED = "cached"        # COUNT(*) cached per query, invalidated by model tag on writes
+    ESTIMATED = "estimated"  # planner/statistics estimate once the table passes a threshold
+
+
+class CountResult(int):
+    """
+    Row count that remembers how it was obtained.
+
+    Behaves as a plain int, so existing ``(items, total)`` tuple consumers keep
+    working; ``exact`` tells the response whether the total is a guess and
+    ``has_next`` (when known) comes from fetching ``limit + 1`` rows.
+    """
+
+    def __new__(cls, value: int, exact: bool = True, has_next: Optional[bool] = None):
+        obj = super().__new__(cls, max(int(value), 0))
+        obj.exact = exact
+        obj.has_next = has_next
+        return obj
+
+    def __repr__(self):
+        return f"CountResult({int(self)}, exact={self.exact}, has_next={self.has_next})"
+
+
+class CountStrategy:
+    """
+    Count strategy for paginated querysets.
+
+    Cached counts are keyed by the query's SQL and a per-model tag version;
+    any save/delete of a watched model bumps the version so stale totals are
+    never served. In cached mode models are watched from AppConfig.ready() so
+    every process bumps the shared tag; queryset .update() and bulk writes send no signals
+    and call invalidate() themselves. Estimated counts fall back to an exact COUNT(*) while the
+    table is below ``estimate_threshold`` rows.
+    """
+
+    TAG_KEY = "count:tag:{tag}"
+    COUNT_KEY = "count:{tag}:{version}:{digest}"
+    TABLE_ESTIMATE_KEY = "count:table:{alias}:{table}"
+
+    _watched_models = set()
+
+    def __init__(
+        self,
+        mode: CountMode = CountMode.EXACT,
+        cache_ttl: int = 300,
+        estimate_threshold: int = 100_000,
+        estimate_ttl: int = 60
+    ):
+        self.mode = CountMode(mode)
+        self.cache_ttl = cache_ttl
+        self.estimate_threshold = estimate_threshold
+        self.estimate_ttl = estimate_ttl
+
+    @classmethod
+    def from_settings(cls) -> 'CountStrategy':
+        """Build the strategy configured by PAGINATION_COUNT_* settings"""
+        return cls(
+            mode=getattr(settings, 'PAGINATION_COUNT_MODE', CountMode.EXACT),
+            cache_ttl=getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 300),
+            estimate_threshold=getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 100_000),
+        )
+
+    # ============ PUBLIC API ============
+
+    def count(self, queryset) -> CountResult:
+        """Count a queryset according to the configured mode (synchronous)"""
+        if self.mode == CountMode.CACHED:
+            return self._cached_count(queryset)
+        if self.mode == CountMode.ESTIMATED:
+            return self._estimated_count(queryset)
+        return CountResult(queryset.count())
+
+    @classmethod
+    def invalidate(cls, model) -> None:
+        """
+        Bump the tag version for a model so cached counts are recomputed.
+
+        A no-op for models nothing watches: without a cached count mode there
+        is no cached total to refresh.
+        """
+        if model not in cls._watched_models:
+            return
+        key = cls.TAG_KEY.format(tag=model._meta.label_lower)
+        try:
+            if not cache.add(key, 2, None):
+                cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Count tag invalidation failed for {key}: {e}")
+
+    # ============ CACHED ============
+
+    def _cached_count(self, queryset) -> CountResult:
+        model = queryset.model
+        self._watch(model)
+        tag = model._meta.label_lower
+
+        try:
+            version = cache.get(self.TAG_KEY.format(tag=tag), 1)
+            key = self.COUNT_KEY.format(tag=tag, version=version, digest=self._query_digest(queryset))
+            total = cache.get(key)
+            if total is None:
+                total = queryset.count()
+                cache.set(key, total, self.cache_ttl)
+        except Exception as e:
+            logger.warning(f"Cached count unavailable for {tag}, counting directly: {e}")
+            total = queryset.count()
+
+        return CountResult(total)
+
+    @classmethod
+    def watch(cls, *models) -> None:
+        """Invalidate cached counts of `models` on post_save/post_delete (call from AppConfig.ready)"""
+        for model in models:
+            cls._watch(model)
+
+    @classmethod
+    def _watch(cls, model) -> None:
+        if model in cls._watched_models:
+            return
+        cls._watched_models.add(model)
+        uid = f"count-invalidate-{model._meta.label_lower}"
+        post_save.connect(_invalidate_on_write, sender=model, dispatch_uid=uid, weak=False)
+        post_delete.connect(_invalidate_on_write, sender=model, dispatch_uid=uid, weak=False)
+
+    @staticmethod
+    def _query_digest(queryset) -> str:
+        sql, params = queryset.query.sql_with_params()
+        raw = json.dumps([sql, [str(p) for p in params]])
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    # ============ ESTIMATED ============
+
+    def _estimated_count(self, queryset) -> CountResult:
+        alias = queryset.db
+        table_rows = self._table_estimate(queryset.model, alias)
+
+        if table_rows is None or table_rows < self.estimate_threshold:
+            return CountResult(queryset.count())
+
+        if not queryset.query.where:
+            return CountResult(table_rows, exact=False)
+
+        estimate = self._explain_estimate(queryset, alias)
+        if estimate is None:
+            return CountResult(queryset.count())
+        return CountResult(min(estimate, table_rows), exact=False)
+
+    def _table_estimate(self, model, alias: str) -> Optional[int]:
+        """Row estimate from table statistics (information_schema / pg_class)"""
+        table = model._meta.db_table
+        key = self.TABLE_ESTIMATE_KEY.format(alias=alias, table=table)
+
+        try:
+            estimate = cache.get(key)
+            if estimate is not None:
+                return estimate
+        except Exception:
+            pass
+
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'mysql':
+                    cursor.execute(
+                        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                        [table]
+                    )
+                elif connection.vendor == 'postgresql':
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+                else:
+                    return None
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Table estimate failed for {table}: {e}")
+            return None
+
+        estimate = int(row[0]) if row and row[0] is not None else None
+        if estimate is not None:
+            try:
+                cache.set(key, estimate, self.estimate_ttl)
+            except Exception:
+                pass
+        return estimate
+
+    def _explain_estimate(self, queryset, alias: str) -> Optional[int]:
+        """Row estimate for a filtered queryset from the planner's EXPLAIN output"""
+        connection = connections[alias]
+        sql, params = queryset.order_by().query.sql_with_params()
+
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'mysql':
+                    cursor.execute(f"EXPLAIN {sql}", params)
+                    columns = [col[0].lower() for col in cursor.description]
+                    row = cursor.fetchone()
+                    if not row:
+                        return None
+                    plan = dict(zip(columns, row))
+                    rows = float(plan.get('rows') or 0)
+                    filtered = float(plan.get('filtered') or 100)
+                    return int(rows * filtered / 100)
+                if connection.vendor == 'postgresql':
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    return int(plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f"EXPLAIN estimate failed for {queryset.model.__name__}: {e}")
+        return None
+
+
+def _invalidate_on_write(sender, **kwargs):
+    CountStrategy.invalidate(sender)
@@ -40,32 +40,29 @@ class DatabaseErrorHandler:
     def handle_operation(self, operation: Callable[..., T]) -> Callable[..., T]:
         """
         Decorator for synchronous database operations
+
+        Context is only built on the exception path, so the happy path
+        costs a single try/except around the wrapped call.
         """
         @wraps(operation)
         def wrapper(*args, **kwargs) -> T:
-            operation_name = operation.__name__
-            context = self._build_context(operation, args, kwargs)
-            
             try:
                 return operation(*args, **kwargs)
             except Exception as e:
-                self._handle_exception(e, context)
+                self._handle_exception(e, self._build_context(operation, args, kwargs))
         
         return wrapper
     
-    async def handle_async_operation(self, operation: Callable[..., Coroutine[T, Any, Any]]) -> Callable[..., Coroutine[T, Any, Any]]:
+    def handle_async_operation(self, operation: Callable[..., Coroutine[T, Any, Any]]) -> Callable[..., Coroutine[T, Any, Any]]:
         """
         Async version of the operation handler
         """
         @wraps(operation)
         async def async_wrapper(*args, **kwargs) -> T:
-            operation_name = operation.__name__
-            context = self._build_context(operation, args, kwargs)
-            
             try:
                 return await operation(*args, **kwargs)
             except Exception as e:
-                self._handle_exception(e, context)
+                self._handle_exception(e, self._build_context(operation, args, kwargs))
         
         return async_wrapper
     
@@ -301,7 +298,7 @@ class DatabaseErrorHandler:
         
         try:
             frame = inspect.currentframe()
-            # Go back 3 frames: current -> _build_context -> handle_operation -> caller
+            # Go back 3 frames: current -> _build_context -> wrapper -> caller
             for _ in range(3):
                 if frame:
                     frame = frame.f_back
@@ -1,6 +1,6 @@
-from django.db import models
+from django.db import connections, models
 from django.core.exceptions import ObjectDoesNotExist, ValidationError, MultipleObjectsReturned
-from typing import List, Any, Dict, Optional, TypeVar, Generic
+from typing import List, Any, Callable, Dict, Optional, TypeVar, Generic
 from datetime import datetime
 
 from apps.tcc.usecase.domain_exception.u_exceptions import UserNotFoundException
@@ -10,7 +10,9 @@ from apps.core.core_exceptions.domain import (
     BusinessRuleException
 )
 from .db_handler import db_error_handler
-from .decorators import with_retry, atomic_operation, read_operation, write_operation
+from .decorators import atomic_operation, read_operation, write_operation
+from .counting import CountStrategy
+from .optimistic import cas_update, optimistic_update
 
 T = TypeVar('T', bound=models.Model)
 
@@ -87,23 +89,30 @@ class SafeManager(models.Manager):
         """Safe exists check"""
         return self.filter(**kwargs).exists()
     
-    @with_retry(max_attempts=3)
     def atomic_update(self, **kwargs) -> T:
         """
-        Perform atomic update with proper locking and retry capability
+        Update fields on one row with an optimistic compare-and-swap on
+        `version` - no row lock, retried on conflict (see optimistic_update)
         """
-        from django.db import transaction
-        
         pk = kwargs.pop('pk', None)
         if not pk:
             raise ValueError("Primary key (pk) is required for atomic update")
         
-        with transaction.atomic():
-            obj = self.select_for_update().get(pk=pk)
-            for key, value in kwargs.items():
-                setattr(obj, key, value)
-            obj.save()
-            return obj
+        return self.optimistic_update(pk, lambda obj: kwargs)
+    
+    def optimistic_update(self, pk, mutate: Callable[[T], Dict[str, Any]]) -> T:
+        """
+        Read-modify-write for contended rows (fund balances, registrations):
+        `mutate(obj)` returns the new field values from a fresh read
+        """
+        return optimistic_update(self.all(), pk, mutate)
+    
+    def cas_update(self, pk, expected_version: int, **values) -> int:
+        """
+        Single conditional UPDATE against a version the caller already holds;
+        raises ConcurrencyException instead of retrying
+        """
+        return cas_update(self.all(), pk, expected_version, **values)
     
     @db_error_handler.handle_operation
     def safe_filter(self, **kwargs):
@@ -145,6 +154,158 @@ class SafeManager(models.Manager):
                 }
             ) from e
     
+    # ============ BULK OPERATIONS ============
+    
+    def _assign_snowflake_ids(self, objs: List[T]) -> None:
+        """Fill missing primary keys from one Snowflake block allocation"""
+        from apps.tcc.utils.snowflake import allocate_snowflake_id_block
+        
+        missing = [obj for obj in objs if obj.pk is None]
+        if missing:
+            for obj, snowflake_id in zip(missing, allocate_snowflake_id_block(len(missing))):
+                obj.pk = snowflake_id
+    
+    def _resolve_update_fields(self, field_names) -> Dict[str, models.Field]:
+        """Map field names to concrete, non-pk model fields for bulk writes"""
+        fields, errors = {}, {}
+        for name in field_names:
+            try:
+                field = self.model._meta.get_field(name)
+            except Exception:
+                errors[name] = ["Unknown field"]
+                continue
+            if field.primary_key or not field.concrete or field.many_to_many:
+                errors[name] = ["Field cannot be bulk updated"]
+                continue
+            fields[field.name] = field
+        
+        if errors:
+            raise DomainValidationException(
+                message=f"Invalid bulk update fields for {self.model.__name__}",
+                field_errors=errors,
+                details={'model': self.model.__name__}
+            )
+        return fields
+    
+    @write_operation
+    def bulk_upsert(
+        self,
+        objs: List[T],
+        unique_fields: List[str],
+        update_fields: List[str],
+        batch_size: int = 1000
+    ) -> List[T]:
+        """
+        Insert objects, updating `update_fields` on rows that collide on
+        `unique_fields` (INSERT ... ON DUPLICATE KEY UPDATE on MySQL,
+        ON CONFLICT (...) DO UPDATE on PostgreSQL/SQLite).
+        
+        MySQL cannot name a conflict target: any unique key of the table
+        triggers the update there, so `unique_fields` is only passed to
+        backends that support it.
+        
+        Build objects with id=None to have their Snowflake IDs allocated in
+        one block instead of one generator call per instance. Model save()
+        and full_clean are bypassed - validate the input beforehand.
+        
+        The returned objects keep the IDs allocated here: for rows that hit a
+        conflict the pk does NOT match the existing row - look those up by
+        their unique fields if you need the stored IDs.
+        
+        Rows updated on conflict get `version` bumped in a second UPDATE in
+        the same transaction (the upsert's row locks are still held), so a
+        concurrent cas_update holding the old version fails instead of
+        overwriting the upserted values.
+        """
+        objs = list(objs)
+        if not objs:
+            return []
+        if not update_fields:
+            raise DomainValidationException(
+                message="bulk_upsert requires at least one update field",
+                field_errors={'update_fields': ["This field is required"]}
+            )
+        
+        fields = self._resolve_update_fields(update_fields)
+        if 'updated_at' not in fields and any(f.name == 'updated_at' for f in self.model._meta.concrete_fields):
+            fields['updated_at'] = self.model._meta.get_field('updated_at')
+        
+        self._assign_snowflake_ids(objs)
+        conflict_target = {}
+        if connections[self.db].features.supports_update_conflicts_with_target:
+            conflict_target['unique_fields'] = unique_fields
+        created = self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            update_fields=list(fields),
+            **conflict_target
+        )
+        if any(f.name == 'version' for f in self.model._meta.concrete_fields):
+            self._bump_conflicted_versions(objs, unique_fields, batch_size)
+        # bulk_create sends no post_save
+        CountStrategy.invalidate(self.model)
+        return created
+    
+    def _bump_conflicted_versions(self, objs: List[T], unique_fields: List[str], batch_size: int) -> int:
+        """Bump version on rows matching `objs` by unique fields but not by pk, i.e. updated on conflict"""
+        from django.db.models import F, Q
+        
+        attnames = [self.model._meta.get_field(name).attname for name in unique_fields]
+        queryset = self.model._base_manager.using(self.db)
+        bumped = 0
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            matches = Q()
+            for obj in batch:
+                matches |= Q(**{attname: getattr(obj, attname) for attname in attnames})
+            bumped += queryset.filter(matches).exclude(
+                pk__in=[obj.pk for obj in batch]
+            ).update(version=F('version') + 1)
+        return bumped
+    
+    @write_operation
+    def bulk_update_values(self, pk_to_values: Dict[Any, Dict[str, Any]], batch_size: int = 500) -> int:
+        """
+        Apply per-row values with one UPDATE ... SET f = CASE id WHEN ... END per batch.
+        
+        Rows that do not mention a field keep their current value. Bumps
+        `version` and `updated_at` like save() does, without loading any rows.
+        Returns the number of rows updated.
+        """
+        from django.db.models import Case, When, Value, F
+        from django.utils import timezone
+        
+        if not pk_to_values:
+            return 0
+        
+        field_names = {name for values in pk_to_values.values() for name in values}
+        fields = self._resolve_update_fields(field_names)
+        model_fields = {f.name for f in self.model._meta.concrete_fields}
+        
+        items = list(pk_to_values.items())
+        updated = 0
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            assignments = {}
+            for name, field in fields.items():
+                whens = [
+                    When(pk=pk, then=Value(values[name], output_field=field))
+                    for pk, values in batch if name in values
+                ]
+                assignments[field.attname] = Case(*whens, default=F(field.attname), output_field=field)
+            
+            if 'version' in model_fields and 'version' not in fields:
+                assignments['version'] = F('version') + 1
+            if 'updated_at' in model_fields and 'updated_at' not in fields:
+                assignments['updated_at'] = timezone.now()
+            
+            updated += self.filter(pk__in=[pk for pk, _ in batch]).update(**assignments)
+        
+        if updated:
+            CountStrategy.invalidate(self.model)
+        return updated
+    
     def get_recently_modified(self, hours: int = 24):
         """
         Get objects modified in the last specified hours
@@ -152,6 +313,24 @@ class SafeManager(models.Manager):
         from django.utils import timezone
         cutoff_time = timezone.now() - timezone.timedelta(hours=hours)
         return self.filter(updated_at__gte=cutoff_time)
+    
+    def created_between(self, start=None, end=None):
+        """
+        Get objects created in [start, end) as a primary-key range
+        
+        Snowflake IDs are generated at creation, so the bounds come from the
+        IDs instead of a secondary index on created_at. updated_at has no such
+        relation to the ID, so modification windows still use their column.
+        """
+        from apps.tcc.utils.snowflake import snowflake_range_lookup
+        return self.filter(**snowflake_range_lookup(start, end))
+    
+    def get_recently_created(self, hours: int = 24):
+        """
+        Get objects created in the last specified hours (primary-key range)
+        """
+        from django.utils import timezone
+        return self.created_between(start=timezone.now() - timezone.timedelta(hours=hours))
 
 
 # Specialized managers for different domains
@@ -187,18 +366,12 @@ class UserManager(SafeManager):
         """
         return self.filter(role=role, is_active=True)
     
-    @with_retry(max_attempts=2)
     def deactivate_user(self, user_id: int) -> bool:
         """
-        Deactivate user with retry capability
+        Deactivate user with an optimistic version check (retried on conflict)
         """
-        from django.db import transaction
-        
-        with transaction.atomic():
-            user = self.select_for_update().get(pk=user_id)
-            user.is_active = False
-            user.save()
-            return True
+        self.atomic_update(pk=user_id, is_active=False)
+        return True
 
 
 class SermonManager(SafeManager):
@@ -287,6 +460,19 @@ class DonationManager(SafeManager):
             donation_date__gte=start_date
         ).order_by('-donation_date')
     
+    @db_error_handler.handle_operation
+    def find_recently_recorded_donations(self, days: int = 30):
+        """
+        Find donations recorded in the last specified days, newest first
+        
+        Uses the Snowflake primary key. donation_date is entered by staff and
+        may be backdated, so find_recent_donations keeps filtering on it.
+        """
+        from django.utils import timezone
+        from datetime import timedelta
+        
+        return self.created_between(start=timezone.now() - timedelta(days=days)).order_by('-id')
+    
     @db_error_handler.handle_operation
     def find_by_user(self, user_id: int):
         """
@@ -0,0 +1,177 @@
+import logging
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+Month = Tuple[int, int]
+
+
+def add_months(month: Month, delta: int) -> Month:
+    """(year, month) shifted by `delta` months"""
+    index = month[0] * 12 + (month[1] - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_of(value) -> Month:
+    return value.year, value.month
+
+
+def iter_months(first: Month, last: Month) -> Iterator[Month]:
+    """Months from `first` to `last`, both inclusive"""
+    current = first
+    while current <= last:
+        yield current
+        current = add_months(current, 1)
+
+
+def month_start(month: Month) -> datetime:
+    return datetime(month[0], month[1], 1, tzinfo=dt_timezone.utc)
+
+
+def _snowflake_floor(when) -> int:
+    from apps.tcc.utils.snowflake import snowflake_id_floor
+    return snowflake_id_floor(when)
+
+
+def _snowflake_datetime(key: int) -> datetime:
+    from apps.tcc.utils.snowflake import get_snowflake_generator
+    generator = get_snowflake_generator()
+    millis = (key >> generator.TIMESTAMP_SHIFT) + int(generator.epoch)
+    return datetime.fromtimestamp(millis / 1000, tz=dt_timezone.utc)
+
+
+class MonthlyPartitioner:
+    """
+    Monthly RANGE partitions on a time-ordered primary key (Snowflake IDs).
+
+    Partition ``pYYYYMM`` holds keys below the first key of the following
+    month; ``pmax`` catches everything newer and is split ahead of time by
+    ensure_partitions(). Because the key itself encodes the write time, no
+    extra column has to join the primary key and old months are removed
+    with DROP PARTITION instead of DELETE.
+
+    Only MySQL is supported; elsewhere `is_supported` is False and callers
+    fall back to range deletes on the same key bounds.
+    """
+
+    MAXVALUE_PARTITION = "pmax"
+
+    def __init__(
+        self,
+        model,
+        key_floor: Callable = _snowflake_floor,
+        key_time: Callable = _snowflake_datetime,
+        using: str = "default"
+    ):
+        self.model = model
+        self.key_floor = key_floor
+        self.key_time = key_time
+        self.using = using
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def is_supported(self) -> bool:
+        return self.connection.vendor == "mysql"
+
+    # ============ BOUNDS ============
+
+    @staticmethod
+    def partition_name(month: Month) -> str:
+        return f"p{month[0]:04d}{month[1]:02d}"
+
+    def month_bounds(self, month: Month) -> Tuple[int, int]:
+        """[low, high) primary-key range of rows written during `month`"""
+        return self.key_floor(month_start(month)), self.key_floor(month_start(add_months(month, 1)))
+
+    # ============ INSPECTION ============
+
+    def list_partitions(self) -> List[str]:
+        """Partition names in range order; empty if the table is not partitioned"""
+        if not self.is_supported:
+            return []
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION",
+                [self.table]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def is_partitioned(self) -> bool:
+        return bool(self.list_partitions())
+
+    def has_partition(self, month: Month) -> bool:
+        return self.partition_name(month) in self.list_partitions()
+
+    # ============ DDL ============
+
+    def _definitions(self, months) -> str:
+        parts = [
+            f"PARTITION {self.partition_name(month)} VALUES LESS THAN ({self.month_bounds(month)[1]})"
+            for month in months
+        ]
+        parts.append(f"PARTITION {self.MAXVALUE_PARTITION} VALUES LESS THAN MAXVALUE")
+        return ", ".join(parts)
+
+    def partition_table(self, first: Month, months_ahead: int = 3) -> List[str]:
+        """Partition an unpartitioned table from `first` until `months_ahead` months from now"""
+        months = list(iter_months(first, add_months(month_of(date.today()), months_ahead)))
+        pk = self.model._meta.pk.column
+        qn = self.connection.ops.quote_name
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {qn(self.table)} PARTITION BY RANGE ({qn(pk)}) ({self._definitions(months)})"
+            )
+        logger.info(f"Partitioned {self.table} into {len(months)} monthly partitions")
+        return [self.partition_name(month) for month in months]
+
+    def ensure_partitions(self, months_ahead: int = 3) -> List[str]:
+        """Split pmax so every month up to `months_ahead` from now has its own partition"""
+        existing = self.list_partitions()
+        monthly = [name for name in existing if name != self.MAXVALUE_PARTITION]
+        if not monthly:
+            return []
+
+        last = int(monthly[-1][1:5]), int(monthly[-1][5:7])
+        wanted = list(iter_months(add_months(last, 1), add_months(month_of(date.today()), months_ahead)))
+        if not wanted:
+            return []
+
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {qn(self.table)} REORGANIZE PARTITION {self.MAXVALUE_PARTITION} "
+                f"INTO ({self._definitions(wanted)})"
+            )
+        created = [self.partition_name(month) for month in wanted]
+        logger.info(f"Added partitions to {self.table}: {', '.join(created)}")
+        return created
+
+    def drop_partition(self, month: Month) -> None:
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(self.table)} DROP PARTITION {self.partition_name(month)}")
+        logger.info(f"Dropped partition {self.partition_name(month)} of {self.table}")
+
+    def remove_partitioning(self) -> None:
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(self.table)} REMOVE PARTITIONING")
+
+    def oldest_month(self) -> Optional[Month]:
+        """Month of the oldest row by primary key, or None for an empty table"""
+        first = self.model._base_manager.using(self.using).order_by('pk').values_list('pk', flat=True).first()
+        return month_of(self.key_time(first)) if first is not None else None
@@ -0,0 +1,210 @@
+"""
+Bcrypt on a dedicated process pool, with admission control.
+
+bcrypt at cost 12 is ~250 ms of CPU. On the shared thread executor it holds
+the GIL often enough that a burst of logins starves every other request in
+the worker. BcryptHasher runs hashing in a small ProcessPoolExecutor instead
+and bounds the work it accepts: at most `max_workers` hashes run and
+`max_queue` wait; anything beyond that is shed immediately with
+HasherOverloaded (503 + Retry-After by default) rather than queueing behind
+seconds of CPU work. Requests that have already waited `max_wait` seconds
+in the queue are dropped before they reach a worker, since their client has
+likely given up.
+
+The worker functions are module level so they pickle; workers start with
+"forkserver" (or "spawn") so they never inherit the parent's threads or
+event loop. Hash time is measured inside the worker; queue wait is the rest
+of the round trip.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import statistics
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+import bcrypt
+
+from ..core_exceptions.domain import DomainException
+
+logger = logging.getLogger(__name__)
+
+
+class HasherOverloaded(DomainException):
+    """The hashing queue is full (or a request waited too long); the client should retry"""
+
+    def __init__(self, retry_after: int = 1, status_code: int = 503):
+        self.retry_after = retry_after
+        super().__init__(
+            message="Password hashing capacity exhausted",
+            error_code="HASHER_OVERLOADED",
+            status_code=status_code,
+            details={"retry_after": retry_after},
+            user_message="The service is busy. Please try again shortly.",
+        )
+
+
+def _hash_in_worker(password: bytes, rounds: int, submitted_at: float, max_wait: float) -> Tuple[Optional[bytes], float]:
+    if max_wait and time.time() - submitted_at > max_wait:
+        return None, 0.0
+    start = time.perf_counter()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+    return hashed, time.perf_counter() - start
+
+
+def _check_in_worker(password: bytes, hashed: bytes, submitted_at: float, max_wait: float) -> Tuple[Optional[bool], float]:
+    if max_wait and time.time() - submitted_at > max_wait:
+        return None, 0.0
+    start = time.perf_counter()
+    valid = bcrypt.checkpw(password, hashed)
+    return valid, time.perf_counter() - start
+
+
+def bcrypt_rounds(hashed: str) -> Optional[int]:
+    """Cost factor of a $2a$/$2b$/$2y$ hash, or None if it is not bcrypt"""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class BcryptHasher:
+    def __init__(self,
+                 rounds: int = 12,
+                 max_workers: Optional[int] = None,
+                 max_queue: int = 32,
+                 max_wait: float = 5.0,
+                 shed_status: int = 503,
+                 use_processes: bool = True):
+        self.rounds = rounds
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.shed_status = shed_status
+        self.use_processes = use_processes
+
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._queue_waits = deque(maxlen=1000)
+        self._hash_times = deque(maxlen=1000)
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "shed": 0,
+            "expired": 0,
+            "pool_restarts": 0,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Hashes accepted at once: one running per worker plus the queue"""
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _retry_after(self) -> int:
+        # time for the queue ahead to drain, from the recent hash time
+        per_hash = statistics.fmean(self._hash_times) if self._hash_times else 0.25
+        return max(1, round(per_hash * self._pending / self.max_workers))
+
+    async def _run(self, func, *args) -> Any:
+        if self._pending >= self.capacity:
+            self._metrics["shed"] += 1
+            raise HasherOverloaded(self._retry_after(), self.shed_status)
+
+        self._pending += 1
+        self._metrics["submitted"] += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                result, hash_time = await loop.run_in_executor(
+                    self._get_executor(), func, *args, time.time(), self.max_wait
+                )
+            except BrokenProcessPool:
+                # a worker died (OOM kill etc.); start a fresh pool for the next call
+                self._metrics["pool_restarts"] += 1
+                self._executor = None
+                raise
+        finally:
+            self._pending -= 1
+
+        if result is None:
+            self._metrics["expired"] += 1
+            raise HasherOverloaded(self._retry_after(), self.shed_status)
+
+        self._metrics["completed"] += 1
+        self._hash_times.append(hash_time)
+        self._queue_waits.append(max(0.0, time.perf_counter() - start - hash_time))
+        return result
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash_in_worker, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_check_in_worker, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True when the hash was made with a different cost than the configured rounds"""
+        rounds = bcrypt_rounds(hashed)
+        return rounds is not None and rounds != self.rounds
+
+    def has_headroom(self) -> bool:
+        """True while less than half the capacity is in use (for optional work like rehashing)"""
+        return self._pending < self.capacity // 2
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        def summary(samples):
+            if not samples:
+                return {"avg_ms": 0.0, "p99_ms": 0.0}
+            ordered = sorted(samples)
+            return {
+                "avg_ms": round(statistics.fmean(ordered) * 1000, 3),
+                "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+            }
+
+        return {
+            **self._metrics,
+            "rounds": self.rounds,
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "queue_wait": summary(self._queue_waits),
+            "hash_time": summary(self._hash_times),
+        }
+
+
+_password_hasher: Optional[BcryptHasher] = None
+
+
+def get_password_hasher() -> BcryptHasher:
+    """Process-wide hasher configured from settings (BCRYPT_ROUNDS, PASSWORD_HASHER_*)"""
+    global _password_hasher
+    if _password_hasher is None:
+        from django.conf import settings
+        _password_hasher = BcryptHasher(
+            rounds=getattr(settings, "BCRYPT_ROUNDS", 12),
+            max_workers=getattr(settings, "PASSWORD_HASHER_WORKERS", None),
+            max_queue=getattr(settings, "PASSWORD_HASHER_MAX_QUEUE", 32),
+            max_wait=getattr(settings, "PASSWORD_HASHER_MAX_WAIT", 5.0),
+            shed_status=getattr(settings, "PASSWORD_HASHER_SHED_STATUS", 503),
+        )
+    return _password_hasher
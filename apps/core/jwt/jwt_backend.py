@@ -1,15 +1,20 @@
+import base64
 import os
 import uuid
 import secrets
-import json
 from typing import Optional, Tuple, Dict, Any, List
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import jwt
 from enum import Enum
 from django.core.cache import cache
 from asgiref.sync import sync_to_async
 
+from .key_rotation import KeySet, SigningKey
+from .session_store import RefreshSessionStore
+from .token_cache import VerifiedTokenCache
+from .token_epochs import UserTokenEpochs, get_user_token_epochs
+
 logger = logging.getLogger(__name__)
 
 class TokenType(Enum):
@@ -28,8 +33,13 @@ class TokenConfig:
         reset_token_expiry: int = None,
         algorithm: str = None,
         secret_key: str = None,
+        private_key: str = None,
+        public_key: str = None,
+        key_id: str = None,
         issuer: str = None,
-        audience: List[str] = None
+        audience: List[str] = None,
+        verify_cache_size: int = None,
+        verify_cache_ttl: int = None
     ):
         # Load from environment with defaults
         self.access_token_expiry = access_token_expiry or int(os.getenv('JWT_ACCESS_EXPIRY', 900))
@@ -37,8 +47,16 @@ class TokenConfig:
         self.reset_token_expiry = reset_token_expiry or int(os.getenv('JWT_RESET_EXPIRY', 1800))
         self.algorithm = algorithm or os.getenv('JWT_ALGORITHM', 'HS256')
         self.secret_key = secret_key or os.getenv('JWT_SECRET_KEY', self._get_default_secret_key())
+        # EdDSA / RS256: PEM (or base64 of PEM); a public key alone makes a verify-only config
+        self.private_key = private_key or os.getenv('JWT_PRIVATE_KEY') or None
+        self.public_key = public_key or os.getenv('JWT_PUBLIC_KEY') or None
+        self.key_id = key_id or os.getenv('JWT_KEY_ID') or None
+        self.key_set: Optional[KeySet] = None
         self.issuer = issuer or os.getenv('JWT_ISSUER', 'tcc-auth-service')
         self.audience = audience or os.getenv('JWT_AUDIENCE', 'tcc-api').split(',')
+        # Verified-token LRU: 0 entries disables it
+        self.verify_cache_size = verify_cache_size if verify_cache_size is not None else int(os.getenv('JWT_VERIFY_CACHE_SIZE', 10000))
+        self.verify_cache_ttl = verify_cache_ttl if verify_cache_ttl is not None else int(os.getenv('JWT_VERIFY_CACHE_TTL', 60))
         
         self._validate_config()
     
@@ -50,6 +68,27 @@ class TokenConfig:
         except ImportError:
             return secrets.token_urlsafe(64)
     
+    @staticmethod
+    def _load_pem(value: Optional[str]) -> Optional[str]:
+        """PEM from an env value: escaped newlines or base64-encoded PEM are accepted"""
+        if not value:
+            return None
+        value = value.strip().replace('\\n', '\n')
+        if not value.startswith('-----'):
+            try:
+                value = base64.b64decode(value).decode('utf-8')
+            except ValueError:
+                raise ValueError("JWT key is neither PEM nor base64-encoded PEM")
+        return value
+    
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.key_set is not None
+    
+    @property
+    def signing_key(self) -> Optional[SigningKey]:
+        return self.key_set.signing_key if self.key_set else None
+    
     def _validate_config(self):
         """Validate JWT configuration"""
         if self.algorithm == "HS256":
@@ -57,10 +96,19 @@ class TokenConfig:
                 raise ValueError("secret_key is required for HS256 algorithm")
             if len(self.secret_key) < 32:
                 logger.warning("HS256 secret key is shorter than recommended 32 characters")
-        elif self.algorithm.startswith("RS"):
-            logger.warning(f"RS256 algorithm requires key rotation setup. Using HS256 for development.")
-            self.algorithm = "HS256"
-            self.secret_key = self.secret_key or secrets.token_urlsafe(64)
+        elif self.algorithm in ("EdDSA", "RS256"):
+            if not (self.private_key or self.public_key):
+                logger.warning(f"{self.algorithm} algorithm requires JWT_PRIVATE_KEY. Using HS256 for development.")
+                self.algorithm = "HS256"
+                self.secret_key = self.secret_key or secrets.token_urlsafe(64)
+                return
+            # parsed once; signing and verification reuse the key objects
+            key = SigningKey.from_pem(
+                self._load_pem(self.private_key), self._load_pem(self.public_key), kid=self.key_id
+            )
+            if key.algorithm != self.algorithm:
+                raise ValueError(f"JWT key is a {key.algorithm} key but JWT_ALGORITHM is {self.algorithm}")
+            self.key_set = KeySet([key])
         else:
             raise ValueError(f"Unsupported algorithm: {self.algorithm}")
 
@@ -69,10 +117,43 @@ class JWTManager:
     Core JWT Token Management
     """
     
-    def __init__(self, config: TokenConfig):
+    def __init__(
+        self,
+        config: TokenConfig,
+        token_cache: VerifiedTokenCache = None,
+        token_epochs: UserTokenEpochs = None,
+        session_store: RefreshSessionStore = None
+    ):
         self.config = config
+        self.token_cache = token_cache or VerifiedTokenCache(
+            maxsize=self.config.verify_cache_size,
+            ttl=self.config.verify_cache_ttl
+        )
+        # per-user "tokens valid after" epochs; must outlive the longest token
+        self.token_epochs = token_epochs or get_user_token_epochs()
+        self.token_epochs.retention = max(self.token_epochs.retention, self.config.refresh_token_expiry)
+        self.session_store = session_store or RefreshSessionStore(ttl=self.config.refresh_token_expiry)
         logger.info(f"JWTManager initialized with {self.config.algorithm} algorithm")
     
+    def _sign(self, payload: Dict) -> str:
+        """Encode with the shared secret, or the current key object with its kid in the header"""
+        key = self.config.signing_key
+        if key is None:
+            if self.config.is_asymmetric:
+                raise RuntimeError("No private key configured: this instance can only verify tokens")
+            return jwt.encode(payload, self.config.secret_key, algorithm=self.config.algorithm)
+        return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+    
+    def _verification_key(self, token: str) -> Tuple[Any, str]:
+        """Key and algorithm named by the token's kid header (the secret for HS256)"""
+        if not self.config.is_asymmetric:
+            return self.config.secret_key, self.config.algorithm
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.config.key_set.get(kid) if kid else None
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key.public_key, key.algorithm
+    
     def generate_access_token(
         self, 
         user_id: str,
@@ -81,7 +162,7 @@ class JWTManager:
         session_id: str = None
     ) -> str:
         """Create access token"""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         expires = now + timedelta(seconds=self.config.access_token_expiry)
         
         payload = {
@@ -91,21 +172,16 @@ class JWTManager:
             "roles": roles or [],
             "session_id": session_id or str(uuid.uuid4()),
             "jti": secrets.token_urlsafe(32),
-            "iat": int(now.timestamp()),
+            "iat": round(now.timestamp(), 3),
             "exp": int(expires.timestamp()),
             "iss": self.config.issuer,
             "aud": self.config.audience[0] if self.config.audience else "tcc-api",
         }
         
-        return jwt.encode(
-            payload, 
-            self.config.secret_key, 
-            algorithm=self.config.algorithm
-        )
+        return self._sign(payload)
     
-    def generate_refresh_token(self, user_id: str, email: str, session_id: str = None) -> str:
-        """Create refresh token"""
-        now = datetime.utcnow()
+    def _encode_refresh_token(self, user_id: str, email: str, session_id: str = None) -> Tuple[str, Dict]:
+        now = datetime.now(timezone.utc)
         expires = now + timedelta(seconds=self.config.refresh_token_expiry)
         
         payload = {
@@ -114,39 +190,66 @@ class JWTManager:
             "email": email,
             "session_id": session_id or str(uuid.uuid4()),
             "jti": secrets.token_urlsafe(32),
-            "iat": int(now.timestamp()),
+            "iat": round(now.timestamp(), 3),
             "exp": int(expires.timestamp()),
             "iss": self.config.issuer,
             "aud": self.config.audience[0] if self.config.audience else "tcc-api"
         }
         
-        token = jwt.encode(
-            payload, 
-            self.config.secret_key, 
-            algorithm=self.config.algorithm
-        )
+        token = self._sign(payload)
+        return token, payload
+    
+    async def generate_refresh_token(
+        self,
+        user_id: str,
+        email: str,
+        session_id: str = None,
+        metadata: Dict[str, Any] = None
+    ) -> str:
+        """Create refresh token and register it in the session store"""
+        token, payload = self._encode_refresh_token(user_id, email, session_id)
         
-        # Store refresh token in cache
-        cache_key = f"refresh_token:{user_id}:{payload['jti']}"
-        cache_data = {
-            "token": token,
-            "user_id": user_id,
-            "session_id": payload['session_id'],
-            "created_at": now.isoformat()
-        }
+        try:
+            await self.session_store.create(
+                user_id, payload["jti"], payload["session_id"], metadata=metadata
+            )
+        except Exception as e:
+            # Login still succeeds; the token just cannot be refreshed
+            logger.error(f"Failed to store refresh token for user {user_id}: {e}")
         
-        # Use sync_to_async for Django cache
-        sync_to_async(cache.set)(
-            cache_key, 
-            json.dumps(cache_data), 
-            self.config.refresh_token_expiry
-        )
+        return token
+    
+    async def rotate_refresh_token(self, payload: Dict, metadata: Dict[str, Any] = None) -> str:
+        """
+        Exchange a verified refresh token payload for its successor.
         
+        Raises RefreshTokenReused if the presented token was already rotated
+        or revoked (its whole session is revoked as well).
+        """
+        token, new_payload = self._encode_refresh_token(
+            payload["sub"], payload.get("email"), payload.get("session_id")
+        )
+        await self.session_store.rotate(
+            payload["sub"],
+            payload["jti"],
+            new_payload["jti"],
+            new_payload["session_id"],
+            metadata=metadata
+        )
         return token
     
-    def generate_reset_token(self, user_id: str, email: str) -> str:
+    async def verify_refresh_token(self, token: str) -> Optional[Dict]:
+        """Verified refresh token payload, or None"""
+        is_valid, payload = await self.averify_token(token, TokenType.REFRESH)
+        return payload if is_valid else None
+    
+    async def list_sessions(self, user_id: str) -> List[Dict[str, Any]]:
+        """Active refresh-token sessions of a user, oldest first"""
+        return await self.session_store.list_sessions(user_id)
+    
+    async def generate_reset_token(self, user_id: str, email: str) -> str:
         """Create password reset token"""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         expires = now + timedelta(seconds=self.config.reset_token_expiry)
         
         payload = {
@@ -161,15 +264,11 @@ class JWTManager:
             "purpose": "password_reset"
         }
         
-        token = jwt.encode(
-            payload, 
-            self.config.secret_key, 
-            algorithm=self.config.algorithm
-        )
+        token = self._sign(payload)
         
         # Store reset token in cache
         cache_key = f"reset_token:{user_id}"
-        sync_to_async(cache.set)(
+        await cache.aset(
             cache_key, 
             token, 
             self.config.reset_token_expiry
@@ -178,12 +277,29 @@ class JWTManager:
         return token
     
     def verify_token(self, token: str, token_type: TokenType = None) -> Tuple[bool, Optional[Dict]]:
-        """Verify token signature and claims"""
+        """
+        Verify token signature and claims
+        
+        A token verified before (same bytes, not expired) is answered from the
+        in-process cache without decoding it again. Tokens issued before their
+        user's revocation epoch are rejected either way, cached or not.
+        """
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            if token_type and cached.get('token_type') != token_type.value:
+                logger.warning(f"Token type mismatch: expected {token_type.value}, got {cached.get('token_type')}")
+                return False, None
+            if self.token_epochs.is_revoked(cached):
+                logger.warning(f"Token revoked by user epoch: user={cached.get('sub')}")
+                return False, None
+            return True, dict(cached)
+        
         try:
+            key, algorithm = self._verification_key(token)
             payload = jwt.decode(
                 token,
-                self.config.secret_key,
-                algorithms=[self.config.algorithm],
+                key,
+                algorithms=[algorithm],
                 issuer=self.config.issuer,
                 audience=self.config.audience[0] if self.config.audience else None
             )
@@ -193,7 +309,11 @@ class JWTManager:
                 logger.warning(f"Token type mismatch: expected {token_type.value}, got {payload.get('token_type')}")
                 return False, None
             
-            return True, payload
+            self.token_cache.put(token, payload)
+            if self.token_epochs.is_revoked(payload):
+                logger.warning(f"Token revoked by user epoch: user={payload.get('sub')}")
+                return False, None
+            return True, dict(payload)
             
         except jwt.ExpiredSignatureError:
             logger.warning("Token verification failed: expired")
@@ -205,6 +325,43 @@ class JWTManager:
             logger.error(f"Token verification error: {e}")
             return False, None
     
+    def can_verify_inline(self, token: str) -> bool:
+        """
+        True if verifying `token` needs no I/O: it is in the verified-token
+        cache and its user's revocation epoch is held locally
+        """
+        payload = self.token_cache.peek(token)
+        return payload is not None and self.token_epochs.is_known(payload.get('sub'))
+    
+    async def averify_token(self, token: str, token_type: TokenType = None) -> Tuple[bool, Optional[Dict]]:
+        """verify_token for async callers: inline when no I/O is needed, otherwise in a worker thread"""
+        if self.can_verify_inline(token):
+            return self.verify_token(token, token_type)
+        return await sync_to_async(self.verify_token, thread_sensitive=False)(token, token_type)
+    
+    def revoke_user_tokens(self, user_id: str) -> float:
+        """Revoke every token issued to the user so far (one cache write, no JTI list)"""
+        return self.token_epochs.bump(user_id)
+    
+    async def revoke_all_sessions(self, user_id: str) -> float:
+        """Revoke every token of a user and clear their refresh sessions"""
+        valid_after = await sync_to_async(self.revoke_user_tokens)(user_id)
+        try:
+            await self.session_store.revoke_all(user_id)
+        except Exception as e:
+            # the epoch already rejects them; this only tidies list_sessions
+            logger.warning(f"Failed to clear refresh sessions for user {user_id}: {e}")
+        return valid_after
+    
+    def get_jwks(self) -> Tuple[bytes, str]:
+        """JWKS document (JSON bytes) and its ETag; empty for HS256"""
+        key_set = self.config.key_set or KeySet()
+        return key_set.jwks_json, key_set.jwks_etag
+    
+    def get_verify_cache_stats(self) -> Dict[str, Any]:
+        """Verified-token cache hit rate and size"""
+        return self.token_cache.get_stats()
+    
     def decode_token(self, token: str) -> Optional[Dict]:
         """Decode token without verification (for internal use)"""
         try:
@@ -259,7 +416,7 @@ class JWTBackend:
                 session_id=session_id
             )
             
-            refresh_token = self.jwt_manager.generate_refresh_token(
+            refresh_token = await self.jwt_manager.generate_refresh_token(
                 user_id=user_id,
                 email=email,
                 session_id=session_id
@@ -287,6 +444,30 @@ class JWTBackend:
     ) -> Tuple[bool, Optional[Dict]]:
         """
         Verify token with optional type checking
+        
+        Runs inline when can_verify_inline says no I/O is needed; otherwise
+        (a user whose revocation epoch must be read) in a worker thread, so
+        the event loop never waits on the cache.
+        """
+        if self.can_verify_inline(token):
+            return self.verify_token_sync(token, token_type)
+        return await sync_to_async(self.verify_token_sync, thread_sensitive=False)(token, token_type)
+    
+    def can_verify_inline(self, token: str) -> bool:
+        """True if verifying `token` needs no I/O (see JWTManager.can_verify_inline)"""
+        return self.jwt_manager.can_verify_inline(token)
+    
+    def verify_token_sync(
+        self,
+        token: str,
+        token_type: TokenType = None
+    ) -> Tuple[bool, Optional[Dict]]:
+        """
+        Verify token with optional type checking, without awaiting anything
+        
+        Verification is CPU work plus, for a user not seen before, one cache
+        read of their revocation epoch; async callers check can_verify_inline
+        and run everything else in a thread.
         """
         try:
             # Verify token signature and claims
@@ -318,7 +499,7 @@ class JWTBackend:
             
             # Check expiration
             exp = payload.get('exp')
-            if exp and datetime.utcnow().timestamp() > exp:
+            if exp and datetime.now(timezone.utc).timestamp() > exp:
                 logger.warning("Token expired")
                 return False
             
@@ -338,22 +519,24 @@ class JWTBackend:
             if not is_valid:
                 raise ValueError("Invalid refresh token")
             
-            # Check if refresh token exists in cache
-            cache_key = f"refresh_token:{payload['sub']}:{payload.get('jti')}"
-            cached_data = await sync_to_async(cache.get)(cache_key)
+            # Rotate: the presented token stops working, reuse revokes the session
+            new_refresh_token = await self.jwt_manager.rotate_refresh_token(payload)
             
-            if not cached_data:
-                logger.warning(f"Refresh token not found in cache: jti={payload.get('jti')}")
-                raise ValueError("Refresh token invalid or expired")
-            
-            # Create new tokens
-            return await self.create_tokens(
+            access_token = self.jwt_manager.generate_access_token(
                 user_id=payload['sub'],
                 email=payload['email'],
                 roles=payload.get('roles', []),
                 session_id=payload.get('session_id')
             )
             
+            return {
+                "access_token": access_token,
+                "refresh_token": new_refresh_token,
+                "token_type": "Bearer",
+                "expires_in": self.config.access_token_expiry,
+                "session_id": payload.get('session_id')
+            }
+            
         except Exception as e:
             logger.error(f"Token refresh failed: {e}")
             raise
@@ -361,8 +544,7 @@ class JWTBackend:
     async def revoke_refresh_token(self, user_id: str, jti: str) -> bool:
         """Revoke specific refresh token"""
         try:
-            cache_key = f"refresh_token:{user_id}:{jti}"
-            await sync_to_async(cache.delete)(cache_key)
+            await self.jwt_manager.session_store.revoke(user_id, jti)
             logger.info(f"Refresh token revoked: user={user_id}, jti={jti}")
             return True
         except Exception as e:
@@ -370,9 +552,9 @@ class JWTBackend:
             return False
     
     async def revoke_all_user_refresh_tokens(self, user_id: str) -> bool:
-        """Revoke all refresh tokens for a user"""
+        """Revoke all refresh (and access) tokens for a user by bumping their epoch"""
         try:
-            # Note: This is simplified. In production, track all active jtis for each user
+            await self.jwt_manager.revoke_all_sessions(user_id)
             logger.info(f"All refresh tokens revoked for user: {user_id}")
             return True
         except Exception as e:
@@ -388,7 +570,7 @@ class JWTBackend:
         
         # Check if reset token exists in cache
         cache_key = f"reset_token:{payload['sub']}"
-        cached_token = await sync_to_async(cache.get)(cache_key)
+        cached_token = await cache.aget(cache_key)
         
         if not cached_token or cached_token != token:
             return False, None
@@ -399,7 +581,7 @@ class JWTBackend:
         """Invalidate password reset token"""
         try:
             cache_key = f"reset_token:{user_id}"
-            await sync_to_async(cache.delete)(cache_key)
+            await cache.adelete(cache_key)
             return True
         except Exception as e:
             logger.error(f"Failed to invalidate reset token: {e}")
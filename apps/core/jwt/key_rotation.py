@@ -1,15 +1,152 @@
+import base64
+import hashlib
+import json
 import time
 import secrets
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 from apps.core.cache.async_cache import AsyncRedisCache
 
 logger = logging.getLogger(__name__)
 
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _int_to_base64url(value: int) -> str:
+    return _b64url(value.to_bytes((value.bit_length() + 7) // 8, byteorder='big'))
+
+
+class SigningKey:
+    """
+    One parsed key pair. PEM is parsed once here; signing and verification
+    use the key objects, never the PEM text.
+    """
+    
+    ALGORITHMS = {ed25519.Ed25519PublicKey: 'EdDSA', rsa.RSAPublicKey: 'RS256'}
+    
+    def __init__(self, public_key, private_key=None, kid: str = None, algorithm: str = None):
+        self.public_key = public_key
+        self.private_key = private_key
+        self.algorithm = algorithm or next(
+            (alg for key_type, alg in self.ALGORITHMS.items() if isinstance(public_key, key_type)), None
+        )
+        if self.algorithm is None:
+            raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
+        self.kid = kid or self._thumbprint()
+        self.jwk = self._to_jwk()
+    
+    @classmethod
+    def from_pem(cls, private_pem: str = None, public_pem: str = None, kid: str = None) -> 'SigningKey':
+        private_key = None
+        if private_pem:
+            private_key = serialization.load_pem_private_key(private_pem.encode(), password=None)
+            public_key = private_key.public_key()
+        elif public_pem:
+            public_key = serialization.load_pem_public_key(public_pem.encode())
+        else:
+            raise ValueError("A private or public PEM key is required")
+        return cls(public_key, private_key, kid=kid)
+    
+    @classmethod
+    def generate(cls, algorithm: str = 'EdDSA', kid: str = None, key_size: int = 2048) -> 'SigningKey':
+        if algorithm == 'EdDSA':
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        elif algorithm == 'RS256':
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+        else:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        return cls(private_key.public_key(), private_key, kid=kid)
+    
+    def private_pem(self) -> Optional[str]:
+        if self.private_key is None:
+            return None
+        return self.private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ).decode('utf-8')
+    
+    def public_pem(self) -> str:
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode('utf-8')
+    
+    def _public_members(self) -> Dict[str, str]:
+        # the required JWK members only, in the order RFC 7638 hashes them
+        if self.algorithm == 'EdDSA':
+            raw = self.public_key.public_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PublicFormat.Raw
+            )
+            return {"crv": "Ed25519", "kty": "OKP", "x": _b64url(raw)}
+        numbers = self.public_key.public_numbers()
+        return {"e": _int_to_base64url(numbers.e), "kty": "RSA", "n": _int_to_base64url(numbers.n)}
+    
+    def _thumbprint(self) -> str:
+        """RFC 7638 JWK thumbprint: a kid every process derives identically"""
+        canonical = json.dumps(self._public_members(), separators=(',', ':'), sort_keys=True)
+        return _b64url(hashlib.sha256(canonical.encode()).digest())
+    
+    def _to_jwk(self) -> Dict[str, str]:
+        return {**self._public_members(), "use": "sig", "kid": self.kid, "alg": self.algorithm}
+
+
+class KeySet:
+    """
+    Signing keys by kid. The current key signs; every key verifies tokens
+    whose header names its kid. The JWKS document, its JSON body and its
+    ETag are rebuilt only when the set changes.
+    """
+    
+    def __init__(self, keys: List[SigningKey] = None, current_kid: str = None):
+        self._keys: Dict[str, SigningKey] = {}
+        self.current_kid = None
+        for key in keys or []:
+            self._keys[key.kid] = key
+        self.current_kid = current_kid or next(
+            (key.kid for key in reversed(keys or []) if key.private_key is not None), None
+        )
+        self._rebuild()
+    
+    def add(self, key: SigningKey, current: bool = False) -> None:
+        self._keys[key.kid] = key
+        if current:
+            if key.private_key is None:
+                raise ValueError("The current key must have a private key")
+            self.current_kid = key.kid
+        self._rebuild()
+    
+    def remove(self, kid: str) -> None:
+        if kid == self.current_kid:
+            raise ValueError("Cannot remove the current signing key")
+        if self._keys.pop(kid, None) is not None:
+            self._rebuild()
+    
+    def _rebuild(self) -> None:
+        self.jwks = {"keys": [key.jwk for key in self._keys.values()]}
+        self.jwks_json = json.dumps(self.jwks, separators=(',', ':'), sort_keys=True).encode()
+        self.jwks_etag = '"' + hashlib.sha256(self.jwks_json).hexdigest()[:32] + '"'
+    
+    @property
+    def signing_key(self) -> Optional[SigningKey]:
+        return self._keys.get(self.current_kid) if self.current_kid else None
+    
+    def get(self, kid: str) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+    
+    def kids(self) -> List[str]:
+        return list(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
 class KeyRotationManager:
     """
     Production-grade JWT Key Rotation Management
@@ -17,12 +154,14 @@ class KeyRotationManager:
     Responsibilities: Key generation, rotation, lifecycle management
     """
     
-    def __init__(self, cache=None, rotation_interval: int = 86400):
+    def __init__(self, cache=None, rotation_interval: int = 86400, algorithm: str = 'EdDSA'):
         self.cache = cache
         self.rotation_interval = rotation_interval
+        self.algorithm = algorithm
         self.current_key_id = None
         self.key_pairs: Dict[str, Tuple[str, str]] = {}
         self.key_metadata: Dict[str, Dict] = {}
+        self.key_set = KeySet()
         self._initialized = False
 
     async def initialize(self):
@@ -55,10 +194,19 @@ class KeyRotationManager:
                 self.key_pairs = keys_data.get('key_pairs', {})
                 self.key_metadata = keys_data.get('key_metadata', {})
                 self.current_key_id = keys_data.get('current_key_id')
+                self._load_key_set()
                 logger.info(f"Loaded {len(self.key_pairs)} key pairs from cache")
         except Exception as e:
             logger.error(f"Failed to load keys from cache: {e}")
 
+    def _load_key_set(self):
+        """Parse the stored PEM pairs once into key objects"""
+        keys = [
+            SigningKey.from_pem(private_pem, public_pem, kid=key_id)
+            for key_id, (private_pem, public_pem) in self.key_pairs.items()
+        ]
+        self.key_set = KeySet(keys, current_kid=self.current_key_id)
+
     async def _save_keys_to_cache(self):
         """Save keys to cache storage"""
         try:
@@ -99,17 +247,18 @@ class KeyRotationManager:
         return private_pem, public_pem
 
     async def _generate_new_key_pair(self, key_size: int = 2048) -> str:
-        """Generate new RSA key pair and store"""
-        private_pem, public_pem = self._generate_rsa_key_pair(key_size)
-        key_id = secrets.token_urlsafe(16)
+        """Generate a new key pair (Ed25519 unless algorithm is RS256) and store"""
+        key = SigningKey.generate(self.algorithm, kid=secrets.token_urlsafe(16), key_size=key_size)
+        key_id = key.kid
         
-        self.key_pairs[key_id] = (private_pem, public_pem)
+        self.key_pairs[key_id] = (key.private_pem(), key.public_pem())
         self.key_metadata[key_id] = {
             'created_at': datetime.utcnow().isoformat(),
-            'key_size': key_size,
-            'algorithm': 'RS256',
+            'key_size': key_size if key.algorithm == 'RS256' else 256,
+            'algorithm': key.algorithm,
             'status': 'active'
         }
+        self.key_set.add(key, current=True)
         self.current_key_id = key_id
         
         await self._save_keys_to_cache()
@@ -159,6 +308,7 @@ class KeyRotationManager:
             if key_id != self.current_key_id:
                 del self.key_pairs[key_id]
                 del self.key_metadata[key_id]
+                self.key_set.remove(key_id)
                 logger.info(f"Removed old key: {key_id}")
         
         await self._save_keys_to_cache()
@@ -180,45 +330,16 @@ class KeyRotationManager:
         """Get all public keys for verification"""
         return {key_id: key_pair[1] for key_id, key_pair in self.key_pairs.items()}
 
+    def get_signing_key(self, key_id: str = None) -> Optional[SigningKey]:
+        """Parsed key by ID, or the current signing key if not specified"""
+        return self.key_set.get(key_id) if key_id else self.key_set.signing_key
+
     def get_jwks(self) -> Dict[str, Any]:
         """
-        Get public keys in JWKS format
+        Get public keys in JWKS format (precomputed when the key set changes)
         Security Level: HIGH
         """
-        jwks = {"keys": []}
-        
-        for key_id, public_pem in self.get_all_public_keys().items():
-            from cryptography.hazmat.primitives.serialization import load_pem_public_key
-            public_key = load_pem_public_key(public_pem.encode(), backend=default_backend())
-            
-            # Extract RSA public numbers
-            public_numbers = public_key.public_numbers()
-            
-            jwk = {
-                "kty": "RSA",
-                "use": "sig",
-                "kid": key_id,
-                "n": self._int_to_base64url(public_numbers.n),
-                "e": self._int_to_base64url(public_numbers.e),
-                "alg": "RS256"
-            }
-            
-            jwks["keys"].append(jwk)
-        
-        return jwks
-
-    def _int_to_base64url(self, value: int) -> str:
-        """Convert integer to base64url string"""
-        import base64
-        from math import ceil
-        
-        # Calculate bytes needed
-        byte_length = ceil(value.bit_length() / 8)
-        bytes_value = value.to_bytes(byte_length, byteorder='big')
-        
-        # Convert to base64url
-        base64_bytes = base64.urlsafe_b64encode(bytes_value)
-        return base64_bytes.decode('ascii').rstrip('=')
+        return self.key_set.jwks
 
     async def get_key_rotation_status(self) -> Dict[str, Any]:
         """Get key rotation status"""
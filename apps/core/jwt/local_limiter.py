@@ -0,0 +1,112 @@
+"""
+In-process pre-limiter in front of the shared Redis rate limiter.
+
+Every worker keeps a token bucket per (action, identifier) in a bounded LRU.
+It only ever denies: an identifier that has drained its local bucket, or that
+Redis denied and whose block has not run out, is rejected without a round
+trip. Everything else goes to Redis, which stays the source of truth.
+
+The local bucket holds `factor` x the configured limit and refills at
+`factor` x the configured rate, so it only trips on traffic that is clearly
+over the limit from this worker alone - the fixed-window boundary burst
+(up to 2x the limit) included. Each Redis answer syncs the bucket, and a
+locally denied key is re-checked against Redis at most every
+`sync_interval` seconds, so a reset or an early window expiry is picked up.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at", "blocked_until", "synced_at")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated_at = now
+        self.blocked_until = 0.0
+        self.synced_at = 0.0
+
+
+class LocalPreLimiter:
+    def __init__(self, maxsize: int = 10000, factor: float = 2.0, sync_interval: float = 1.0):
+        self.maxsize = maxsize
+        self.factor = factor
+        self.sync_interval = sync_interval
+
+        self._buckets: "OrderedDict[tuple, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "local_checks": 0,
+            "local_denied": 0,
+            "forwarded": 0,
+            "syncs": 0,
+            "evictions": 0,
+        }
+
+    def _capacity(self, config) -> float:
+        return config.max_requests * self.factor
+
+    def check(self, identifier: str, action: str, config) -> Optional[float]:
+        """
+        Seconds to wait if the request can be denied locally, or None to ask Redis.
+        """
+        now = time.monotonic()
+        capacity = self._capacity(config)
+        rate = capacity / config.window_seconds
+        self._metrics["local_checks"] += 1
+
+        with self._lock:
+            key = (action, identifier)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(capacity, now)
+                if len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+                    self._metrics["evictions"] += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * rate)
+                bucket.updated_at = now
+
+            if bucket.blocked_until > now:
+                wait = bucket.blocked_until - now
+            elif bucket.tokens < 1:
+                wait = (1 - bucket.tokens) / rate
+            else:
+                bucket.tokens -= 1
+                self._metrics["forwarded"] += 1
+                return None
+
+            if now - bucket.synced_at >= self.sync_interval:
+                # stale local verdict: let this one through to Redis to resync
+                self._metrics["syncs"] += 1
+                self._metrics["forwarded"] += 1
+                return None
+
+        self._metrics["local_denied"] += 1
+        return wait
+
+    def sync(self, identifier: str, action: str, config, allowed: bool, remaining: int, retry_after: float) -> None:
+        """Fold a Redis verdict into the local bucket"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get((action, identifier))
+            if bucket is None:
+                return
+            bucket.synced_at = now
+            if allowed:
+                bucket.blocked_until = 0.0
+                # Redis has headroom the local estimate did not see
+                bucket.tokens = max(bucket.tokens, min(self._capacity(config), float(remaining)))
+            else:
+                bucket.blocked_until = now + retry_after
+
+    def get_stats(self) -> Dict[str, Any]:
+        checks = self._metrics["local_checks"]
+        return {
+            **self._metrics,
+            "size": len(self._buckets),
+            "local_deny_rate": round(self._metrics["local_denied"] / checks, 4) if checks else 0.0,
+        }
@@ -0,0 +1,177 @@
+"""
+Failed-login tracking and lockouts on the async Redis cache.
+
+Per user, three keys:
+
+* `login_failures:{user_id}`: failures since the last lockout or success
+  (TTL = failure_window, so stale failures age out)
+* `login_lockout:{user_id}`: present while the account is locked; its TTL
+  is the lock
+* `login_lockouts:{user_id}`: lockouts so far (TTL = history_ttl); the
+  n-th lockout lasts lockout_seconds * 2**(n-1), capped at max_lockout_seconds
+
+Recording a failure is one Lua script, so concurrent failures cannot skip
+past the threshold. The login path reads the lock and the history in one
+pipelined round trip and only writes again when there is something to clear.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from ..cache.async_cache import AsyncCache
+
+logger = logging.getLogger(__name__)
+
+
+# KEYS = failures, lockout, lockouts
+# ARGV = max_attempts, failure_window, lockout_seconds, max_lockout_seconds, history_ttl
+RECORD_FAILURE_SCRIPT = """
+local failures = redis.call('INCR', KEYS[1])
+if failures == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if failures < tonumber(ARGV[1]) then
+    return {failures, 0}
+end
+
+local lockouts = redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[5])
+local duration = math.floor(math.min(tonumber(ARGV[3]) * 2 ^ (lockouts - 1), tonumber(ARGV[4])))
+redis.call('SET', KEYS[2], lockouts, 'EX', duration)
+redis.call('DEL', KEYS[1])
+return {failures, duration}
+"""
+
+
+@dataclass(frozen=True)
+class LoginState:
+    """Lock and failure history of one user, read before the password check"""
+    locked_for: float = 0.0
+    has_history: bool = False
+
+    @property
+    def is_locked(self) -> bool:
+        return self.locked_for > 0
+
+
+@dataclass(frozen=True)
+class LoginFailure:
+    attempts: int
+    locked_for: int = 0
+
+    @property
+    def locked(self) -> bool:
+        return self.locked_for > 0
+
+
+class LoginAttemptTracker:
+    FAILURES_KEY = "login_failures:{user_id}"
+    LOCKOUT_KEY = "login_lockout:{user_id}"
+    LOCKOUTS_KEY = "login_lockouts:{user_id}"
+
+    def __init__(self,
+                 cache: AsyncCache = None,
+                 max_attempts: int = 5,
+                 failure_window: int = 900,
+                 lockout_seconds: int = 60,
+                 max_lockout_seconds: int = 3600,
+                 history_ttl: int = 86400):
+        self._cache = cache
+        self.max_attempts = max_attempts
+        self.failure_window = failure_window
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self.history_ttl = history_ttl
+        self._metrics = {
+            "failures": 0,
+            "lockouts": 0,
+            "locked_rejections": 0,
+            "cleared": 0,
+            "errors": 0,
+        }
+
+    @property
+    def cache(self) -> AsyncCache:
+        if self._cache is None:
+            from ..cache.async_cache import async_redis_cache
+            self._cache = async_redis_cache
+        return self._cache
+
+    def _keys(self, user_id):
+        return [
+            self.FAILURES_KEY.format(user_id=user_id),
+            self.LOCKOUT_KEY.format(user_id=user_id),
+            self.LOCKOUTS_KEY.format(user_id=user_id),
+        ]
+
+    async def get_state(self, user_id) -> LoginState:
+        """
+        Remaining lock and whether there is anything to clear on success.
+        Fails open (unlocked) when Redis is unavailable, like the rate limiter.
+        """
+        failures_key, lockout_key, lockouts_key = self._keys(user_id)
+
+        def build(pipe):
+            pipe.pttl(lockout_key)
+            pipe.exists(failures_key, lockouts_key)
+
+        try:
+            lock_ms, history = await self.cache.pipeline(build, transaction=False)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.error(f"Login state lookup failed for user {user_id}: {e}")
+            return LoginState()
+
+        state = LoginState(locked_for=max(lock_ms, 0) / 1000, has_history=bool(history))
+        if state.is_locked:
+            self._metrics["locked_rejections"] += 1
+        return state
+
+    async def record_failure(self, user_id) -> LoginFailure:
+        """Count a failed attempt; locks the account once max_attempts is reached"""
+        self._metrics["failures"] += 1
+        try:
+            attempts, locked_for = await self.cache.eval_script(
+                RECORD_FAILURE_SCRIPT,
+                self._keys(user_id),
+                [self.max_attempts, self.failure_window, self.lockout_seconds,
+                 self.max_lockout_seconds, self.history_ttl],
+            )
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.error(f"Failed to record login failure for user {user_id}: {e}")
+            return LoginFailure(attempts=0)
+
+        if locked_for:
+            self._metrics["lockouts"] += 1
+            logger.warning(f"User {user_id} locked for {locked_for}s after {attempts} failed logins")
+        return LoginFailure(attempts=int(attempts), locked_for=int(locked_for))
+
+    async def clear(self, user_id) -> bool:
+        """
+        Forget failures, lock and backoff history (successful login or password
+        reset). Returns True if the account had been locked.
+        """
+        failures_key, lockout_key, lockouts_key = self._keys(user_id)
+
+        def build(pipe):
+            pipe.delete(failures_key, lockout_key)
+            pipe.delete(lockouts_key)
+
+        try:
+            _, had_lockouts = await self.cache.pipeline(build)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.error(f"Failed to clear login failures for user {user_id}: {e}")
+            return False
+
+        self._metrics["cleared"] += 1
+        return bool(had_lockouts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "max_attempts": self.max_attempts,
+            "lockout_seconds": self.lockout_seconds,
+            "max_lockout_seconds": self.max_lockout_seconds,
+        }
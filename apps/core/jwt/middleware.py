@@ -1,38 +1,71 @@
-from django.http import JsonResponse
+import math
+import re
 import logging
-import asyncio
-from asgiref.sync import async_to_sync
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
 from apps.core.jwt.jwt_backend import JWTBackend, TokenType
 
 logger = logging.getLogger(__name__)
 
 
+def compile_path_prefixes(prefixes):
+    """
+    One anchored regex matching any of `prefixes`: a single C-level match per
+    request instead of a Python loop of startswith calls.
+    """
+    if not prefixes:
+        return None
+    # longest first so overlapping prefixes cannot shadow each other
+    ordered = sorted(set(prefixes), key=len, reverse=True)
+    return re.compile("|".join(re.escape(prefix) for prefix in ordered))
+
+
 class JWTAuthMiddleware:
     """
     Lightweight JWT authentication middleware for both ASGI and WSGI contexts.
     It validates incoming tokens, attaches user claims to the request object,
     and bypasses public routes that must remain open to unauthenticated access.
+
+    The middleware runs natively in whichever mode the handler chain uses.
+    In async mode a token already in the verified-token cache (with its
+    user's revocation epoch held locally) is checked inline - no thread hop
+    and no I/O. Any other token may need a cache read of the user's epoch,
+    so it is verified in a worker thread instead of on the event loop.
     """
 
+    sync_capable = True
+    async_capable = True
+
+    # Public endpoints that do not require authentication (JWT_PUBLIC_PATHS overrides)
+    PUBLIC_PATHS = (
+        "/tcc/health/",
+        "/tcc/auth/login/",
+        "/tcc/auth/register/",
+        "/tcc/auth/refresh/",
+        "/tcc/auth/verify/",
+        "/tcc/auth/forgot-password/",
+        "/tcc/auth/reset-password/",
+        "/tcc/auth/jwks/",
+        "/tcc/users/",
+        "/admin/",
+        "/static/",
+        "/media/",
+        "/tcc/",
+    )
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.jwt_backend = JWTBackend.get_instance()
 
-        # Public endpoints that do not require authentication
-        self.public_paths = [
-            "/tcc/health/",
-            "/tcc/auth/login/",
-            "/tcc/auth/register/",
-            "/tcc/auth/refresh/",
-            "/tcc/auth/verify/",
-            "/tcc/auth/forgot-password/",
-            "/tcc/auth/reset-password/",
-            "/tcc/users/",  
-            "/admin/",
-            "/static/",
-            "/media/",
-            "/tcc/"
-        ]
+        self.public_paths = tuple(getattr(settings, "JWT_PUBLIC_PATHS", self.PUBLIC_PATHS))
+        self._public_matcher = compile_path_prefixes(self.public_paths)
+
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     # ---------------------------------------------------------
     # Helpers
@@ -40,7 +73,7 @@ class JWTAuthMiddleware:
 
     def is_public(self, path: str) -> bool:
         """Return True if a path is explicitly whitelisted."""
-        return any(path.startswith(p) for p in self.public_paths)
+        return self._public_matcher is not None and self._public_matcher.match(path) is not None
 
     def extract_token(self, request) -> str | None:
         """Retrieve a JWT from the Authorization header or cookies."""
@@ -55,38 +88,18 @@ class JWTAuthMiddleware:
     # ---------------------------------------------------------
 
     def _verify_token(self, token: str):
-        """
-        Handles both sync and async contexts gracefully.
-        Returns (is_valid: bool, payload: dict).
-        """
+        """Returns (is_valid: bool, payload: dict)."""
         try:
-            # ASGI context
-            if hasattr(request := None, "_sync_async_hack"):  # noqa
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                result = loop.run_until_complete(
-                    self.jwt_backend.verify_token(token, TokenType.ACCESS)
-                )
-                loop.close()
-                return result
-
-            # WSGI context (sync)
-            return async_to_sync(self.jwt_backend.verify_token)(
-                token, TokenType.ACCESS
-            )
-
+            return self.jwt_backend.verify_token_sync(token, TokenType.ACCESS)
         except Exception as exc:
             logger.error(f"Token verification failed: {exc}")
             return False, None
 
-    # ---------------------------------------------------------
-    # Main middleware entry point
-    # ---------------------------------------------------------
-
-    def __call__(self, request):
+    def _authenticate(self, request):
+        """Attach claims to the request; returns a 401 response, or None to continue."""
         # Allow public endpoints without authentication
         if self.is_public(request.path):
-            return self.get_response(request)
+            return None
 
         # Extract token
         token = self.extract_token(request)
@@ -119,5 +132,109 @@ class JWTAuthMiddleware:
         request.session_id = payload.get("session_id")
 
         logger.debug(f"Authenticated user {request.user_id} → {request.path}")
+        return None
 
+    # ---------------------------------------------------------
+    # Main middleware entry points
+    # ---------------------------------------------------------
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        response = self._authenticate(request)
+        if response is not None:
+            return response
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        token = None if self.is_public(request.path) else self.extract_token(request)
+        if token is None or self.jwt_backend.can_verify_inline(token):
+            response = self._authenticate(request)
+        else:
+            response = await sync_to_async(self._authenticate, thread_sensitive=False)(request)
+        if response is not None:
+            return response
+        return await self.get_response(request)
+
+
+class RateLimitMiddleware:
+    """
+    Global rate limit on every request, by client IP, by authenticated user
+    and across all clients ('ip', 'user' and 'global' throttle rates). All
+    dimensions are checked in one atomic RateLimiter.check_many call and the
+    most restrictive one decides; a denial is a 429 with Retry-After.
+
+    Sits after JWTAuthMiddleware so request.user_id is known. Endpoint
+    specific limits (login, throttle_scope) stay with the DRF throttles.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    EXEMPT_PATHS = ("/static/", "/media/", "/tcc/health/")
+
+    def __init__(self, get_response):
+        from apps.core.jwt.throttling import get_rate_limiter
+
+        self.get_response = get_response
+        self.enabled = getattr(settings, "RATE_LIMIT_ENABLED", True)
+        self.limiter = get_rate_limiter()
+        self._exempt_matcher = compile_path_prefixes(getattr(settings, "RATE_LIMIT_EXEMPT_PATHS", self.EXEMPT_PATHS))
+
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def get_checks(self, request):
+        """check_many input for this request; empty when it is not limited."""
+        from apps.core.jwt.throttling import build_checks, client_ip
+
+        if not self.enabled:
+            return []
+        if self._exempt_matcher is not None and self._exempt_matcher.match(request.path):
+            return []
+        user_id = getattr(request, "user_id", None)
+        return build_checks([
+            ("ip", f"ip:{client_ip(request)}"),
+            ("user", f"user:{user_id}" if user_id else None),
+            ("global", "all"),
+        ])
+
+    def _denied(self, result):
+        retry_after = max(1, math.ceil(result.retry_after or 1))
+        response = JsonResponse(
+            {
+                "error": "Too many requests",
+                "message": f"Rate limit exceeded. Retry in {retry_after} seconds.",
+            },
+            status=429,
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    def _finish(self, result, response):
+        response["X-RateLimit-Limit"] = str(result.details.get("limit", ""))
+        response["X-RateLimit-Remaining"] = str(result.remaining)
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        checks = self.get_checks(request)
+        if not checks:
+            return self.get_response(request)
+        result = self.limiter.check_many_sync(checks)
+        if not result.allowed:
+            return self._denied(result)
+        return self._finish(result, self.get_response(request))
+
+    async def __acall__(self, request):
+        checks = self.get_checks(request)
+        if not checks:
+            return await self.get_response(request)
+        result = await self.limiter.check_many(checks)
+        if not result.allowed:
+            return self._denied(result)
+        return self._finish(result, await self.get_response(request))
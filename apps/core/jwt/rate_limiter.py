@@ -1,4 +1,6 @@
 from datetime import datetime
+import math
+import secrets
 import time
 import asyncio
 from typing import Any, Optional, Dict, Tuple, List
@@ -6,6 +8,7 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 from ..cache.async_cache import AsyncCache
+from .local_limiter import LocalPreLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,122 @@ class RateLimitStrategy(Enum):
     """Rate limiting strategies"""
     SLIDING_WINDOW = "sliding_window"
     FIXED_WINDOW = "fixed_window"
+    TOKEN_BUCKET = "token_bucket"
+
+
+# Every strategy runs server-side in one script, so a check is one round trip
+# and the read-decide-write is atomic across workers. Times come from the
+# Redis clock (milliseconds) so workers with skewed clocks agree.
+#
+# Each function returns allowed, remaining, reset_ms, retry_after_ms.
+# `commit` false evaluates the next request without recording it.
+RATE_LIMIT_LUA_LIBRARY = """
+local function now_ms()
+    local t = redis.call('TIME')
+    return tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+end
+
+-- Sorted set of request timestamps: exact sliding log, at most `limit` members
+local function sliding_window(key, limit, window, commit, now, member)
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    local allowed = count < limit
+    if allowed and commit then
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, window)
+        count = count + 1
+    end
+    local reset = window
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        reset = tonumber(oldest[2]) + window - now
+    end
+    return allowed, math.max(0, limit - count), reset, allowed and 0 or reset
+end
+
+-- INCR + PEXPIRE counter per window; denied requests are not counted
+local function fixed_window(key, limit, window, commit, now, member)
+    local count = tonumber(redis.call('GET', key) or '0')
+    local ttl = redis.call('PTTL', key)
+    if ttl < 0 then
+        ttl = window
+    end
+    local allowed = count < limit
+    if allowed and commit then
+        count = redis.call('INCR', key)
+        if count == 1 or redis.call('PTTL', key) < 0 then
+            redis.call('PEXPIRE', key, window)
+            ttl = window
+        end
+    end
+    return allowed, math.max(0, limit - count), ttl, allowed and 0 or ttl
+end
+
+-- GCRA: one theoretical-arrival-time per key; refills one request every
+-- window / limit ms with bursts of up to `limit`
+local function token_bucket(key, limit, window, commit, now, member)
+    local interval = window / limit
+    local tat = tonumber(redis.call('GET', key) or '0')
+    if tat < now then
+        tat = now
+    end
+    local allow_at = tat + interval - window
+    local allowed = allow_at <= now
+    if allowed and commit then
+        tat = tat + interval
+        redis.call('SET', key, string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+    end
+    local remaining = math.max(0, math.floor((now - tat + window) / interval))
+    return allowed, remaining, math.ceil(tat - now), allowed and 0 or math.ceil(allow_at - now)
+end
+
+local strategies = {
+    sliding_window = sliding_window,
+    fixed_window = fixed_window,
+    token_bucket = token_bucket,
+}
+"""
+
+# KEYS[1] = counter key
+# ARGV = strategy, limit, window_ms, commit (1/0), sliding-window member
+RATE_LIMIT_SCRIPT = RATE_LIMIT_LUA_LIBRARY + """
+local now = now_ms()
+local allowed, remaining, reset, retry_after = strategies[ARGV[1]](
+    KEYS[1], tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4] == '1', now, ARGV[5]
+)
+return {allowed and 1 or 0, remaining, reset, retry_after}
+"""
+
+# KEYS[i] = counter key of dimension i
+# ARGV = sliding-window member, then strategy, limit, window_ms per dimension
+#
+# All-or-nothing: every dimension is evaluated first and the request is only
+# recorded (in all of them) if all allow it, so a request denied by one limit
+# does not use up another. Returns 4 integers per dimension.
+MULTI_RATE_LIMIT_SCRIPT = RATE_LIMIT_LUA_LIBRARY + """
+local now = now_ms()
+local function run(commit)
+    local out, all_allowed = {}, true
+    for i, key in ipairs(KEYS) do
+        local base = 2 + (i - 1) * 3
+        local allowed, remaining, reset, retry_after = strategies[ARGV[base]](
+            key, tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2]), commit, now, ARGV[1]
+        )
+        all_allowed = all_allowed and allowed
+        table.insert(out, allowed and 1 or 0)
+        table.insert(out, remaining)
+        table.insert(out, reset)
+        table.insert(out, retry_after)
+    end
+    return out, all_allowed
+end
+
+local out, all_allowed = run(false)
+if all_allowed then
+    out = run(true)
+end
+return out
+"""
 
 @dataclass(frozen=True)
 class RateLimitConfig:
@@ -46,6 +165,8 @@ class RateLimitResult:
     def retry_after(self) -> int:
         if self.allowed:
             return 0
+        if "retry_after" in self.details:
+            return self.details["retry_after"]
         return max(0, self.reset_time - int(time.time()))
 
 class RateLimiter:
@@ -53,11 +174,26 @@ class RateLimiter:
     Production-grade Rate Limiter
     Security Level: HIGH
     Responsibilities: Request rate limiting, abuse prevention
+
+    With a LocalPreLimiter, identifiers that are clearly over their limit
+    (or that Redis just denied) are rejected in-process, so a credential
+    stuffing burst does not cost a Redis round trip per request.
+
+    `cache` serves the async API; `sync_client`, a redis-py client on the
+    same server, serves check_many_sync. An async pool is bound to the loop
+    that opened its connections, so sync callers cannot share it.
     """
     
-    def __init__(self, cache: AsyncCache, prefix: str = "rate_limit"):
+    def __init__(self,
+                 cache: AsyncCache,
+                 prefix: str = "rate_limit",
+                 local_limiter: Optional[LocalPreLimiter] = None,
+                 sync_client: Any = None):
         self.cache = cache
         self.prefix = prefix
+        self.local_limiter = local_limiter
+        self.sync_client = sync_client
+        self._sync_script = None
         self._metrics = {
             "checks": 0,
             "allowed": 0,
@@ -65,9 +201,12 @@ class RateLimiter:
             "errors": 0
         }
 
-    def _get_key(self, identifier: str, action: str) -> str:
-        """Generate rate limit key"""
-        return f"{self.prefix}:{action}:{identifier}"
+    def _get_key(self, identifier: str, action: str, strategy: RateLimitStrategy = None) -> str:
+        """Generate rate limit key (one per strategy: each keeps a different Redis type)"""
+        key = f"{self.prefix}:{action}:{identifier}"
+        if strategy is not None and strategy != RateLimitStrategy.SLIDING_WINDOW:
+            key = f"{key}:{strategy.value}"
+        return key
 
     async def check_rate_limit(self, 
                              identifier: str, 
@@ -77,90 +216,157 @@ class RateLimiter:
         Check rate limit for identifier and action
         Security Level: HIGH
         """
-        self._metrics["checks"] += 1
+        return await self.check_many([(identifier, action, config)])
+
+    async def check_many(self,
+                         checks: List[Tuple[str, str, RateLimitConfig]]) -> RateLimitResult:
+        """
+        Check several (identifier, action, config) limits in one atomic call,
+        e.g. login by IP and by target email. The request is recorded in every
+        dimension or in none.
+
+        Returns the most restrictive result: the denial with the longest
+        retry_after, or if all allow, the dimension with the fewest remaining
+        requests. details["dimension"] names it and details["dimensions"]
+        holds the other dimensions' details.
+        Security Level: HIGH
+        """
+        result = self._precheck(checks)
+        if result is not None:
+            return result
         
         try:
-            if config.strategy == RateLimitStrategy.SLIDING_WINDOW:
-                return await self._sliding_window_check(identifier, action, config)
-            else:
-                # Fallback to sliding window for unsupported strategies
-                logger.warning(f"Unsupported strategy {config.strategy}, using sliding window")
-                return await self._sliding_window_check(identifier, action, config)
-                
+            keys, args = self._script_args(checks)
+            values = await self.cache.eval_script(MULTI_RATE_LIMIT_SCRIPT, keys, args)
         except Exception as e:
-            self._metrics["errors"] += 1
-            logger.error(f"Rate limit check failed for {identifier}/{action}: {e}")
-            # Fail open in case of errors to avoid blocking legitimate traffic
-            return RateLimitResult(True, config, {"error": "Rate limit service unavailable"})
+            return self._fail_open(checks, e)
+        
+        return self._collect(checks, values)
 
-    async def _sliding_window_check(self, 
-                                  identifier: str, 
-                                  action: str, 
-                                  config: RateLimitConfig) -> RateLimitResult:
+    def check_many_sync(self,
+                        checks: List[Tuple[str, str, RateLimitConfig]]) -> RateLimitResult:
         """
-        Sliding window rate limit implementation
+        check_many for sync callers (WSGI, DRF throttles) on the sync client,
+        so they never borrow the async pool from outside its event loop.
         Security Level: HIGH
         """
-        key = self._get_key(identifier, action)
-        now = time.time()
-        window_start = now - config.window_seconds
+        result = self._precheck(checks)
+        if result is not None:
+            return result
         
         try:
-            # Get current requests in window
-            current_requests = await self._get_current_requests(key, window_start)
-            
-            # Add current request if under limit
-            if current_requests < config.max_requests:
-                await self._add_request(key, now, config.window_seconds)
-                current_requests += 1
-                self._metrics["allowed"] += 1
-                allowed = True
-            else:
-                self._metrics["denied"] += 1
-                allowed = False
-                logger.warning(f"Rate limit exceeded: {identifier}/{action}, requests={current_requests}")
-            
-            remaining = max(0, config.max_requests - current_requests)
-            reset_time = int(now + config.window_seconds)
-            
-            details = {
-                "limit": config.max_requests,
-                "remaining": remaining,
-                "reset_time": reset_time,
-                "window_seconds": config.window_seconds,
-                "current_requests": current_requests,
-                "strategy": config.strategy.value
-            }
-            
-            return RateLimitResult(allowed, config, details)
-            
+            if self.sync_client is None:
+                raise RuntimeError("no sync Redis client configured")
+            if self._sync_script is None:
+                # Script calls EVALSHA and only resends the body on NOSCRIPT
+                self._sync_script = self.sync_client.register_script(MULTI_RATE_LIMIT_SCRIPT)
+            keys, args = self._script_args(checks)
+            values = self._sync_script(keys=keys, args=args)
         except Exception as e:
-            logger.error(f"Sliding window check failed: {e}")
-            raise
-
-    async def _get_current_requests(self, key: str, window_start: float) -> int:
-        """Get number of requests in current window"""
-        # This is a simplified implementation
-        # In production, you might use Redis sorted sets
-        window_data = await self.cache.get(key)
-        if not window_data:
-            return 0
+            return self._fail_open(checks, e)
         
-        requests = window_data.get("requests", [])
-        # Filter requests within current window
-        valid_requests = [ts for ts in requests if ts >= window_start]
-        return len(valid_requests)
-
-    async def _add_request(self, key: str, timestamp: float, window_seconds: int):
-        """Add request to rate limit window"""
-        window_data = await self.cache.get(key) or {"requests": []}
-        window_data["requests"].append(timestamp)
+        return self._collect(checks, values)
+
+    def _precheck(self, checks: List[Tuple[str, str, RateLimitConfig]]) -> Optional[RateLimitResult]:
+        """Result decided without Redis (no checks, or a local denial), else None"""
+        self._metrics["checks"] += 1
+        if not checks:
+            self._metrics["allowed"] += 1
+            return RateLimitResult(True, RateLimitConfig(), {"dimensions": {}})
         
-        # Keep only recent requests to prevent memory issues
-        window_start = timestamp - window_seconds
-        window_data["requests"] = [ts for ts in window_data["requests"] if ts >= window_start]
+        if self.local_limiter is not None:
+            waits = [
+                (wait, config) for identifier, action, config in checks
+                if (wait := self.local_limiter.check(identifier, action, config)) is not None
+            ]
+            if waits:
+                wait, config = max(waits, key=lambda w: w[0])
+                self._metrics["denied"] += 1
+                return self._build_result(False, config, 0, wait * 1000, wait * 1000, local=True)
+        return None
+
+    def _script_args(self, checks: List[Tuple[str, str, RateLimitConfig]]) -> Tuple[List[str], List[Any]]:
+        """KEYS and ARGV of MULTI_RATE_LIMIT_SCRIPT"""
+        member = f"{time.time_ns()}-{secrets.token_hex(4)}"
+        keys, args = [], [member]
+        for identifier, action, config in checks:
+            keys.append(self._get_key(identifier, action, config.strategy))
+            args.extend([config.strategy.value, config.max_requests, int(config.window_seconds * 1000)])
+        return keys, args
+
+    def _fail_open(self, checks: List[Tuple[str, str, RateLimitConfig]], error: Exception) -> RateLimitResult:
+        self._metrics["errors"] += 1
+        logger.error(f"Rate limit check failed for {[(i, a) for i, a, _ in checks]}: {error}")
+        # Fail open in case of errors to avoid blocking legitimate traffic
+        return RateLimitResult(True, checks[0][2], {"error": "Rate limit service unavailable"})
+
+    def _collect(self, checks: List[Tuple[str, str, RateLimitConfig]], values: List[Any]) -> RateLimitResult:
+        """Most restrictive result from the script's 4 integers per dimension"""
+        results = {}
+        for index, (identifier, action, config) in enumerate(checks):
+            allowed, remaining, reset_ms, retry_after_ms = values[index * 4:index * 4 + 4]
+            result = self._build_result(bool(allowed), config, remaining, reset_ms, retry_after_ms)
+            results[f"{action}:{identifier}"] = result
+            
+            if self.local_limiter is not None:
+                self.local_limiter.sync(
+                    identifier, action, config, result.allowed, result.remaining, result.retry_after
+                )
+        
+        denied = [(name, r) for name, r in results.items() if not r.allowed]
+        if denied:
+            name, result = max(denied, key=lambda item: item[1].retry_after)
+            self._metrics["denied"] += 1
+            logger.warning(
+                f"Rate limit exceeded: {name}, "
+                f"strategy={result.config.strategy.value}, retry_after={result.retry_after}s"
+            )
+        else:
+            name, result = min(results.items(), key=lambda item: item[1].remaining)
+            self._metrics["allowed"] += 1
         
-        await self.cache.set(key, window_data, window_seconds)
+        result.details["dimension"] = name
+        result.details["dimensions"] = {n: r.details for n, r in results.items() if r is not result}
+        return result
+
+    async def _evaluate(self,
+                        identifier: str,
+                        action: str,
+                        config: RateLimitConfig,
+                        commit: bool) -> RateLimitResult:
+        """
+        Run the strategy's script: one atomic round trip
+        Security Level: HIGH
+        """
+        # unique sorted-set member, so simultaneous requests are all counted
+        member = f"{time.time_ns()}-{secrets.token_hex(4)}"
+        allowed, remaining, reset_ms, retry_after_ms = await self.cache.eval_script(
+            RATE_LIMIT_SCRIPT,
+            [self._get_key(identifier, action, config.strategy)],
+            [config.strategy.value, config.max_requests, int(config.window_seconds * 1000),
+             1 if commit else 0, member]
+        )
+        return self._build_result(bool(allowed), config, remaining, reset_ms, retry_after_ms)
+
+    def _build_result(self,
+                      allowed: bool,
+                      config: RateLimitConfig,
+                      remaining: int,
+                      reset_ms: int,
+                      retry_after_ms: int,
+                      local: bool = False) -> RateLimitResult:
+        details = {
+            "limit": config.max_requests,
+            "remaining": int(remaining),
+            "reset_time": int(math.ceil(time.time() + reset_ms / 1000)),
+            "retry_after": int(math.ceil(retry_after_ms / 1000)),
+            "window_seconds": config.window_seconds,
+            "current_requests": config.max_requests - int(remaining),
+            "strategy": config.strategy.value
+        }
+        if local:
+            details["local"] = True
+        return RateLimitResult(allowed, config, details)
 
     async def get_rate_limit_info(self, 
                                 identifier: str, 
@@ -171,18 +377,10 @@ class RateLimiter:
         Security Level: MEDIUM
         """
         try:
-            key = self._get_key(identifier, action)
-            now = time.time()
-            window_start = now - config.window_seconds
-            
-            current_requests = await self._get_current_requests(key, window_start)
-            
+            result = await self._evaluate(identifier, action, config, commit=False)
             return {
-                "limit": config.max_requests,
-                "remaining": max(0, config.max_requests - current_requests),
-                "reset_time": int(now + config.window_seconds),
-                "current_requests": current_requests,
-                "window_seconds": config.window_seconds
+                key: result.details[key]
+                for key in ("limit", "remaining", "reset_time", "current_requests", "window_seconds")
             }
         except Exception as e:
             logger.error(f"Failed to get rate limit info: {e}")
@@ -194,8 +392,9 @@ class RateLimiter:
         Security Level: HIGH
         """
         try:
-            key = self._get_key(identifier, action)
-            success = await self.cache.delete(key)
+            success = False
+            for strategy in RateLimitStrategy:
+                success = await self.cache.delete(self._get_key(identifier, action, strategy)) or success
                 
             logger.info(f"Rate limit reset: {identifier}/{action}")
             return success
@@ -208,11 +407,14 @@ class RateLimiter:
         Get global rate limiting statistics
         Security Level: LOW
         """
-        return {
+        stats = {
             **self._metrics,
             "timestamp": datetime.utcnow().isoformat(),
             "service": "rate_limiter"
         }
+        if self.local_limiter is not None:
+            stats["local"] = self.local_limiter.get_stats()
+        return stats
 
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,196 @@
+"""
+Refresh-token session store on the async Redis cache.
+
+Each active refresh token has a record at `refresh_token:{user_id}:{jti}`
+(TTL = token lifetime) and its JTI is a member of the per-user set
+`refresh_sessions:{user_id}`. Create, rotate and revoke are each one
+MULTI/EXEC pipeline, so a refresh costs one round trip.
+
+Rotation removes the presented JTI from the set and adds its successor in
+the same transaction. SREM is atomic, so when two requests present the same
+refresh token only one sees it removed; the other (or a replay of an already
+rotated token) is reuse, and the whole session - every token descended from
+the same login - is revoked.
+"""
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from ..cache.async_cache import AsyncCache
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenReused(ValueError):
+    """A refresh token was presented after it had been rotated or revoked"""
+
+
+class RefreshSessionStore:
+    TOKEN_KEY = "refresh_token:{user_id}:{jti}"
+    INDEX_KEY = "refresh_sessions:{user_id}"
+
+    def __init__(self, cache: AsyncCache = None, ttl: int = 604800):
+        self._cache = cache
+        self.ttl = ttl
+        self._metrics = {
+            "created": 0,
+            "rotated": 0,
+            "revoked": 0,
+            "reuse_detected": 0,
+        }
+
+    @property
+    def cache(self) -> AsyncCache:
+        if self._cache is None:
+            from ..cache.async_cache import async_redis_cache
+            self._cache = async_redis_cache
+        return self._cache
+
+    def _token_key(self, user_id, jti: str) -> str:
+        return self.TOKEN_KEY.format(user_id=user_id, jti=jti)
+
+    def _index_key(self, user_id) -> str:
+        return self.INDEX_KEY.format(user_id=user_id)
+
+    def _record(self, jti: str, session_id: str, ttl: int, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        return {
+            **(metadata or {}),
+            "jti": jti,
+            "session_id": session_id,
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(seconds=ttl)).isoformat(),
+        }
+
+    def _queue_add(self, pipe, user_id, record: Dict[str, Any], ttl: int) -> None:
+        index_key = self._index_key(user_id).encode("utf-8")
+        pipe.set(self._token_key(user_id, record["jti"]).encode("utf-8"), json.dumps(record).encode("utf-8"), ex=ttl)
+        pipe.sadd(index_key, record["jti"].encode("utf-8"))
+        # the index lives as long as the newest token in it
+        pipe.expire(index_key, ttl)
+
+    # ============ WRITES ============
+
+    async def create(
+        self,
+        user_id,
+        jti: str,
+        session_id: str,
+        ttl: int = None,
+        metadata: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Register a newly issued refresh token"""
+        ttl = ttl or self.ttl
+        record = self._record(jti, session_id, ttl, metadata)
+
+        await self.cache.pipeline(lambda pipe: self._queue_add(pipe, user_id, record, ttl))
+        self._metrics["created"] += 1
+        return record
+
+    async def rotate(
+        self,
+        user_id,
+        old_jti: str,
+        new_jti: str,
+        session_id: str,
+        ttl: int = None,
+        metadata: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Swap `old_jti` for `new_jti` in one transaction.
+
+        Raises RefreshTokenReused (after revoking the session) if `old_jti`
+        was no longer active.
+        """
+        ttl = ttl or self.ttl
+        record = self._record(new_jti, session_id, ttl, metadata)
+
+        def build(pipe):
+            pipe.srem(self._index_key(user_id).encode("utf-8"), old_jti.encode("utf-8"))
+            pipe.delete(self._token_key(user_id, old_jti).encode("utf-8"))
+            self._queue_add(pipe, user_id, record, ttl)
+
+        removed = (await self.cache.pipeline(build))[0]
+        if not removed:
+            self._metrics["reuse_detected"] += 1
+            revoked = await self.revoke_session(user_id, session_id)
+            logger.warning(
+                f"Refresh token reuse detected: user={user_id}, session={session_id}, "
+                f"{revoked} tokens revoked"
+            )
+            raise RefreshTokenReused("Refresh token has already been used")
+
+        self._metrics["rotated"] += 1
+        return record
+
+    async def revoke(self, user_id, jti: str) -> bool:
+        """Revoke one refresh token; False if it was not active"""
+        def build(pipe):
+            pipe.srem(self._index_key(user_id).encode("utf-8"), jti.encode("utf-8"))
+            pipe.delete(self._token_key(user_id, jti).encode("utf-8"))
+
+        removed = (await self.cache.pipeline(build))[0]
+        if removed:
+            self._metrics["revoked"] += 1
+        return bool(removed)
+
+    async def revoke_session(self, user_id, session_id: str) -> int:
+        """Revoke every active token of one session (one device / login)"""
+        jtis = [s["jti"] for s in await self.list_sessions(user_id) if s.get("session_id") == session_id]
+        return await self._revoke_jtis(user_id, jtis)
+
+    async def revoke_all(self, user_id) -> int:
+        """Revoke every active refresh token of `user_id`"""
+        index_key = self._index_key(user_id).encode("utf-8")
+        members = (await self.cache.pipeline(lambda pipe: pipe.smembers(index_key), transaction=False))[0]
+        jtis = [m.decode("utf-8") for m in members]
+        revoked = await self._revoke_jtis(user_id, jtis)
+        await self.cache.pipeline(lambda pipe: pipe.delete(index_key))
+        return revoked
+
+    async def _revoke_jtis(self, user_id, jtis: List[str]) -> int:
+        if not jtis:
+            return 0
+
+        def build(pipe):
+            pipe.srem(self._index_key(user_id).encode("utf-8"), *(j.encode("utf-8") for j in jtis))
+            pipe.delete(*(self._token_key(user_id, j).encode("utf-8") for j in jtis))
+
+        removed = (await self.cache.pipeline(build))[0]
+        self._metrics["revoked"] += removed
+        return removed
+
+    # ============ READS ============
+
+    async def list_sessions(self, user_id) -> List[Dict[str, Any]]:
+        """Active refresh tokens of `user_id`, oldest first; prunes expired members"""
+        index_key = self._index_key(user_id).encode("utf-8")
+        members = (await self.cache.pipeline(lambda pipe: pipe.smembers(index_key), transaction=False))[0]
+        if not members:
+            return []
+
+        jtis = sorted(m.decode("utf-8") for m in members)
+        values = (await self.cache.pipeline(
+            lambda pipe: pipe.mget([self._token_key(user_id, j).encode("utf-8") for j in jtis]),
+            transaction=False
+        ))[0]
+
+        sessions, expired = [], []
+        for jti, value in zip(jtis, values):
+            if value is None:
+                expired.append(jti)
+            else:
+                sessions.append(json.loads(value))
+
+        if expired:
+            # the record's TTL ran out; drop its JTI from the index
+            await self.cache.pipeline(
+                lambda pipe: pipe.srem(index_key, *(j.encode("utf-8") for j in expired)),
+                transaction=False
+            )
+
+        return sorted(sessions, key=lambda s: s["created_at"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._metrics)
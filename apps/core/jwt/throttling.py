@@ -0,0 +1,133 @@
+"""
+Composite rate limiting on RateLimiter.check_many.
+
+Rates are DRF "number/period" strings in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+one per dimension; a missing or None rate disables that dimension:
+
+* ip / user / global: checked together for every request by
+  RateLimitMiddleware (user is the JWT subject set by JWTAuthMiddleware)
+* <scope>: per endpoint, checked by CompositeRateThrottle for DRF views with a
+  throttle scope (keyed by user, or by IP when anonymous)
+* login + login_email: LoginRateThrottle limits login attempts by IP and by
+  target email in the same call
+
+Each middleware or throttle check is one atomic Lua call, however many
+dimensions apply. Async callers share one async Redis pool; the sync path
+(DRF throttles, WSGI) runs the same script on a sync client, django-redis's
+connection when the default cache is django-redis, else one on REDIS_URL.
+"""
+from typing import List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .local_limiter import LocalPreLimiter
+from .rate_limiter import RateLimitConfig, RateLimiter, RateLimitResult, RateLimitStrategy
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter shared by the middleware and DRF throttles"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from ..cache.async_cache import AsyncRedisCache
+        cache = AsyncRedisCache(redis_url=getattr(settings, "REDIS_URL", "redis://localhost:6379/0"))
+        _rate_limiter = RateLimiter(cache, local_limiter=LocalPreLimiter(), sync_client=_sync_client(cache))
+    return _rate_limiter
+
+
+def _sync_client(cache) -> redis.Redis:
+    """Sync client for check_many_sync, on the same server as `cache`"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection("default")
+    except Exception:
+        # django-redis missing or the default cache is not django-redis
+        return redis.Redis.from_url(
+            cache.redis_url,
+            socket_timeout=cache.socket_timeout,
+            socket_connect_timeout=cache.socket_connect_timeout,
+        )
+
+
+def rate_config(scope: str) -> Optional[RateLimitConfig]:
+    """RateLimitConfig for a DEFAULT_THROTTLE_RATES entry, or None if it is not set"""
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if not rate:
+        return None
+    num, period = rate.split("/")
+    return RateLimitConfig(
+        strategy=RateLimitStrategy(getattr(settings, "RATE_LIMIT_STRATEGY", "token_bucket")),
+        max_requests=int(num),
+        window_seconds=PERIODS[period[0]],
+    )
+
+
+def build_checks(dimensions: List[Tuple[str, str]]) -> List[Tuple[str, str, RateLimitConfig]]:
+    """(scope, identifier) pairs -> check_many input, skipping unset rates and identifiers"""
+    checks = []
+    for scope, identifier in dimensions:
+        config = rate_config(scope)
+        if config is not None and identifier:
+            checks.append((str(identifier), scope, config))
+    return checks
+
+
+def client_ip(request) -> str:
+    """Client address, honouring REST_FRAMEWORK['NUM_PROXIES'] like DRF's throttles"""
+    return BaseThrottle().get_ident(request)
+
+
+class CompositeRateThrottle(BaseThrottle):
+    """
+    Per-endpoint throttle: limits the view's scope (the class's `scope`, else
+    the view's `throttle_scope`) per user, or per IP when anonymous. Views
+    without a scope are not checked at all.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self.result: Optional[RateLimitResult] = None
+
+    def get_dimensions(self, request, view) -> List[Tuple[str, str]]:
+        scope = self.scope or getattr(view, "throttle_scope", None)
+        if not scope:
+            return []
+        user_id = getattr(request, "user_id", None)  # set by JWTAuthMiddleware
+        return [(scope, f"user:{user_id}" if user_id else f"ip:{self.get_ident(request)}")]
+
+    def allow_request(self, request, view) -> bool:
+        if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+            return True
+        checks = build_checks(self.get_dimensions(request, view))
+        if not checks:
+            return True
+        self.result = get_rate_limiter().check_many_sync(checks)
+        return self.result.allowed
+
+    def wait(self) -> Optional[float]:
+        if self.result is None or self.result.allowed:
+            return None
+        return self.result.retry_after
+
+
+class LoginRateThrottle(CompositeRateThrottle):
+    """Login attempts limited by client IP and by target email, in one check"""
+
+    scope = "login"
+
+    def get_dimensions(self, request, view) -> List[Tuple[str, str]]:
+        dimensions = [("login", f"ip:{self.get_ident(request)}")]
+        try:
+            email = str(request.data.get("email", "")).strip().lower()
+        except Exception:
+            email = ""
+        if email:
+            dimensions.append(("login_email", f"email:{email}"))
+        return dimensions
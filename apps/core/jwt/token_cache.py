@@ -0,0 +1,114 @@
+"""
+In-process cache of verified JWT payloads.
+
+A token that passed signature and claim checks is remembered under a hash of
+its bytes until min(exp, ttl). Repeat presentations of the same token skip
+jwt.decode entirely. The cache only stands in for the signature and claim
+checks: revocation is checked by the caller on every hit, against the
+per-user epochs in token_epochs, so a revoked token never needs evicting.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by a 128-bit hash of the token.
+
+    Entries expire at min(exp, verified_at + ttl).
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Cached payload for `token`, or None if it has to be verified"""
+        if not self.enabled:
+            return None
+
+        key = self._key(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+
+            payload, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return payload
+
+    def peek(self, token: str) -> Optional[Dict[str, Any]]:
+        """Unexpired cached payload without touching the LRU order or the counters"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(self._key(token))
+        if entry is None or time.time() >= entry[1]:
+            return None
+        return entry[0]
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Remember a payload that just passed full verification"""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl
+        exp = payload.get("exp")
+        if exp:
+            expires_at = min(expires_at, float(exp))
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and current size"""
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
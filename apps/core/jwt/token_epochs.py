@@ -0,0 +1,257 @@
+"""
+Per-user token revocation epochs ("logout everywhere" in O(1)).
+
+Each user may have a `tokens_valid_after` timestamp in the Django cache.
+Any token whose `iat` (millisecond precision) is not later is rejected, so
+revoking every token a user holds is one cache write instead of one
+blacklist entry per JTI.
+
+Verification reads a bounded in-process copy. With django-redis, bumps are
+published on a pub/sub channel and a listener thread applies them to every
+process's copy immediately. An entry older than `max_age` seconds is still
+served, and a background thread re-reads it from the cache. Only a user seen
+for the first time costs a cache read on the verify path.
+
+Staleness bound: with the cache reachable, a missed pub/sub message delays a
+revocation here by at most `max_age` plus one refresh round trip. If the cache
+is unavailable, the last value read (or published) keeps being served and the
+refresh is retried every `max_age` seconds. A user with no copy at all fails
+open (nothing revoked), counted in `store_errors`. Revocations cannot be
+written during an outage either, so no newer epoch exists to miss.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from django_redis import get_redis_connection
+except Exception:
+    get_redis_connection = None
+
+
+class UserTokenEpochs:
+    KEY = "jwt:tokens_valid_after:{user_id}"
+    CHANNEL = "jwt:tokens_valid_after"
+
+    def __init__(
+        self,
+        store=None,
+        max_age: float = 30.0,
+        maxsize: int = 50000,
+        retention: int = 604800,
+        use_pubsub: bool = True
+    ):
+        self._store = store
+        self.max_age = max_age
+        self.maxsize = maxsize
+        # an epoch only has to outlive the longest-lived token it can reject
+        self.retention = retention
+        self.use_pubsub = use_pubsub
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._refreshing = set()
+        self._executor = None
+        self._executor_pid = None
+        self._metrics = {
+            "lookups": 0,
+            "cache_reads": 0,
+            "stale_served": 0,
+            "store_errors": 0,
+            "revocations": 0,
+            "rejected": 0,
+            "pubsub_updates": 0,
+        }
+
+    @property
+    def store(self):
+        if self._store is None:
+            from django.core.cache import cache
+            self._store = cache
+        return self._store
+
+    def _key(self, user_id) -> str:
+        return self.KEY.format(user_id=user_id)
+
+    # ============ READS ============
+
+    def valid_after(self, user_id) -> float:
+        """Tokens for `user_id` issued up to this timestamp are revoked (0.0: none)"""
+        user_id = str(user_id)
+        now = time.monotonic()
+        self._metrics["lookups"] += 1
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+
+        if entry is not None:
+            if now - entry[1] >= self.max_age:
+                # serve the last known epoch; never wait on the cache for a user we know
+                self._metrics["stale_served"] += 1
+                self._schedule_refresh(user_id)
+            return entry[0]
+
+        self._ensure_listener()
+        try:
+            return self._read(user_id, now)
+        except Exception as e:
+            self._metrics["store_errors"] += 1
+            logger.error(f"Token epoch unavailable for user {user_id}, treating as not revoked: {e}")
+            return 0.0
+
+    def is_known(self, user_id) -> bool:
+        """True if valid_after(user_id) is answered locally, without a cache read"""
+        with self._lock:
+            return str(user_id) in self._entries
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """True if the token was issued at or before its user's current epoch"""
+        user_id = payload.get("sub")
+        if user_id is None:
+            return False
+        valid_after = self.valid_after(user_id)
+
+        # same millisecond counts as revoked: a token minted concurrently with the bump is not trusted
+        if valid_after and float(payload.get("iat", 0)) <= valid_after:
+            self._metrics["rejected"] += 1
+            return True
+        return False
+
+    def _read(self, user_id: str, now: float) -> float:
+        self._metrics["cache_reads"] += 1
+        value = float(self.store.get(self._key(user_id)) or 0.0)
+        self._remember(user_id, value, now)
+        return value
+
+    def _schedule_refresh(self, user_id: str) -> None:
+        with self._lock:
+            if user_id in self._refreshing:
+                return
+            self._refreshing.add(user_id)
+            # a forked worker inherits the executor object but not its thread
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jwt-token-epochs-refresh")
+                self._executor_pid = os.getpid()
+            executor = self._executor
+        executor.submit(self._refresh, user_id)
+
+    def _refresh(self, user_id: str) -> None:
+        try:
+            self._read(user_id, time.monotonic())
+        except Exception as e:
+            self._metrics["store_errors"] += 1
+            logger.warning(f"Token epoch refresh failed for user {user_id}, serving last known value: {e}")
+            # retry after another max_age instead of on every request while the cache is down
+            with self._lock:
+                entry = self._entries.get(user_id)
+                if entry is not None:
+                    self._entries[user_id] = (entry[0], time.monotonic())
+        finally:
+            with self._lock:
+                self._refreshing.discard(user_id)
+
+    # ============ WRITES ============
+
+    def bump(self, user_id) -> float:
+        """Revoke every token issued to `user_id` up to now"""
+        user_id = str(user_id)
+        value = round(time.time(), 3)
+
+        self.store.set(self._key(user_id), value, self.retention)
+        self._remember(user_id, value, time.monotonic())
+        self._metrics["revocations"] += 1
+        self._publish(user_id, value)
+
+        logger.info(f"Tokens revoked for user {user_id} (valid after {value})")
+        return value
+
+    def _remember(self, user_id: str, value: float, fetched_at: float) -> None:
+        with self._lock:
+            current = self._entries.get(user_id)
+            # never move an epoch backwards (a late cache read racing a pub/sub bump)
+            if current is not None and current[0] > value:
+                value = current[0]
+            self._entries[user_id] = (value, fetched_at)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # ============ PUB/SUB ============
+
+    def _redis(self):
+        if not self.use_pubsub or get_redis_connection is None:
+            return None
+        try:
+            return get_redis_connection("default")
+        except Exception:
+            # default cache is not django-redis
+            return None
+
+    def _publish(self, user_id: str, value: float) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.publish(self.CHANNEL, f"{user_id}:{value}")
+        except Exception as e:
+            logger.warning(f"Token epoch publish failed (peers catch up within {self.max_age}s): {e}")
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None or not self.use_pubsub:
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            client = self._redis()
+            if client is None:
+                self.use_pubsub = False
+                return
+            self._listener = threading.Thread(
+                target=self._listen, args=(client,), name="jwt-token-epochs", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self, client) -> None:
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    user_id, _, value = str(data).rpartition(":")
+                    if user_id:
+                        self._remember(user_id, float(value), time.monotonic())
+                        self._metrics["pubsub_updates"] += 1
+            except Exception as e:
+                logger.warning(f"Token epoch subscription lost, retrying: {e}")
+                time.sleep(1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._metrics, "size": len(self._entries), "pubsub": self._listener is not None}
+
+
+_user_token_epochs: Optional[UserTokenEpochs] = None
+
+
+def get_user_token_epochs() -> UserTokenEpochs:
+    """Process-wide epochs shared by JWT verification and revocation callers"""
+    global _user_token_epochs
+    if _user_token_epochs is None:
+        _user_token_epochs = UserTokenEpochs()
+    return _user_token_epochs
+
+
+def revoke_user_tokens(user_id) -> float:
+    """Invalidate every access and refresh token issued to `user_id` so far"""
+    return get_user_token_epochs().bump(user_id)
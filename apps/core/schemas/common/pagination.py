@@ -1,5 +1,10 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
 from pydantic import field_validator
-from typing import Generic, TypeVar, List, Optional
+from typing import Generic, TypeVar, List, Optional, Dict, Any
 from math import ceil
 from apps.core.schemas.input_schemas.base import BaseSchema
 
@@ -40,6 +45,7 @@ class PaginationInfo(BaseSchema):
     total_pages: int
     has_next: bool
     has_prev: bool
+    total_is_exact: bool = True
 
 class PaginatedResponse(BaseSchema, Generic[T]):
     """Generic paginated response schema."""
@@ -57,16 +63,130 @@ class PaginatedResponse(BaseSchema, Generic[T]):
         """Create a paginated response."""
         total_pages = ceil(total / params.page_size) if total > 0 and params.page_size > 0 else 1
         
+        # A CountResult total carries exactness and a limit + 1 has_next
+        has_next = getattr(total, 'has_next', None)
+        
         pagination_info = PaginationInfo(
-            total=total,
+            total=int(total),
             page=params.page,
             page_size=params.page_size,
             total_pages=total_pages,
-            has_next=params.page < total_pages,
+            has_next=params.page < total_pages if has_next is None else has_next,
             has_prev=params.page > 1,
+            total_is_exact=getattr(total, 'exact', True),
         )
         
         return cls(
             items=items,
             pagination=pagination_info
-        )
\ No newline at end of file
+        )
+
+
+# ============ KEYSET (CURSOR) PAGINATION ============
+
+def _cursor_value_default(value: Any) -> Any:
+    """JSON fallback for sort key values stored inside a cursor."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def encode_cursor(last_id: int, sort_field: str = 'id', sort_value: Any = None) -> str:
+    """
+    Build an opaque cursor pointing just past the row ``last_id``.
+
+    The cursor carries the sort field and its value for the last row so that
+    the next page can be fetched with a seek predicate instead of OFFSET.
+    """
+    position: Dict[str, Any] = {'f': sort_field, 'id': last_id}
+    if sort_field != 'id':
+        position['v'] = sort_value
+    raw = json.dumps(position, separators=(',', ':'), default=_cursor_value_default)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises ValueError for anything that is not a well-formed cursor.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if (
+        not isinstance(position, dict)
+        or not isinstance(position.get('f'), str)
+        or not isinstance(position.get('id'), int)
+        or (position['f'] != 'id' and 'v' not in position)
+    ):
+        raise ValueError("Invalid pagination cursor")
+    return position
+
+
+@dataclass(frozen=True)
+class CursorPage(Generic[T]):
+    """One keyset page from a use case: its items and the next page's cursor (None on the last)"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+class CursorPaginationParams(BaseSchema):
+    """Schema for keyset pagination parameters."""
+    
+    cursor: Optional[str] = None
+    page_size: int = 20
+    
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        """Reject cursors that cannot be decoded; empty means first page."""
+        if v:
+            decode_cursor(v)
+        return v or None
+    
+    @field_validator('page_size')
+    @classmethod
+    def validate_page_size(cls, v: int) -> int:
+        """Validate page size."""
+        if v < 1 or v > 100:
+            raise ValueError("Page size must be between 1 and 100")
+        return v
+
+class CursorPaginationInfo(BaseSchema):
+    """Keyset pagination metadata for responses."""
+    next_cursor: Optional[str] = None
+    page_size: int
+    has_next: bool
+
+class CursorPaginatedResponse(BaseSchema, Generic[T]):
+    """Generic keyset-paginated response schema."""
+    
+    items: List[T]
+    pagination: CursorPaginationInfo
+    
+    @classmethod
+    def create(
+        cls,
+        items: List[T],
+        next_cursor: Optional[str],
+        params: CursorPaginationParams
+    ) -> 'CursorPaginatedResponse[T]':
+        """Create a keyset-paginated response."""
+        return cls(
+            items=items,
+            pagination=CursorPaginationInfo(
+                next_cursor=next_cursor,
+                page_size=params.page_size,
+                has_next=next_cursor is not None,
+            )
+        )
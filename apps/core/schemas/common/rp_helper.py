@@ -23,14 +23,16 @@ def build_user_list_response(
     users = [build_user_response(entity) for entity in user_entities]
     
     total_pages = (total + per_page - 1) // per_page if per_page > 0 else 1
+    has_next = getattr(total, 'has_next', None)
     
     return UserListResponseSchema(
         items=users,
-        total=total,
+        total=int(total),
+        total_is_exact=getattr(total, 'exact', True),
         page=page,
         page_size=per_page,
         total_pages=total_pages,
-        has_next=page < total_pages,
+        has_next=page < total_pages if has_next is None else has_next,
         has_prev=page > 1
     )
 
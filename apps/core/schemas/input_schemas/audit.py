@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field, field_validator, model_validator
+
+from apps.core.schemas.input_schemas.base import BaseSchema
+from apps.tcc.models.base.auditlog import AuditLog
+
+AUDIT_ACTIONS = tuple(code for code, _ in AuditLog.ACTION_CHOICES)
+
+
+class AuditLogQueryInputSchema(BaseSchema):
+    """Schema for GET /tcc/audit/ - only filters backed by an index or the primary key."""
+
+    action: Optional[str] = Field(None, description="Action code, e.g. UPDATE")
+    resource_type: Optional[str] = Field(None, max_length=100, description="Exact resource type")
+    user_id: Optional[int] = Field(None, ge=1, description="Acting user")
+    content_type: Optional[str] = Field(
+        None, pattern=r"^\w+\.\w+$", description="Audited model as app_label.model, e.g. tcc.user"
+    )
+    object_id: Optional[int] = Field(None, description="Audited object id (use with content_type)")
+    since: Optional[datetime] = Field(None, description="Entries written at or after this time")
+    until: Optional[datetime] = Field(None, description="Entries written before this time")
+
+    cursor: Optional[str] = Field(None, description="Keyset cursor from the previous page")
+    per_page: int = Field(default=50, ge=1, le=200, description="Items per page")
+    include_states: bool = Field(default=False, description="Include before/after state snapshots")
+
+    @field_validator('action')
+    @classmethod
+    def validate_action(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        v = v.upper()
+        if v not in AUDIT_ACTIONS:
+            raise ValueError(f"Unknown action, expected one of {', '.join(AUDIT_ACTIONS)}")
+        return v
+
+    @model_validator(mode='after')
+    def validate_window(self):
+        if self.since and self.until and self.since >= self.until:
+            raise ValueError("since must be before until")
+        return self
@@ -97,6 +97,7 @@ class UserQueryInputSchema(BaseSchema):
     # Pagination - matches repo parameters
     page: int = Field(default=1, ge=1, description="Page number")
     per_page: int = Field(default=20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Keyset cursor; when present (even empty) replaces page")
     
     # ADDED: Sorting options
     sort_by: Optional[str] = Field(None, description="Field to sort by")
@@ -108,6 +109,7 @@ class UserSearchInputSchema(BaseSchema):
     search_term: str = Field(..., min_length=1, description="Search term for name or email")
     page: int = Field(default=1, ge=1, description="Page number")
     per_page: int = Field(default=20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Keyset cursor; when present (even empty) replaces page")
 
 class EmailCheckInputSchema(BaseSchema):
     """Schema for checking email existence - matches repo email_exists."""
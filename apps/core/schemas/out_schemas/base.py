@@ -311,6 +311,7 @@ class PaginatedResponseSchema(BaseOutputSchema, Generic[T]):
     
     items: List[T] = Field(..., description="List of items")
     total: int = Field(..., description="Total items")
+    total_is_exact: bool = Field(default=True, description="False when total is a cached or estimated count")
     page: int = Field(..., description="Current page")
     page_size: int = Field(..., description="Items per page")
     total_pages: int = Field(..., description="Total pages")
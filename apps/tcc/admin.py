@@ -1,3 +1,4 @@
 from django.contrib import admin
 
 # Register your models here.
+from apps.tcc.models.audit import audit_admin  # noqa: F401  (registers AuditLogAdmin)
@@ -44,6 +44,7 @@ try:
         verify_token_view,
         forgot_password_view,
         reset_password_view,
+        jwks_view,
     )
 except ImportError:
     logger.warning("Auth views not found, using DRF SimpleJWT views")
@@ -64,6 +65,9 @@ except ImportError:
     verify_token_view = placeholder_auth_view
     forgot_password_view = placeholder_auth_view
     reset_password_view = placeholder_auth_view
+    jwks_view = placeholder_auth_view
+
+from .views.audit_view import list_audit_logs_view
 
 # ============ ROOT VIEW ============
 
@@ -83,6 +87,7 @@ def tcc_api_root(request):
                 'verify': '/tcc/auth/verify/',
                 'forgot_password': '/tcc/auth/forgot-password/',
                 'reset_password': '/tcc/auth/reset-password/',
+                'jwks': '/tcc/auth/jwks/',
             },
             'users': {
                 'register': '/tcc/users/register/',
@@ -91,6 +96,9 @@ def tcc_api_root(request):
                 'list_users': '/tcc/users/all/',
                 'check_email': '/tcc/users/check-email/',
                 'health': '/tcc/health/',
+            },
+            'audit': {
+                'list': '/tcc/audit/',
             }
         }
     })
@@ -111,6 +119,7 @@ urlpatterns = [
     path('auth/verify/', verify_token_view, name='auth-verify'),
     path('auth/forgot-password/', forgot_password_view, name='auth-forgot-password'),
     path('auth/reset-password/', reset_password_view, name='auth-reset-password'),
+    path('auth/jwks/', jwks_view, name='auth-jwks'),
     
     # User endpoints
     path('users/register/', register_user_view, name='user-register'),
@@ -122,4 +131,7 @@ urlpatterns = [
     path('users/<int:user_id>/update/', update_user_view, name='update-user'),
     path('users/<int:user_id>/delete/', delete_user_view, name='delete-user'),
     path('users/check-email/', check_email_availability_view, name='check-email'),
+    
+    # Audit endpoints (staff)
+    path('audit/', list_audit_logs_view, name='audit-list'),
 ]
\ No newline at end of file
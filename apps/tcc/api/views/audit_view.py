@@ -0,0 +1,88 @@
+"""
+Staff-only audit log API.
+
+Read-only: entries are queried directly through the index-backed helpers in
+apps.tcc.models.audit.audit_queries, the same ones the admin changelist uses.
+"""
+
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.http import JsonResponse
+from pydantic import ValidationError
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+
+from apps.core.core_exceptions.domain import DomainValidationException
+from apps.core.schemas.common.response import APIResponse
+from apps.core.schemas.input_schemas.audit import AuditLogQueryInputSchema
+from apps.tcc.api.views.user_view import UserAPIExceptionHandler, create_cursor_paginated_response
+from apps.tcc.models.audit.audit_queries import (
+    audit_keyset_page,
+    audit_queryset,
+    filter_audit_logs,
+    serialize_audit_entry
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _fetch_audit_page(query: AuditLogQueryInputSchema):
+    content_type_id = None
+    if query.content_type:
+        app_label, model = query.content_type.split('.')
+        try:
+            content_type_id = ContentType.objects.get_by_natural_key(app_label, model).pk
+        except ContentType.DoesNotExist:
+            raise DomainValidationException(
+                message="Unknown content type",
+                field_errors={'content_type': [f"No model named {query.content_type}"]}
+            )
+
+    queryset = filter_audit_logs(
+        audit_queryset(),
+        action=query.action,
+        resource_type=query.resource_type,
+        user_id=query.user_id,
+        content_type_id=content_type_id,
+        object_id=query.object_id,
+        since=query.since,
+        until=query.until
+    )
+    try:
+        entries, next_cursor = audit_keyset_page(queryset, query.cursor, query.per_page)
+    except ValueError as e:
+        raise DomainValidationException(message=str(e), field_errors={'cursor': [str(e)]})
+
+    return [serialize_audit_entry(entry, query.include_states) for entry in entries], next_cursor
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@UserAPIExceptionHandler.as_decorator
+async def list_audit_logs_view(request: Request) -> JsonResponse:
+    """
+    STAFF: Audit log entries, newest first, with cursor pagination
+
+    Endpoint: GET /tcc/audit/ (?action=&resource_type=&user_id=&content_type=&object_id=
+              &since=&until=&cursor=&per_page=&include_states=)
+    Security: Staff only
+    """
+    try:
+        query = AuditLogQueryInputSchema(**request.query_params.dict())
+    except ValidationError as e:
+        raise DomainValidationException(
+            message="Invalid audit log query",
+            field_errors={'.'.join(str(p) for p in err['loc']) or 'query': [err['msg']] for err in e.errors()}
+        )
+
+    items, next_cursor = await sync_to_async(_fetch_audit_page, thread_sensitive=False)(query)
+
+    return JsonResponse(
+        APIResponse.create_success(
+            data=create_cursor_paginated_response(items=items, next_cursor=next_cursor, page_size=query.per_page),
+            message=f"Retrieved {len(items)} audit entries"
+        ).to_dict()
+    )
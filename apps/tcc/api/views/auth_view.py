@@ -1,10 +1,15 @@
 import logging
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_GET
 from pydantic import ValidationError
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
+from apps.core.jwt.hashing import HasherOverloaded
+from apps.core.jwt.jwt_backend import get_jwt_backend
+from apps.core.jwt.throttling import LoginRateThrottle
 from apps.core.schemas.common.response import APIResponse
 from apps.tcc.usecase.services.auth.auth_controller import create_auth_controller
 from apps.tcc.usecase.domain_exception.auth_exceptions import (
@@ -50,12 +55,20 @@ def error(message, detail=None, status=400):
     )
     return Response(api_resp.to_dict(), status=status)
 
+
+def overloaded(exc: HasherOverloaded):
+    """Shed response when the password hasher is at capacity"""
+    response = error(exc.user_message, {"error_code": exc.error_code}, exc.status_code)
+    response["Retry-After"] = str(exc.retry_after)
+    return response
+
 # ----------------------------------------
 # AUTH ENDPOINTS (PURE VIEW WRAPPING)
 # ----------------------------------------
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 async def login_view(request: Request):
     try:
         # Quick validation for empty request
@@ -141,6 +154,9 @@ async def login_view(request: Request):
             status=401
         )
         
+    except HasherOverloaded as e:
+        return overloaded(e)
+        
     except AccountLockedException as e:
         return error(
             message="Account is locked",
@@ -181,6 +197,8 @@ async def register_view(request: Request):
         return success(domain, "Registration successful", status=201)
     except ValidationError as e:
         return error("Validation failed", e.errors(), 400)
+    except HasherOverloaded as e:
+        return overloaded(e)
     except Exception as e:
         logger.error("Register error", exc_info=True)
         return error("Registration failed", str(e), 500)
@@ -241,6 +259,8 @@ async def reset_password_view(request: Request):
         controller = await get_auth_controller()
         domain = await controller.reset_password(request.data, build_context(request))
         return success(domain, "Password reset successful")
+    except HasherOverloaded as e:
+        return overloaded(e)
     except Exception as e:
         logger.error("Reset password error", exc_info=True)
         return error("Reset password failed", str(e), 500)
@@ -260,4 +280,20 @@ async def revoke_session_view(request: Request, session_id: str):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 async def revoke_all_sessions_view(request: Request):
-    return Response({"success": True, "message": "Not implemented"}, status=200)
\ No newline at end of file
+    return Response({"success": True, "message": "Not implemented"}, status=200)
+
+
+@require_GET
+def jwks_view(request):
+    """
+    Public signing keys (RFC 7517) for verifying EdDSA / RS256 tokens by kid.
+    Served as precomputed bytes; a matching If-None-Match gets a 304.
+    """
+    body, etag = get_jwt_backend().jwt_manager.get_jwks()
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/jwk-set+json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=300"
+    return response
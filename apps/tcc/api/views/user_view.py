@@ -28,6 +28,7 @@ from apps.core.schemas.input_schemas.users import (
 )
 from apps.tcc.usecase.entities.users_entity import UserEntity
 from apps.core.cache.async_cache import AsyncCache
+from apps.core.schemas.common.pagination import CursorPage, CursorPaginatedResponse, CursorPaginationParams
 from apps.core.schemas.common.response import APIResponse
 from apps.tcc.usecase.services.users.user_controller import get_user_controller
 from apps.tcc.usecase.domain_exception.u_exceptions import (
@@ -146,20 +147,42 @@ def create_paginated_response(
     """Standardized paginated response format"""
     total_pages = max(1, (total_count + per_page - 1) // per_page) if per_page > 0 else 1
     
+    # Repositories return a CountResult: the total may be cached/estimated and
+    # has_next is then known from the limit + 1 fetch rather than the total
+    has_next = getattr(total_count, 'has_next', None)
+    if has_next is None:
+        has_next = page < total_pages
+    
     return {
         'items': items,
         'pagination': {
-            'total': total_count,
+            'total': int(total_count),
+            'total_is_exact': getattr(total_count, 'exact', True),
             'page': page,
             'per_page': per_page,
             'total_pages': total_pages,
-            'has_next': page < total_pages,
+            'has_next': has_next,
             'has_prev': page > 1
         },
         **additional_data
     }
 
 
+def create_cursor_paginated_response(
+    items: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    page_size: int,
+    **additional_data
+) -> Dict[str, Any]:
+    """Keyset paginated response format (used when ?cursor= is supplied)"""
+    response = CursorPaginatedResponse.create(
+        items=items,
+        next_cursor=next_cursor,
+        params=CursorPaginationParams(page_size=page_size)
+    )
+    return {**response.model_dump(), **additional_data}
+
+
 # ============ EXCEPTION HANDLER ============
 
 class UserAPIExceptionHandler:
@@ -524,7 +547,7 @@ async def get_all_users_view(
     """
     AUTHENTICATED: Get all users with pagination
     
-    Endpoint: GET /api/users/all/
+    Endpoint: GET /api/users/all/ (?page= or ?cursor=)
     Security: Any authenticated user
     """
     controller = await get_user_controller()
@@ -534,21 +557,36 @@ async def get_all_users_view(
     per_page = min(100, max(1, int(request.query_params.get('per_page', 20))))
     sort_by = request.query_params.get('sort_by', 'created_at')
     sort_order = request.query_params.get('sort_order', 'desc')
+    cursor = request.query_params.get('cursor')
     
     # Build query schema
     query_data = UserQueryInputSchema(
         page=page,
         per_page=per_page,
+        cursor=cursor,
         sort_by=sort_by,
         sort_order=sort_order
     )
     
-    users_entities, total_count = await controller.get_all_users(
+    result = await controller.get_all_users(
         validated_data=query_data,
         current_user=current_user,
         context={'request': request}
     )
     
+    if isinstance(result, CursorPage):
+        return JsonResponse(
+            APIResponse.create_success(
+                data=create_cursor_paginated_response(
+                    items=entities_to_list(result.items),
+                    next_cursor=result.next_cursor,
+                    page_size=per_page
+                ),
+                message=f"Retrieved {len(result.items)} users"
+            ).to_dict()
+        )
+    users_entities, total_count = result
+    
     # Build paginated response
     response_data = create_paginated_response(
         items=entities_to_list(users_entities),
@@ -690,7 +728,7 @@ async def get_users_by_role_view(
     """
     ADMIN-ONLY: Get users by role
     
-    Endpoint: GET /api/users/role/{role}/
+    Endpoint: GET /api/users/role/{role}/ (?page= or ?cursor=)
     Security: Admin only
     """
     controller = await get_user_controller()
@@ -698,14 +736,31 @@ async def get_users_by_role_view(
     page = max(1, int(request.query_params.get('page', 1)))
     per_page = min(100, max(1, int(request.query_params.get('per_page', 20))))
     
-    users_entities, total_count = await controller.get_users_by_role(
+    cursor = request.query_params.get('cursor')
+    
+    result = await controller.get_users_by_role(
         role=role,
         page=page,
         per_page=per_page,
         current_user=current_user,
-        context={'request': request}
+        context={'request': request},
+        cursor=cursor
     )
     
+    if isinstance(result, CursorPage):
+        return JsonResponse(
+            APIResponse.create_success(
+                data=create_cursor_paginated_response(
+                    items=entities_to_list(result.items),
+                    next_cursor=result.next_cursor,
+                    page_size=per_page,
+                    role=role
+                ),
+                message=f"Retrieved {len(result.items)} users with role '{role}'"
+            ).to_dict()
+        )
+    users_entities, total_count = result
+    
     response_data = create_paginated_response(
         items=entities_to_list(users_entities),
         total_count=total_count,
@@ -733,7 +788,7 @@ async def search_users_view(
     """
     ADMIN-ONLY: Search users
     
-    Endpoint: GET /api/users/search/?q=search_term
+    Endpoint: GET /api/users/search/?q=search_term (&page= or &cursor=)
     Security: Admin only
     """
     controller = await get_user_controller()
@@ -748,18 +803,35 @@ async def search_users_view(
     page = max(1, int(request.query_params.get('page', 1)))
     per_page = min(100, max(1, int(request.query_params.get('per_page', 20))))
     
+    cursor = request.query_params.get('cursor')
+    
     search_data = UserSearchInputSchema(
         search_term=search_term,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
     
-    users_entities, total_count = await controller.search_users(
+    result = await controller.search_users(
         validated_data=search_data,
         current_user=current_user,
         context={'request': request}
     )
     
+    if isinstance(result, CursorPage):
+        return JsonResponse(
+            APIResponse.create_success(
+                data=create_cursor_paginated_response(
+                    items=entities_to_list(result.items),
+                    next_cursor=result.next_cursor,
+                    page_size=per_page,
+                    search_term=search_term
+                ),
+                message=f"Retrieved {len(result.items)} matching users"
+            ).to_dict()
+        )
+    users_entities, total_count = result
+    
     response_data = create_paginated_response(
         items=entities_to_list(users_entities),
         total_count=total_count,
@@ -12,4 +12,16 @@ class TccConfig(AppConfig):
             from apps.tcc.models.base import signals
         except ImportError as e:
             print(f'Warning: Could not import signals: {e}')
+        
+        # Cached list totals: every process must bump the shared tag on writes.
+        # Other count modes keep nothing to invalidate, so writes pay no cache calls.
+        # AuditLog is listed by cursor (never counted) and written on every save.
+        from apps.core.db.counting import CountMode, CountStrategy
+        from apps.tcc.models.base.auditlog import AuditLog
+        from apps.tcc.models.base.base_model import BaseModel
+        if CountStrategy.from_settings().mode == CountMode.CACHED:
+            CountStrategy.watch(*(
+                model for model in self.get_models()
+                if issubclass(model, BaseModel) and model is not AuditLog
+            ))
         
\ No newline at end of file
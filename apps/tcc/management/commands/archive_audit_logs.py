@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.db.partitions import MonthlyPartitioner
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.utils.audit_archive import AuditArchiver
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive AuditLog months older than the retention window to gzipped JSONL "
+        "and drop them, then make sure partitions exist for the coming months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=settings.AUDIT_LOG_RETENTION_MONTHS,
+            help="Archive months older than this many months (default: AUDIT_LOG_RETENTION_MONTHS)"
+        )
+        parser.add_argument(
+            '--archive-dir', default=settings.AUDIT_LOG_ARCHIVE_DIR,
+            help="Directory for the auditlog-YYYY-MM.jsonl.gz files"
+        )
+        parser.add_argument(
+            '--partitions-ahead', type=int, default=settings.AUDIT_LOG_PARTITIONS_AHEAD,
+            help="Monthly partitions to keep ready ahead of the current month (MySQL only)"
+        )
+        parser.add_argument('--keep', action='store_true', help="Write the archives but keep the rows")
+        parser.add_argument('--dry-run', action='store_true', help="Only list the months that would be archived")
+
+    def handle(self, *args, **options):
+        partitioner = MonthlyPartitioner(AuditLog)
+        archiver = AuditArchiver(
+            archive_dir=options['archive_dir'],
+            retention_months=options['older_than'],
+            partitioner=partitioner
+        )
+
+        months = archiver.months_to_archive()
+        if options['dry_run']:
+            for year, month in months:
+                self.stdout.write(f"would archive {year:04d}-{month:02d}")
+            self.stdout.write(f"{len(months)} month(s) older than {options['older_than']} months")
+            return
+
+        for result in archiver.run(drop=not options['keep']):
+            removed = result.get('removed_by', 'kept')
+            self.stdout.write(f"{result['month']}: {result['rows']} rows -> {result['path'] or '-'} ({removed})")
+
+        if partitioner.is_partitioned():
+            created = partitioner.ensure_partitions(options['partitions_ahead'])
+            if created:
+                self.stdout.write(f"added partitions: {', '.join(created)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {len(months)} month(s)"))
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:56
+
+from datetime import date
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def partition_auditlog(apps, schema_editor):
+    """Monthly RANGE partitions on the Snowflake ID - MySQL only, a no-op elsewhere"""
+    from apps.core.db.partitions import MonthlyPartitioner, month_of
+
+    if schema_editor.connection.vendor != 'mysql':
+        return
+
+    partitioner = MonthlyPartitioner(apps.get_model('tcc', 'AuditLog'), using=schema_editor.connection.alias)
+    if partitioner.is_partitioned():
+        return
+    first = partitioner.oldest_month() or month_of(date.today())
+    partitioner.partition_table(first, months_ahead=getattr(settings, 'AUDIT_LOG_PARTITIONS_AHEAD', 3))
+
+
+def unpartition_auditlog(apps, schema_editor):
+    from apps.core.db.partitions import MonthlyPartitioner
+
+    if schema_editor.connection.vendor != 'mysql':
+        return
+
+    partitioner = MonthlyPartitioner(apps.get_model('tcc', 'AuditLog'), using=schema_editor.connection.alias)
+    if partitioner.is_partitioned():
+        partitioner.remove_partitioning()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('tcc', '0006_auditlog_json_encoder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='content_type',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='created_by',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='deleted_by',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_deleted', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='updated_by',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='user',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(partition_auditlog, unpartition_auditlog),
+    ]
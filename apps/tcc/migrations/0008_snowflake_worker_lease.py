@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tcc', '0007_auditlog_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnowflakeWorkerLease',
+            fields=[
+                ('worker_id', models.PositiveIntegerField(help_text='datacenter_id * 32 + machine_id', primary_key=True, serialize=False)),
+                ('datacenter_id', models.PositiveSmallIntegerField()),
+                ('machine_id', models.PositiveSmallIntegerField()),
+                ('owner', models.CharField(help_text='Random token of the holding process', max_length=64)),
+                ('hostname', models.CharField(blank=True, max_length=255)),
+                ('pid', models.PositiveIntegerField(blank=True, null=True)),
+                ('acquired_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'snowflake_worker_leases',
+            },
+        ),
+    ]
@@ -3,5 +3,6 @@ from .events.events import Event
 from .donations.donation import Donation
 from .prayers.prayer import Prayer, PrayerResponse
 from .sermons.sermons import Sermon
+from .base.worker_lease import SnowflakeWorkerLease
 
-__all__=['User', 'Event', 'Donation', "Prayer", "PrayerResponse", "Sermon"]
\ No newline at end of file
+__all__=['User', 'Event', 'Donation', "Prayer", "PrayerResponse", "Sermon", "SnowflakeWorkerLease"]
\ No newline at end of file
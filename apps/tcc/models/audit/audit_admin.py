@@ -1,12 +1,107 @@
-from apps.tcc import admin
+from datetime import timedelta
+
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.utils import timezone
+
+from apps.core.db.counting import CountMode, CountStrategy
+from apps.tcc.models.audit.audit_queries import audit_keyset_page, filter_audit_logs, search_audit_logs
 from apps.tcc.models.base.auditlog import AuditLog
-from apps.tcc.models.base.auditlog import SecurityEvent 
+from apps.tcc.models.base.auditlog import SecurityEvent
+
+CURSOR_VAR = 'cursor'
+
+
+class WrittenWithinFilter(admin.SimpleListFilter):
+    """Time window as a primary-key range - Snowflake IDs are time-ordered"""
+    title = 'written'
+    parameter_name = 'written'
+
+    WINDOWS = {
+        '1h': ('Last hour', timedelta(hours=1)),
+        '24h': ('Last 24 hours', timedelta(days=1)),
+        '7d': ('Last 7 days', timedelta(days=7)),
+        '30d': ('Last 30 days', timedelta(days=30)),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _) in self.WINDOWS.items()]
+
+    def queryset(self, request, queryset):
+        window = self.WINDOWS.get(self.value())
+        if window is None:
+            return queryset
+        return filter_audit_logs(queryset, since=timezone.now() - window[1])
+
+
+class AuditLogChangeList(ChangeList):
+    """
+    Changelist without COUNT(*) or OFFSET.
+
+    Pages are seeks on ``id`` driven by ``?cursor=``, totals come from the
+    estimated count strategy (table statistics / EXPLAIN on large tables).
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        super().__init__(request, *args, **kwargs)
+        # Filter links and the search form's hidden inputs are built from these:
+        # changing either has to start again from the newest entry, not page N's cursor
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        self.cursor = request.GET.get(CURSOR_VAR) or None
+        try:
+            rows, self.next_cursor = audit_keyset_page(self.queryset, self.cursor, self.list_per_page)
+        except ValueError:
+            self.cursor = None
+            rows, self.next_cursor = audit_keyset_page(self.queryset, None, self.list_per_page)
+
+        count = self.model_admin.count_strategy.count(self.queryset)
+        self.result_count = count
+        self.result_count_is_exact = count.exact
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = bool(rows)
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = self.cursor is not None or self.next_cursor is not None
+        self.paginator = self.model_admin.get_paginator(request, rows, self.list_per_page)
+
+    def get_next_url(self):
+        return self.get_query_string({CURSOR_VAR: self.next_cursor}) if self.next_cursor else None
+
+    def get_first_url(self):
+        return self.get_query_string(remove=[CURSOR_VAR]) if self.cursor else None
 
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ['user', 'action', 'resource_type', 'timestamp', 'ip_address']
-    list_filter = ['action', 'resource_type', 'timestamp']
+    # (action, timestamp) and (resource_type, action) indexes; the time window is a PK range
+    list_filter = ['action', 'resource_type', WrittenWithinFilter]
+    list_select_related = ['user', 'content_type']
     search_fields = ['user__email', 'resource_type', 'ip_address']
+    search_help_text = "Exact match: user email, entry/user/object id, action or resource type"
     readonly_fields = ['timestamp']
+    raw_id_fields = ['user', 'created_by', 'updated_by', 'deleted_by']
+    change_list_template = 'admin/tcc/auditlog/change_list.html'
+
+    # Keyset pages need one fixed order; ids follow write time
+    ordering = ['-id']
+    sortable_by = []
+    show_full_result_count = False
+    list_per_page = 50
+
+    count_strategy = CountStrategy(mode=CountMode.ESTIMATED)
+
+    def get_changelist(self, request, **kwargs):
+        return AuditLogChangeList
 
+    def get_search_results(self, request, queryset, search_term):
+        return search_audit_logs(queryset, search_term), False
@@ -0,0 +1,113 @@
+"""
+Index-backed AuditLog queries shared by the admin changelist and /tcc/audit/.
+
+Every filter maps onto an index - (action, timestamp), (resource_type, action),
+(user), (content_type, object_id) - or onto a primary-key range: Snowflake IDs
+are time-ordered, so time windows become ``id`` bounds and pages are seeks on
+``id`` instead of OFFSETs. Search is exact-match only; there is no LIKE.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from apps.core.schemas.common.pagination import decode_cursor, encode_cursor
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.utils.snowflake import snowflake_range_lookup
+
+AUDIT_ACTIONS = frozenset(code for code, _ in AuditLog.ACTION_CHOICES)
+
+
+def audit_queryset():
+    """All entries with the relations the list views display"""
+    return AuditLog._base_manager.select_related('user', 'content_type')
+
+
+def filter_audit_logs(
+    queryset,
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    user_id: Optional[int] = None,
+    content_type_id: Optional[int] = None,
+    object_id: Optional[int] = None,
+    since=None,
+    until=None
+):
+    """Apply the index-backed filters; `since`/`until` bound the Snowflake ID"""
+    if action:
+        queryset = queryset.filter(action=action)
+    if resource_type:
+        queryset = queryset.filter(resource_type=resource_type)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if content_type_id is not None:
+        queryset = queryset.filter(content_type_id=content_type_id)
+    if object_id is not None:
+        queryset = queryset.filter(object_id=object_id)
+    if since is not None or until is not None:
+        queryset = queryset.filter(**snowflake_range_lookup(since, until))
+    return queryset
+
+
+def search_audit_logs(queryset, term: str):
+    """
+    Exact-match search: an email finds that user's entries (through the unique
+    email index, no join), a number matches entry, user or object id, an
+    action code matches the action, anything else the resource type.
+    """
+    term = (term or '').strip()
+    if not term:
+        return queryset
+
+    if '@' in term:
+        user_ids = get_user_model()._base_manager.filter(email__iexact=term).values_list('pk', flat=True)
+        return queryset.filter(user_id__in=list(user_ids))
+    if term.isdigit():
+        number = int(term)
+        return queryset.filter(Q(pk=number) | Q(user_id=number) | Q(object_id=number))
+    if term.upper() in AUDIT_ACTIONS:
+        return queryset.filter(action=term.upper())
+    return queryset.filter(resource_type=term)
+
+
+def audit_keyset_page(queryset, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[AuditLog], Optional[str]]:
+    """
+    Newest-first page of `limit` entries after `cursor`, plus the next cursor.
+
+    Seeks on ``id < cursor`` so every page costs the same however deep it is;
+    fetches ``limit + 1`` rows to know whether another page exists.
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        if position['f'] != 'id':
+            raise ValueError("Cursor does not match the audit log ordering")
+        queryset = queryset.filter(pk__lt=position['id'])
+
+    rows = list(queryset.order_by('-pk')[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].pk)
+
+
+def serialize_audit_entry(entry: AuditLog, include_states: bool = False) -> Dict[str, Any]:
+    """JSON-ready dict for an entry; before/after states only on request"""
+    data = {
+        'id': str(entry.pk),
+        'action': entry.action,
+        'resource_type': entry.resource_type,
+        'content_type': entry.content_type.model if entry.content_type_id else None,
+        'object_id': str(entry.object_id),
+        'user_id': str(entry.user_id) if entry.user_id else None,
+        'user_email': entry.user.email if entry.user_id and entry.user else None,
+        'timestamp': entry.timestamp.isoformat() if entry.timestamp else None,
+        'ip_address': entry.ip_address,
+        'request_method': entry.request_method,
+        'request_path': entry.request_path,
+        'changes': entry.changes,
+    }
+    if include_states:
+        data['before_state'] = entry.before_state
+        data['after_state'] = entry.after_state
+    return data
@@ -1,5 +1,7 @@
 import inspect
+from django.conf import settings
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -8,6 +10,11 @@ from apps.tcc.models.base.base_model import BaseModel
 class AuditLog(BaseModel):
     """
     Comprehensive audit logging for all user actions
+
+    On MySQL the table is RANGE-partitioned by month on the Snowflake ID
+    (see apps.core.db.partitions and `manage.py archive_audit_logs`).
+    Partitioned InnoDB tables cannot carry foreign keys, so every relation
+    here is declared with db_constraint=False.
     """
     ACTION_CHOICES = [
         ('CREATE', 'Create'),
@@ -21,22 +28,37 @@ class AuditLog(BaseModel):
         ('IMPORT', 'Import'),
     ]
     
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, db_constraint=False)
     object_id = models.BigIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
     
     action = models.CharField(max_length=20, choices=ACTION_CHOICES)
-    user = models.ForeignKey('User', on_delete=models.SET_NULL, null=True)
+    user = models.ForeignKey('User', on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False)
     timestamp = models.DateTimeField(default=timezone.now)
     
+    # BaseModel's user references, without constraints (see class docstring)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='%(class)s_created', db_constraint=False
+    )
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='%(class)s_updated', db_constraint=False
+    )
+    deleted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='%(class)s_deleted', db_constraint=False
+    )
+    
     # Before and after state for updates
-    before_state = models.JSONField(null=True, blank=True)
-    after_state = models.JSONField(null=True, blank=True)
+    # DjangoJSONEncoder: model states carry datetimes, dates and decimals
+    before_state = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    after_state = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
     
     # Additional context
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(null=True, blank=True)
-    changes = models.JSONField(default=dict, help_text="Field-level changes")
+    changes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder, help_text="Field-level changes")
     resource_type = models.CharField(max_length=100, blank=True)
     
     # Request context
@@ -1,3 +1,4 @@
+import copy
 import uuid
 from django.db import models
 from django.conf import settings
@@ -68,6 +69,11 @@ class BaseModel(models.Model):
     # Custom manager
     objects = BaseModelManager()
     
+    # Fields whose name contains any of these are never written to audit
+    # snapshots or change sets; subclasses extend the tuple for their own secrets
+    AUDIT_SENSITIVE_FIELDS = ('password', 'token', 'secret', 'api_key')
+    AUDIT_REDACTED = '[REDACTED]'
+    
     class Meta:
         abstract = True
         indexes = [
@@ -102,32 +108,147 @@ class BaseModel(models.Model):
         """Generate a new Snowflake ID"""
         return generate_snowflake_id()
     
-    def save(self, *args, **kwargs):
-        """Override save to handle Snowflake ID generation and validation"""
+    # ============ CHANGE TRACKING ============
+    
+    @classmethod
+    def is_audit_sensitive(cls, field_name):
+        """True for fields whose values must not reach the audit log"""
+        name = field_name.lower()
+        return any(marker in name for marker in cls.AUDIT_SENSITIVE_FIELDS)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep a snapshot of the loaded column values so changes can be diffed without a query"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+            for name, value in zip(field_names, values)
+        }
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._take_snapshot(fields)
+    
+    def _take_snapshot(self, fields=None):
+        """Record current values as the persisted state (all loaded fields, or only `fields`)"""
+        snapshot = dict(self.get_loaded_values() or {}) if fields is not None else {}
+        names = set(fields) if fields is not None else None
+        deferred = self.get_deferred_fields()
+        
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            value = getattr(self, field.attname)
+            snapshot[field.attname] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        
+        self._loaded_values = snapshot
+    
+    def get_loaded_values(self):
+        """Column values (by attname) as last loaded or saved; None for unsaved instances"""
+        return getattr(self, '_loaded_values', None)
+    
+    def get_changed_fields(self, exclude=()):
+        """Field-level changes against the load-time snapshot: {name: {'old', 'new'}}"""
+        snapshot = self.get_loaded_values()
+        if snapshot is None:
+            return {}
+        
+        changes = {}
+        for field in self._meta.concrete_fields:
+            if field.name in exclude or field.attname not in snapshot:
+                continue
+            
+            old_value = snapshot[field.attname]
+            new_value = getattr(self, field.attname)
+            if old_value == new_value:
+                continue
+            
+            # Sensitive values are reported as changed, never by value
+            if self.is_audit_sensitive(field.name):
+                old_value = new_value = self.AUDIT_REDACTED
+            # Relations are reported by primary key
+            elif field.is_relation:
+                old_value = str(old_value) if old_value is not None else None
+                new_value = str(new_value) if new_value is not None else None
+            
+            changes[field.name] = {'old': old_value, 'new': new_value}
+        
+        return changes
+    
+    def get_dirty_fields(self):
+        """
+        Names of concrete fields whose value differs from the snapshot.
+        Fields missing from the snapshot count as dirty unless they are still deferred.
+        """
+        snapshot = self.get_loaded_values()
+        if snapshot is None:
+            return None
+        
+        deferred = self.get_deferred_fields()
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname in deferred:
+                continue
+            if field.attname not in snapshot or snapshot[field.attname] != getattr(self, field.attname):
+                dirty.append(field.name)
+        return dirty
+    
+    def save(self, *args, validate=True, **kwargs):
+        """
+        Override save to handle Snowflake ID generation and validation.
+        
+        Updates write only the fields changed since the instance was loaded
+        (pass update_fields to choose explicitly); an update with nothing
+        changed issues no query. full_clean runs on the written fields only -
+        pass validate=False on trusted paths whose input was already validated.
+        """
+        adding = self._state.adding
         
         # Generate Snowflake ID if this is a new instance
         if not self.id:
             self.id = generate_snowflake_id()
         
-        # Pre-save validation
-        self.full_clean()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not adding and not kwargs.get('force_insert'):
+            update_fields = self.get_dirty_fields()
+            if update_fields is not None and not update_fields:
+                return
+        
+        # Pre-save validation, skipping fields that are not being written
+        if validate:
+            if update_fields is None:
+                self.full_clean()
+            else:
+                written = set(update_fields)
+                self.full_clean(exclude=[
+                    f.name for f in self._meta.concrete_fields
+                    if f.name not in written and f.attname not in written
+                ])
         
         # Update timestamps
         if not self.created_at:
             self.created_at = timezone.now()
         
         # Increment version on updates
-        if self.pk:
+        if not adding:
             self.version += 1
         
         # Set updated_by if provided in kwargs
         user = kwargs.pop('user', None)
         if user and user.is_authenticated:
-            if not self.pk:  # Creating
+            if adding:
                 self.created_by = user
             self.updated_by = user
         
+        if update_fields is not None:
+            extra = ['updated_at', 'version'] + (['updated_by'] if user and user.is_authenticated else [])
+            kwargs['update_fields'] = list(dict.fromkeys([*update_fields, *extra]))
+        
         super().save(*args, **kwargs)
+        self._take_snapshot(kwargs.get('update_fields'))
     
     def soft_delete(self, user=None):
         """
@@ -241,19 +362,20 @@ class BaseModel(models.Model):
         """Safely get value from meta_info"""
         return self.meta_info.get(key, default) if self.meta_info else default
     
-    def set_meta_value(self, key, value):
-        """Safely set value in meta_info"""
+    def set_meta_value(self, key, value, commit=True):
+        """Safely set value in meta_info; pass commit=False to batch several keys into one save"""
         if not self.meta_info:
             self.meta_info = {}
         self.meta_info[key] = value
-        self.save(update_fields=['meta_info'])
+        if commit:
+            self.save(update_fields=['meta_info'], validate=False)
     
     def update_meta(self, **kwargs):
         """Update multiple meta values at once"""
         if not self.meta_info:
             self.meta_info = {}
         self.meta_info.update(kwargs)
-        self.save(update_fields=['meta_info'])
+        self.save(update_fields=['meta_info'], validate=False)
     
     def to_dict(self, include_meta=False, include_snowflake_info=False):
         """
@@ -311,6 +433,7 @@ class BaseModel(models.Model):
         """
         is_new = self._state.adding
         action = 'CREATE' if is_new else 'UPDATE'
+        changes = {} if is_new else self._get_changes()
         
         # Get request info if available
         ip_address = ""
@@ -334,8 +457,6 @@ class BaseModel(models.Model):
             if is_new:
                 AuditLogger.log_create(user, self, ip_address, user_agent)
             else:
-                # For updates, you might want to track what changed
-                changes = self._get_changes()
                 AuditLogger.log_update(user, self, changes, ip_address, user_agent)
         except ImportError:
             pass  # Audit logging not available
@@ -372,10 +493,8 @@ class BaseModel(models.Model):
         return ip
     
     def _get_changes(self):
-        """Get changes made in this update (simplified version)"""
-        # This would need to be implemented based on your specific needs
-        # You might want to use django-model-utils or similar for change tracking
-        return {}
+        """Get changes made in this update (diffed against the load-time snapshot)"""
+        return self.get_changed_fields(exclude=('updated_at', 'version'))
 
     @classmethod
     def get_by_snowflake_id(cls, snowflake_id):
@@ -1,5 +1,5 @@
 from django.db import models
-from apps.tcc.utils.snowflake import generate_snowflake_id
+from apps.tcc.utils.snowflake import generate_snowflake_id, allocate_snowflake_id_block, snowflake_range_lookup
 
 class BaseModelManager(models.Manager):
     """
@@ -29,10 +29,14 @@ class BaseModelManager(models.Manager):
     def bulk_create_with_ids(self, objs, batch_size=None):
         """
         Bulk create objects with Snowflake IDs
+        
+        IDs for objects built with id=None come from one block allocation.
         """
-        for obj in objs:
-            if not obj.id:
-                obj.id = generate_snowflake_id()
+        objs = list(objs)
+        missing = [obj for obj in objs if not obj.id]
+        if missing:
+            for obj, snowflake_id in zip(missing, allocate_snowflake_id_block(len(missing))):
+                obj.id = snowflake_id
         return super().bulk_create(objs, batch_size=batch_size)
     
     def get_by_snowflake(self, snowflake_id):
@@ -46,4 +50,20 @@ class BaseModelManager(models.Manager):
         Filter objects by Snowflake ID range
         Useful for time-based queries
         """
-        return self.get_queryset().filter(id__range=(start_id, end_id))
\ No newline at end of file
+        return self.get_queryset().filter(id__range=(start_id, end_id))
+    
+    def created_between(self, start=None, end=None):
+        """
+        Filter objects created in [start, end) by Snowflake ID bounds
+        
+        Same rows as a created_at range (IDs are generated at creation) but
+        served by the primary key. Rows imported with explicit older
+        created_at values are not covered.
+        """
+        return self.get_queryset().filter(**snowflake_range_lookup(start, end))
+    
+    def created_since(self, when):
+        """
+        Filter objects created at or after `when` by Snowflake ID
+        """
+        return self.created_between(start=when)
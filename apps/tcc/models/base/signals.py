@@ -1,20 +1,21 @@
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from asgiref.sync import sync_to_async
-import threading
+from contextvars import ContextVar
 import json
-from django.db import models
 
 from apps.tcc.models.base.auditlog import AuditLog
 from apps.tcc.models.base.base_model import BaseModel
+from apps.tcc.utils.audit_buffer import write_audit_log
 
 User = get_user_model()
 
-# Thread-local storage for request context
-_thread_locals = threading.local()
+# Per-request context - a context variable is isolated per thread and per
+# asyncio task, and is carried across sync_to_async/async_to_sync boundaries
+_current_request = ContextVar('audit_current_request', default=None)
 
 class AuditLogMiddleware:
     """Middleware to capture request context for audit logging"""
@@ -23,26 +24,25 @@ class AuditLogMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        # Store request in thread-local storage
-        _thread_locals.request = request
+        # Store request in the context for this request only
+        token = _current_request.set(request)
         try:
             response = self.get_response(request)
             return response
         finally:
             # Clean up
-            if hasattr(_thread_locals, 'request'):
-                delattr(_thread_locals, 'request')
+            _current_request.reset(token)
 
 def get_current_user():
-    """Get current user from thread-local storage"""
-    request = getattr(_thread_locals, 'request', None)
+    """Get current user from the request context"""
+    request = _current_request.get()
     if request and hasattr(request, 'user'):
         return request.user if request.user.is_authenticated else None
     return None
 
 def get_request_info():
     """Extract request information for audit logging"""
-    request = getattr(_thread_locals, 'request', None)
+    request = _current_request.get()
     if not request:
         return None, None
     
@@ -61,78 +61,57 @@ def get_request_info():
     
     return ip_address, user_agent
 
-def get_field_changes(old_instance, new_instance):
-    """Detect field-level changes between two instances"""
-    if not old_instance or not new_instance:
+# Fields that change on every save and are not reported as changes
+UNTRACKED_FIELDS = ('updated_at', 'version', 'meta_info')
+
+def get_field_changes(instance, exclude=UNTRACKED_FIELDS):
+    """Detect field-level changes against the values loaded from the database (no query)"""
+    if not instance or not hasattr(instance, 'get_changed_fields'):
         return {}
     
-    changes = {}
-    for field in new_instance._meta.fields:
-        field_name = field.name
-        old_value = getattr(old_instance, field_name, None)
-        new_value = getattr(new_instance, field_name, None)
-        
-        # Skip certain fields
-        if field_name in ['updated_at', 'version', 'meta_info']:
+    return instance.get_changed_fields(exclude=exclude)
+
+def _serialize_state(instance, values):
+    """
+    Map attname -> value pairs to a JSON-serializable dict keyed by field name.
+    Sensitive fields (BaseModel.AUDIT_SENSITIVE_FIELDS) are redacted.
+    """
+    state = {}
+    is_sensitive = getattr(instance, 'is_audit_sensitive', None)
+    for field in instance._meta.concrete_fields:
+        if field.attname not in values:
             continue
+        value = values[field.attname]
         
-        # Convert for comparison
-        if hasattr(old_value, 'pk'):
-            old_value = str(old_value.pk)
-        if hasattr(new_value, 'pk'):
-            new_value = str(new_value.pk)
-        
-        if old_value != new_value:
-            changes[field_name] = {
-                'old': old_value,
-                'new': new_value
-            }
+        if is_sensitive and is_sensitive(field.name):
+            state[field.name] = instance.AUDIT_REDACTED if value else value
+        # Relations by primary key - read from the attname so no related row is fetched
+        elif field.is_relation:
+            state[field.name] = str(value) if value is not None else None
+        else:
+            state[field.name] = value
     
-    return changes
+    return state
 
 def get_instance_state(instance):
     """Serialize instance state to JSON-serializable dict"""
     if not instance:
         return None
     
-    state = {}
-    for field in instance._meta.fields:
-        field_name = field.name
-        value = getattr(instance, field_name, None)
-        
-        # Handle different field types
-        if hasattr(value, 'pk'):
-            state[field_name] = str(value.pk)
-        elif isinstance(value, (models.Model, models.Manager)):
-            continue  # Skip model instances and managers
-        else:
-            state[field_name] = value
-    
-    return state
-
-# Store original states for update comparison
-_pre_save_states = {}
-
-@receiver(pre_save)
-def capture_pre_save_state(sender, instance, **kwargs):
-    """Capture instance state before save for update comparison"""
-    # Only track models that inherit from BaseModel
-    if not isinstance(instance, BaseModel):
-        return
-    
-    # Skip if this is a create operation
-    if instance.pk is None:
-        return
-    
-    try:
-        # Get the original instance from database
-        original = sender.objects.get(pk=instance.pk)
-        _pre_save_states[instance.pk] = {
-            'instance': original,
-            'state': get_instance_state(original)
-        }
-    except sender.DoesNotExist:
-        pass
+    deferred = instance.get_deferred_fields()
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in deferred
+    }
+    return _serialize_state(instance, values)
+
+def get_loaded_state(instance):
+    """Serialize the state the instance had when it was loaded (or last saved)"""
+    loaded = instance.get_loaded_values() if hasattr(instance, 'get_loaded_values') else None
+    if loaded is None:
+        return None
+    return _serialize_state(instance, loaded)
 
 @receiver(post_save)
 def log_create_update(sender, instance, created, **kwargs):
@@ -156,15 +135,14 @@ def log_create_update(sender, instance, created, **kwargs):
     changes = {}
     
     if not created:  # Update operation
-        pre_save_data = _pre_save_states.pop(instance.pk, None)
-        if pre_save_data:
-            before_state = pre_save_data['state']
-            old_instance = pre_save_data['instance']
-            changes = get_field_changes(old_instance, instance)
+        # BaseModel.save refreshes the snapshot only after post_save, so it
+        # still holds the pre-save values here
+        before_state = get_loaded_state(instance)
+        changes = get_field_changes(instance)
     
     # Create audit log entry
     try:
-        AuditLog.objects.create(
+        write_audit_log(
             content_object=instance,
             action=action,
             user=user,
@@ -198,7 +176,7 @@ def log_delete(sender, instance, **kwargs):
     before_state = get_instance_state(instance)
     
     try:
-        AuditLog.objects.create(
+        write_audit_log(
             content_object=instance,
             action='DELETE',
             user=user,
@@ -226,7 +204,7 @@ def log_restore(sender, instance, **kwargs):
     after_state = get_instance_state(instance)
     
     try:
-        AuditLog.objects.create(
+        write_audit_log(
             content_object=instance,
             action='RESTORE',
             user=user,
@@ -250,7 +228,7 @@ def log_custom_action(instance, action, user=None, notes=None):
     ip_address, user_agent = get_request_info()
     
     try:
-        AuditLog.objects.create(
+        write_audit_log(
             content_object=instance,
             action=action,
             user=user,
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class SnowflakeWorkerLease(models.Model):
+    """
+    One row per Snowflake (datacenter, machine) slot handed out to a process.
+
+    A plain model on purpose: its key is the worker slot itself, so creating
+    a lease never needs a Snowflake ID. A slot is free once `expires_at`
+    has passed without a heartbeat from its owner.
+    """
+    worker_id = models.PositiveIntegerField(primary_key=True, help_text="datacenter_id * 32 + machine_id")
+    datacenter_id = models.PositiveSmallIntegerField()
+    machine_id = models.PositiveSmallIntegerField()
+    owner = models.CharField(max_length=64, help_text="Random token of the holding process")
+    hostname = models.CharField(max_length=255, blank=True)
+    pid = models.PositiveIntegerField(null=True, blank=True)
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'snowflake_worker_leases'
+
+    def __str__(self):
+        return f"worker {self.datacenter_id}/{self.machine_id} held by {self.hostname}:{self.pid}"
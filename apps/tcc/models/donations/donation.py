@@ -132,9 +132,15 @@ class Donation(BaseModel):
             self.status = DonationStatus.COMPLETED
             self.save()
             
-            # Update fund balance
-            self.fund.current_balance += self.amount
-            self.fund.save()
+            # Update fund balance - version-checked so concurrent payments
+            # into the same fund cannot overwrite each other's increment
+            from apps.core.db.optimistic import optimistic_update
+            
+            self.fund = optimistic_update(
+                FundType._base_manager.all(),
+                self.fund_id,
+                lambda fund: {'current_balance': fund.current_balance + self.amount}
+            )
             
             return True
         except Exception:
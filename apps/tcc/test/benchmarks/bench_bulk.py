@@ -0,0 +1,90 @@
+"""
+Bulk write throughput for SafeManager on the users table.
+
+Seeds a throwaway test database and compares, for N rows:
+
+* Snowflake IDs: one generate_snowflake_id() per instance vs one block allocation
+* inserts: bulk_create with per-instance IDs vs SafeManager.bulk_upsert
+* updates: row-by-row save() (sampled and extrapolated), Django's bulk_update,
+  and SafeManager.bulk_update_values (CASE/WHEN per batch)
+
+    python -m apps.tcc.test.benchmarks.bench_bulk 100000
+"""
+import sys
+
+from apps.tcc.test.benchmarks.common import setup_django, test_database, time_once
+
+SAVE_SAMPLE = 2_000
+
+
+def build_users(count: int, prefix: str, with_ids: bool):
+    from apps.tcc.models.users.users import User
+
+    # id=None skips the per-instance default so the manager can allocate a block
+    extra = {} if with_ids else {'id': None}
+    return [
+        User(name=f"{prefix} {i}", email=f"{prefix}{i}@example.com", password='!', **extra)
+        for i in range(count)
+    ]
+
+
+def report(name: str, rows: int, seconds: float):
+    print(f"{name:<44} {seconds * 1000:>10.1f} ms {rows / seconds if seconds else 0:>12,.0f} rows/s")
+
+
+def run(rows: int = 100_000, batch_size: int = 1000):
+    setup_django()
+
+    from apps.core.db.manager import SafeManager
+    from apps.tcc.models.users.users import User
+    from apps.tcc.utils.snowflake import generate_snowflake_id, allocate_snowflake_id_block
+
+    manager = SafeManager()
+    manager.model = User
+
+    with test_database():
+        print(f"\n{rows:,} rows, batch size {batch_size}")
+
+        report("ids: generate_snowflake_id() x N", rows, time_once(lambda: [generate_snowflake_id() for _ in range(rows)]))
+        report("ids: allocate_snowflake_id_block(N)", rows, time_once(lambda: allocate_snowflake_id_block(rows)))
+
+        report(
+            "insert: build + bulk_create (per-row ids)", rows,
+            time_once(lambda: User.objects.bulk_create(build_users(rows, 'a', True), batch_size=batch_size))
+        )
+        report(
+            "insert: build + bulk_upsert (block ids)", rows,
+            time_once(lambda: manager.bulk_upsert(build_users(rows, 'b', False), ['email'], ['name'], batch_size))
+        )
+        report(
+            "upsert: bulk_upsert, all conflicting", rows,
+            time_once(lambda: manager.bulk_upsert(build_users(rows, 'b', False), ['email'], ['name'], batch_size))
+        )
+
+        users = list(User.objects.filter(email__startswith='b').order_by('id'))
+        sample = users[:SAVE_SAMPLE]
+
+        def save_each():
+            for user in sample:
+                user.name = f"{user.name}!"
+                user.save()
+
+        per_row = time_once(save_each) / len(sample)
+        report(f"update: save() per row (x{len(sample):,} extrapolated)", rows, per_row * rows)
+
+        def django_bulk_update():
+            for user in users:
+                user.status = 'active'
+            User.objects.bulk_update(users, ['status'], batch_size=batch_size)
+
+        report("update: QuerySet.bulk_update", rows, time_once(django_bulk_update))
+        report(
+            "update: SafeManager.bulk_update_values", rows,
+            time_once(lambda: manager.bulk_update_values(
+                {user.pk: {'status': 'inactive', 'role': 'member'} for user in users}, batch_size=batch_size
+            ))
+        )
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,51 @@
+"""
+Per-call overhead of DatabaseErrorHandler.handle_operation.
+
+The manager's ``get``/``filter`` are replaced with no-op callables so that the
+numbers isolate the decorator itself from database latency:
+
+    python -m apps.tcc.test.benchmarks.bench_db_handler
+"""
+from apps.tcc.test.benchmarks.common import setup_django, measure, print_results
+
+
+def run(iterations: int = 200_000):
+    setup_django()
+
+    from apps.core.db.db_handler import db_error_handler
+    from apps.core.db.manager import SafeManager, UserManager
+    from apps.tcc.models.users.users import User
+
+    sentinel = object()
+
+    manager = UserManager()
+    manager.model = User
+    manager.get = lambda **kwargs: sentinel
+    manager.filter = lambda **kwargs: sentinel
+
+    safe_get = SafeManager.safe_get
+    safe_filter = SafeManager.safe_filter
+    find_by_email = UserManager.find_by_email
+
+    cases = {
+        'safe_get': (safe_get, {'pk': 1}),
+        'safe_filter': (safe_filter, {'is_active': True}),
+        'find_by_email': (find_by_email, {'email': 'member@example.com'}),
+    }
+
+    for name, (wrapped, kwargs) in cases.items():
+        raw = wrapped.__wrapped__
+        results = {
+            'unwrapped': measure(lambda: raw(manager, **kwargs), iterations),
+            'handle_operation': measure(lambda: wrapped(manager, **kwargs), iterations),
+            # What every call paid before context building was made lazy
+            'handle_operation + eager context': measure(
+                lambda: (db_error_handler._build_context(raw, (manager,), kwargs), wrapped(manager, **kwargs)),
+                iterations // 10,
+            ),
+        }
+        print_results(name, results, baseline='unwrapped')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,75 @@
+"""
+Access token sign/verify throughput: HS256 vs RS256 vs EdDSA (Ed25519).
+
+Each algorithm signs and verifies through JWTManager with the verified-token
+cache off, so every verify is a full jwt.decode:
+
+* HS256: shared secret; every verifier must hold it
+* RS256: 2048-bit RSA key objects parsed once, kid in the header
+* EdDSA: Ed25519 key objects parsed once, kid in the header
+* RS256, PEM per call: what passing PEM text to PyJWT costs (the key is
+  parsed again on every encode/decode)
+
+Ed25519 signs several times faster than RSA-2048; RSA verification
+(e = 65537) stays cheap, so on some OpenSSL builds RS256 verifies faster
+than EdDSA. The verified-token cache hides most verify cost either way.
+
+    python -m apps.tcc.test.benchmarks.bench_jwt_algorithms 2000
+"""
+import sys
+
+import jwt
+
+from apps.tcc.test.benchmarks.common import measure, print_results, setup_django
+
+SECRET = "benchmark-secret-key-that-is-long-enough-for-hs256"
+
+
+def make_manager(algorithm: str):
+    from apps.core.jwt.jwt_backend import JWTManager, TokenConfig
+    from apps.core.jwt.key_rotation import SigningKey
+
+    private_pem = SigningKey.generate(algorithm).private_pem() if algorithm != "HS256" else None
+    config = TokenConfig(
+        secret_key=SECRET,
+        algorithm=algorithm,
+        private_key=private_pem,
+        verify_cache_size=0
+    )
+    return JWTManager(config)
+
+
+def run(iterations: int = 2000):
+    setup_django()
+    from apps.core.jwt.jwt_backend import TokenType
+
+    signing, verifying = {}, {}
+    for algorithm in ("HS256", "RS256", "EdDSA"):
+        manager = make_manager(algorithm)
+        token = manager.generate_access_token("1", "user@example.com", ["member"])
+        assert manager.verify_token(token, TokenType.ACCESS)[0]
+
+        signing[algorithm] = measure(
+            lambda: manager.generate_access_token("1", "user@example.com", ["member"]), iterations
+        )
+        verifying[algorithm] = measure(lambda: manager.verify_token(token, TokenType.ACCESS), iterations)
+
+    rsa_manager = make_manager("RS256")
+    key = rsa_manager.config.signing_key
+    private_pem, public_pem = key.private_pem(), key.public_pem()
+    payload = jwt.decode(
+        rsa_manager.generate_access_token("1", "user@example.com"), options={"verify_signature": False}
+    )
+    token = jwt.encode(payload, private_pem, algorithm="RS256")
+    signing["RS256, PEM per call"] = measure(lambda: jwt.encode(payload, private_pem, algorithm="RS256"), iterations)
+    verifying["RS256, PEM per call"] = measure(
+        lambda: jwt.decode(token, public_pem, algorithms=["RS256"], options={"verify_aud": False}), iterations
+    )
+
+    print_results(f"sign ({iterations:,} access tokens)", signing, baseline="HS256")
+    print_results(f"verify ({iterations:,} access tokens, no verify cache)", verifying, baseline="HS256")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
@@ -0,0 +1,133 @@
+"""
+Requests per second through Django's ASGIHandler with JWT authentication.
+
+Each variant serves an async view behind a single middleware, driven directly
+through the ASGI interface (no server, no sockets) with `concurrency` requests
+in flight:
+
+* legacy: a sync-only middleware calling async_to_sync(verify_token), as
+  JWTAuthMiddleware did before - Django wraps it in sync_to_async, so every
+  request hops to the sync thread and back
+* native: JWTAuthMiddleware in async mode, verifying inline
+
+    python -m apps.tcc.test.benchmarks.bench_jwt_middleware 20000 50
+"""
+import asyncio
+import sys
+import time
+
+from apps.tcc.test.benchmarks.common import setup_django
+
+PATH = "/bench/protected/"
+
+
+async def protected_view(request):
+    from django.http import HttpResponse
+    return HttpResponse(request.user_id)
+
+
+def _urlpatterns():
+    from django.urls import path
+    return [path(PATH.strip("/") + "/", protected_view)]
+
+
+urlpatterns = []
+
+
+class LegacyJWTAuthMiddleware:
+    """The pre-async shape: sync __call__ bridging to the async backend per request."""
+
+    def __init__(self, get_response):
+        from apps.core.jwt.jwt_backend import JWTBackend
+        self.get_response = get_response
+        self.jwt_backend = JWTBackend.get_instance()
+        self.public_paths = ["/tcc/health/", "/tcc/auth/login/", "/admin/", "/static/", "/media/"]
+
+    def __call__(self, request):
+        from asgiref.sync import async_to_sync
+        from django.http import JsonResponse
+        from apps.core.jwt.jwt_backend import TokenType
+
+        if any(request.path.startswith(p) for p in self.public_paths):
+            return self.get_response(request)
+        token = request.META.get("HTTP_AUTHORIZATION", "")[7:]
+        is_valid, payload = async_to_sync(self.jwt_backend.verify_token)(token, TokenType.ACCESS)
+        if not is_valid:
+            return JsonResponse({"error": "Invalid or expired token"}, status=401)
+        request.user_id = payload.get("sub")
+        return self.get_response(request)
+
+
+def make_scope(token: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+
+
+async def one_request(app, scope):
+    status = {}
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Django listens for a disconnect while the view runs; the client never leaves
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    assert status["code"] == 200, status
+
+
+async def drive(app, scope, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            await one_request(app, scope)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def run(requests: int = 20_000, concurrency: int = 50):
+    setup_django()
+
+    from django.core.handlers.asgi import ASGIHandler
+    from django.test.utils import override_settings
+    from apps.core.jwt.jwt_backend import JWTBackend
+
+    urlpatterns[:] = _urlpatterns()
+    token = JWTBackend.get_instance().jwt_manager.generate_access_token("42", "bench@example.com")
+    scope = make_scope(token)
+
+    print(f"\n{requests:,} requests, {concurrency} in flight")
+    for name, middleware in (
+        ("legacy (async_to_sync per request)", f"{__name__}.LegacyJWTAuthMiddleware"),
+        ("native async JWTAuthMiddleware", "apps.core.jwt.middleware.JWTAuthMiddleware"),
+    ):
+        with override_settings(MIDDLEWARE=[middleware], ROOT_URLCONF=__name__, ALLOWED_HOSTS=["*"], DEBUG=False):
+            app = ASGIHandler()
+            asyncio.run(drive(app, scope, 200, concurrency))  # warm-up
+            seconds = asyncio.run(drive(app, scope, requests, concurrency))
+        print(f"{name:<40} {seconds * 1000:>10.1f} ms {requests / seconds:>10,.0f} req/s")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
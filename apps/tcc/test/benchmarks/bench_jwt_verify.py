@@ -0,0 +1,61 @@
+"""
+JWTManager.verify_token throughput with and without the verified-token cache.
+
+A pool of distinct access tokens is verified round-robin, the way a few
+hundred active clients re-send their token on every request:
+
+* no cache: jwt.decode (HMAC + claim checks) on every call
+* cache: one decode per token, then LRU hits (each still checks the
+  user's revocation epoch from the in-process copy)
+
+    python -m apps.tcc.test.benchmarks.bench_jwt_verify 200000 500
+"""
+import sys
+
+from apps.tcc.test.benchmarks.common import setup_django, time_once
+
+
+def make_manager(cache_size: int):
+    from apps.core.jwt.jwt_backend import JWTManager, TokenConfig
+
+    config = TokenConfig(
+        secret_key="benchmark-secret-key-that-is-long-enough-for-hs256",
+        algorithm="HS256",
+        verify_cache_size=cache_size,
+        verify_cache_ttl=60
+    )
+    return JWTManager(config)
+
+
+def verify_all(manager, tokens, calls: int):
+    from apps.core.jwt.jwt_backend import TokenType
+
+    count = len(tokens)
+    for i in range(calls):
+        is_valid, _ = manager.verify_token(tokens[i % count], TokenType.ACCESS)
+        assert is_valid
+
+
+def report(name: str, calls: int, seconds: float, hit_rate: float = None):
+    rate = f"  hit rate {hit_rate:.1%}" if hit_rate is not None else ""
+    print(f"{name:<40} {seconds * 1000:>10.1f} ms {calls / seconds:>12,.0f} verifies/s{rate}")
+
+
+def run(calls: int = 200_000, clients: int = 500):
+    setup_django()
+    print(f"\n{calls:,} verifications over {clients} tokens")
+
+    for name, cache_size in (
+        ("no cache", 0),
+        ("cache", 10_000),
+    ):
+        manager = make_manager(cache_size)
+        tokens = [manager.generate_access_token(str(i), f"user{i}@example.com") for i in range(clients)]
+        seconds = time_once(lambda: verify_all(manager, tokens, calls))
+        stats = manager.get_verify_cache_stats()
+        report(name, calls, seconds, stats["hit_rate"] if cache_size else None)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,181 @@
+"""
+Login throughput under concurrency: failure bookkeeping in MySQL vs Redis.
+
+Seeds users in a throwaway test database and fires concurrent logins
+through LoginUseCase, one in five with a wrong password. Two variants:
+
+* legacy: the pre-Redis bookkeeping - every failure re-reads the user and
+  updates the users row, every success writes a reset and then last_login
+  (each update is a SELECT + UPDATE)
+* redis: LoginAttemptTracker counts failures in Redis; a success issues a
+  single UPDATE of last_login and only clears Redis if there were failures
+
+Reports logins/s and DB queries per login. Passwords are hashed with a low
+bcrypt cost (default 4) so the bookkeeping is not hidden behind hashing;
+pass 12 to see production numbers. Needs Redis at REDIS_URL (default a
+scratch database, redis://localhost:6379/15) for tokens and the tracker.
+
+    python -m apps.tcc.test.benchmarks.bench_login 2000 50 4
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from apps.tcc.test.benchmarks.common import setup_django, test_database
+
+USERS = 100
+PASSWORD = "Correct-horse-1"
+
+
+class QueryCounter:
+    """Counts queries on every connection, including sync_to_async worker threads."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+        connection_created.connect(lambda sender, connection, **kwargs: connection.execute_wrappers.append(self),
+                                   weak=False)
+
+
+def legacy_classes():
+    from django.utils import timezone
+
+    from apps.core.jwt.login_attempts import LoginState
+    from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
+    from apps.tcc.usecase.usecases.auth.login_uc import LoginUseCase
+
+    class LegacyUserRepository(UserRepository):
+        async def record_login(self, user_id, when=None):
+            await self.update(user_id, {"last_login": timezone.now(), "failed_login_attempts": 0})
+
+    class ResetEveryLogin:
+        async def get_state(self, user_id):
+            return LoginState(has_history=True)
+
+    class LegacyLoginUseCase(LoginUseCase):
+        """Failure counters and resets written to the users row, as before."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.login_tracker = ResetEveryLogin()
+
+        async def _track_failed_login(self, user_id, ctx=None):
+            user = await self.user_repository.get_by_id(user_id)
+            attempts = getattr(user, "failed_login_attempts", 0)
+            await self.user_repository.update(user_id, {"failed_login_attempts": attempts + 1})
+
+        async def _reset_failed_logins(self, user_id, ctx=None):
+            await self.user_repository.update(user_id, {
+                "failed_login_attempts": 0,
+                "is_locked": False,
+                "lock_reason": None,
+            })
+
+    return LegacyUserRepository, LegacyLoginUseCase
+
+
+async def run_logins(make_uc, logins: int, concurrency: int):
+    from apps.tcc.usecase.domain_exception.auth_exceptions import InvalidAuthInputException
+
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = {"ok": 0, "failed": 0, "error": 0}
+
+    async def login(i):
+        password = "wrong-password" if i % 5 == 0 else PASSWORD
+        async with semaphore:
+            try:
+                await make_uc().execute({"email": f"member{i % USERS}@example.com", "password": password}, None, {})
+                outcomes["ok"] += 1
+            except InvalidAuthInputException:
+                outcomes["failed"] += 1
+            except Exception:
+                outcomes["error"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    return time.perf_counter() - start, outcomes
+
+
+async def run_variants(logins: int, concurrency: int):
+    from apps.core.cache.async_cache import AsyncRedisCache
+    from apps.core.jwt.jwt_backend import JWTBackend
+    from apps.core.jwt.login_attempts import LoginAttemptTracker
+    from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
+    from apps.tcc.usecase.usecases.auth.login_uc import LoginUseCase
+    from apps.tcc.usecase.usecases.base.password_service import PasswordService
+
+    cache = AsyncRedisCache(redis_url=os.environ.get("REDIS_URL", "redis://localhost:6379/15"))
+    if not await cache._ensure_connected():
+        raise SystemExit(f"Redis is not reachable at {cache.redis_url}")
+
+    jwt_service = JWTBackend.get_instance().jwt_manager
+    jwt_service.session_store._cache = cache
+    password_service = PasswordService()
+    LegacyUserRepository, LegacyLoginUseCase = legacy_classes()
+    # max_attempts above the failure rate: this measures bookkeeping, not lockouts
+    tracker = LoginAttemptTracker(cache, max_attempts=50)
+
+    variants = {
+        "legacy (users row)": lambda repo=LegacyUserRepository(): LegacyLoginUseCase(repo, jwt_service, password_service),
+        "redis (LoginAttemptTracker)": lambda repo=UserRepository(): LoginUseCase(
+            repo, jwt_service, password_service, login_tracker=tracker
+        ),
+    }
+
+    counter = QueryCounter()
+    counter.install()
+    results = {}
+    try:
+        for name, make_uc in variants.items():
+            await run_logins(make_uc, concurrency, concurrency)  # warm-up
+            counter.count = 0
+            seconds, outcomes = await run_logins(make_uc, logins, concurrency)
+            results[name] = (seconds, outcomes, counter.count)
+            await cache.flush_pattern("login_*")
+    finally:
+        await cache.flush_pattern("refresh_*")
+        await cache.close()
+    return results
+
+
+def run(logins: int = 2000, concurrency: int = 50, rounds: int = 4):
+    setup_django()
+
+    import bcrypt
+    from apps.tcc.models.users.users import User
+
+    with test_database():
+        password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+        User.objects.bulk_create([
+            User(name=f"Member {i}", email=f"member{i}@example.com", password=password_hash)
+            for i in range(USERS)
+        ])
+
+        results = asyncio.run(run_variants(logins, concurrency))
+
+    print(f"\n{logins:,} logins ({concurrency} concurrent, 20% wrong password), bcrypt cost {rounds}")
+    print(f"{'bookkeeping':<30} {'logins/s':>10} {'queries/login':>14} {'ok':>6} {'failed':>7} {'errors':>7}")
+    for name, (seconds, outcomes, queries) in results.items():
+        print(
+            f"{name:<30} {logins / seconds:>10,.0f} {queries / logins:>14.2f} "
+            f"{outcomes['ok']:>6} {outcomes['failed']:>7} {outcomes['error']:>7}"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:4]]
+    run(*args)
@@ -0,0 +1,77 @@
+"""
+OFFSET vs keyset (cursor) pagination on the users table.
+
+Seeds a throwaway test database with N users and times fetching one page at
+increasing depths, the way UserRepository.get_paginated (OFFSET + COUNT) and
+UserRepository.get_cursor_page (seek on the Snowflake primary key) do it:
+
+    python -m apps.tcc.test.benchmarks.bench_pagination 100000 1000000
+"""
+import sys
+
+from apps.tcc.test.benchmarks.common import setup_django, test_database, time_once
+
+PAGE_SIZE = 20
+DEPTHS = (0.0, 0.1, 0.5, 0.9)
+
+
+def seed_users(count: int, batch_size: int = 5000):
+    from apps.tcc.models.users.users import User
+    from apps.tcc.utils.snowflake import batch_generate_snowflake_ids
+
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        ids = []
+        while len(ids) < size:
+            ids.extend(batch_generate_snowflake_ids(min(1000, size - len(ids))))
+        User.objects.bulk_create(
+            [
+                User(id=user_id, name=f"Member {created + i}", email=f"member{created + i}@example.com", password='!')
+                for i, user_id in enumerate(ids)
+            ],
+            batch_size=batch_size,
+        )
+        created += size
+
+
+def run(row_counts=(100_000, 1_000_000), repeat: int = 3):
+    setup_django()
+
+    from apps.tcc.models.users.users import User
+    from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
+    from apps.core.schemas.common.pagination import encode_cursor
+
+    repo = UserRepository()
+
+    with test_database():
+        seeded = 0
+        for rows in row_counts:
+            seed_users(rows - seeded)
+            seeded = rows
+
+            queryset = User.objects.filter(is_active=True)
+            ordered_ids = User.objects.order_by('-id').values_list('id', flat=True)
+
+            print(f"\n{rows:,} users, page size {PAGE_SIZE}")
+            print(f"{'depth':>6} {'offset':>10} {'OFFSET+COUNT ms':>16} {'keyset ms':>10}")
+
+            for depth in DEPTHS:
+                offset = int(rows * depth)
+                cursor = encode_cursor(ordered_ids[offset - 1]) if offset else None
+
+                def offset_page():
+                    queryset.count()
+                    list(queryset.order_by('-created_at')[offset:offset + PAGE_SIZE])
+
+                def keyset_page():
+                    repo._keyset_page(queryset, cursor=cursor, limit=PAGE_SIZE)
+
+                offset_ms = min(time_once(offset_page) for _ in range(repeat)) * 1000
+                keyset_ms = min(time_once(keyset_page) for _ in range(repeat)) * 1000
+                print(f"{depth:>6.0%} {offset:>10,} {offset_ms:>16.2f} {keyset_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    counts = tuple(int(arg) for arg in sys.argv[1:]) or (100_000, 1_000_000)
+    run(counts)
@@ -0,0 +1,98 @@
+"""
+Password hashing under a login burst: shared thread executor vs process pool.
+
+Fires a burst of concurrent bcrypt verifications while a probe stands in for
+the worker's other traffic: every 10 ms it runs a small piece of Python
+through sync_to_async, as a view would, and records how long that took.
+
+* threads: bcrypt via sync_to_async on the shared executor - the old
+  PasswordService path
+* process pool: BcryptHasher, bcrypt in worker processes; the burst is
+  bounded by workers + queue and the excess is shed
+
+Reports verifications/s, shed count, the hasher's queue wait and hash time,
+and the probe's p50/p99 latency.
+
+    python -m apps.tcc.test.benchmarks.bench_password_hashing 64 12
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import bcrypt
+from asgiref.sync import sync_to_async
+
+PASSWORD = "Correct-horse-1"
+
+
+def python_work():
+    return sum(i * i for i in range(2000))
+
+
+async def probe(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await sync_to_async(python_work)()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def burst(verify, logins: int):
+    stop, samples = asyncio.Event(), []
+    probe_task = asyncio.create_task(probe(stop, samples))
+    await asyncio.sleep(0.1)  # probe baseline
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify() for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    verified = sum(r is True for r in results)
+    shed = sum(isinstance(r, Exception) for r in results)
+    return elapsed, verified, shed, samples
+
+
+async def run_variants(logins: int, rounds: int):
+    from apps.core.jwt.hashing import BcryptHasher
+
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds))
+
+    async def thread_verify():
+        return await sync_to_async(bcrypt.checkpw)(PASSWORD.encode(), hashed)
+
+    hasher = BcryptHasher(rounds=rounds, max_queue=logins // 2)
+    await hasher.verify(PASSWORD, hashed.decode())  # start the workers
+
+    async def pool_verify():
+        return await hasher.verify(PASSWORD, hashed.decode())
+
+    try:
+        results = {
+            "threads (sync_to_async)": (await burst(thread_verify, logins), None),
+            f"process pool ({hasher.max_workers} workers)": (await burst(pool_verify, logins), hasher.get_stats()),
+        }
+    finally:
+        hasher.shutdown()
+    return results
+
+
+def run(logins: int = 64, rounds: int = 12):
+    results = asyncio.run(run_variants(logins, rounds))
+
+    print(f"\nburst of {logins} concurrent verifications at bcrypt cost {rounds}")
+    print(f"{'executor':<28} {'verify/s':>9} {'shed':>5} {'wait ms':>8} {'hash ms':>8} {'probe p50':>10} {'probe p99':>10}")
+    for name, ((elapsed, verified, shed, samples), stats) in results.items():
+        percentiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else [0.0] * 99
+        wait = f"{stats['queue_wait']['avg_ms']:.1f}" if stats else "-"
+        hash_ms = f"{stats['hash_time']['avg_ms']:.1f}" if stats else "-"
+        print(
+            f"{name:<28} {verified / elapsed:>9,.1f} {shed:>5} {wait:>8} {hash_ms:>8} "
+            f"{percentiles[49] * 1000:>8.2f}ms {percentiles[98] * 1000:>8.2f}ms"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,108 @@
+"""
+Rate limiter strategies against a real Redis: latency and correctness.
+
+* legacy: the old sliding window - GET a JSON list of timestamps, filter it in
+  Python, SET it back (two round trips, racy, O(n) in the window)
+* sliding_window / fixed_window / token_bucket: RateLimiter's Lua scripts,
+  one atomic round trip each
+
+For each variant the benchmark reports sequential per-check latency, then
+fires a concurrent burst at one key and counts how many requests were
+admitted against the limit (anything above the limit is over-admission).
+
+Uses REDIS_URL (default a scratch database, redis://localhost:6379/15).
+
+    python -m apps.tcc.test.benchmarks.bench_rate_limiter 5000 200
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from apps.tcc.test.benchmarks.common import setup_django
+
+
+class LegacySlidingWindow:
+    """The pre-Lua read-modify-write implementation, for comparison."""
+
+    def __init__(self, cache, prefix="bench_rate_limit_legacy"):
+        self.cache = cache
+        self.prefix = prefix
+
+    async def check_rate_limit(self, identifier, action, config):
+        key = f"{self.prefix}:{action}:{identifier}"
+        now = time.time()
+        window_start = now - config.window_seconds
+        window_data = await self.cache.get(key) or {"requests": []}
+        requests = [ts for ts in window_data["requests"] if ts >= window_start]
+        allowed = len(requests) < config.max_requests
+        if allowed:
+            requests.append(now)
+            await self.cache.set(key, {"requests": requests}, config.window_seconds)
+        return allowed
+
+
+async def latencies(check, checks: int):
+    samples = []
+    for i in range(checks):
+        start = time.perf_counter()
+        await check(f"client-{i % 100}")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def burst_admitted(check, burst: int) -> int:
+    results = await asyncio.gather(*(check("burst-client") for _ in range(burst)))
+    return sum(bool(getattr(r, "allowed", r)) for r in results)
+
+
+async def run_variants(checks: int, burst: int):
+    from apps.core.cache.async_cache import AsyncRedisCache
+    from apps.core.jwt.rate_limiter import RateLimitConfig, RateLimiter, RateLimitStrategy
+
+    cache = AsyncRedisCache(redis_url=os.environ.get("REDIS_URL", "redis://localhost:6379/15"), max_connections=50)
+    if not await cache._ensure_connected():
+        raise SystemExit(f"Redis is not reachable at {cache.redis_url}")
+
+    limit = burst // 4
+    limiter = RateLimiter(cache, prefix="bench_rate_limit")
+    variants = [("legacy (GET/SET JSON list)", LegacySlidingWindow(cache), RateLimitStrategy.SLIDING_WINDOW)]
+    variants += [(strategy.value, limiter, strategy) for strategy in RateLimitStrategy]
+
+    results = []
+    try:
+        for name, impl, strategy in variants:
+            config = RateLimitConfig(strategy=strategy, max_requests=limit, window_seconds=60)
+
+            async def check(identifier, impl=impl, config=config):
+                return await impl.check_rate_limit(identifier, "bench", config)
+
+            await latencies(check, 200)  # warm-up (also fills the windows)
+            samples = await latencies(check, checks)
+            admitted = await burst_admitted(check, burst)
+            results.append((name, samples, admitted))
+            await cache.flush_pattern("bench_rate_limit*")
+    finally:
+        await cache.close()
+    return limit, results
+
+
+def run(checks: int = 5000, burst: int = 200):
+    setup_django()
+
+    limit, results = asyncio.run(run_variants(checks, burst))
+
+    print(f"\n{checks:,} sequential checks; burst of {burst} concurrent checks at limit {limit}")
+    print(f"{'strategy':<28} {'p50 ms':>8} {'p99 ms':>8} {'checks/s':>10} {'admitted':>9}")
+    for name, samples, admitted in results:
+        percentiles = statistics.quantiles(samples, n=100)
+        print(
+            f"{name:<28} {percentiles[49] * 1000:>8.3f} {percentiles[98] * 1000:>8.3f} "
+            f"{1 / statistics.fmean(samples):>10,.0f} {admitted:>5}/{limit}"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,105 @@
+"""
+Refresh-flow latency against a real Redis.
+
+One refresh = verify the refresh JWT, rotate it in the session store and
+mint a new access token. Two stores are compared:
+
+* sequential: the same rotation with one await per Redis command (5 round
+  trips), as an unpipelined store would issue them
+* pipelined: RefreshSessionStore.rotate, one MULTI/EXEC round trip
+
+Uses REDIS_URL (default a scratch database, redis://localhost:6379/15) and
+deletes its keys afterwards. The gap grows with network latency; run it
+against the Redis the app actually uses to see the production difference.
+
+    python -m apps.tcc.test.benchmarks.bench_refresh_flow 2000
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from apps.tcc.test.benchmarks.common import setup_django
+
+
+def _sequential_store_class():
+    from apps.core.jwt.session_store import RefreshSessionStore, RefreshTokenReused
+
+    class SequentialSessionStore(RefreshSessionStore):
+        """rotate() with one await per command instead of a pipeline."""
+
+        async def rotate(self, user_id, old_jti, new_jti, session_id, ttl=None, metadata=None):
+            ttl = ttl or self.ttl
+            record = self._record(new_jti, session_id, ttl, metadata)
+            client = self.cache.redis_client
+            index_key = self._index_key(user_id)
+
+            if not await client.srem(index_key, old_jti):
+                raise RefreshTokenReused("Refresh token has already been used")
+            await client.delete(self._token_key(user_id, old_jti))
+            await client.set(self._token_key(user_id, new_jti), json.dumps(record), ex=ttl)
+            await client.sadd(index_key, new_jti)
+            await client.expire(index_key, ttl)
+            return record
+
+    return SequentialSessionStore
+
+
+async def refresh_latencies(manager, refreshes: int):
+    token = await manager.generate_refresh_token("bench-user", "bench@example.com", session_id="bench")
+    latencies = []
+    for _ in range(refreshes):
+        start = time.perf_counter()
+        payload = await manager.verify_refresh_token(token)
+        token = await manager.rotate_refresh_token(payload)
+        manager.generate_access_token(payload["sub"], payload["email"], session_id=payload["session_id"])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_variants(refreshes: int):
+    from apps.core.cache.async_cache import AsyncRedisCache
+    from apps.core.jwt.jwt_backend import JWTManager, TokenConfig
+    from apps.core.jwt.session_store import RefreshSessionStore
+
+    cache = AsyncRedisCache(redis_url=os.environ.get("REDIS_URL", "redis://localhost:6379/15"))
+    if not await cache._ensure_connected():
+        raise SystemExit(f"Redis is not reachable at {cache.redis_url}")
+
+    config = TokenConfig()
+    results = {}
+    try:
+        for name, store_class in (
+            ("sequential (5 round trips)", _sequential_store_class()),
+            ("pipelined RefreshSessionStore", RefreshSessionStore),
+        ):
+            manager = JWTManager(config, session_store=store_class(cache, ttl=config.refresh_token_expiry))
+            await refresh_latencies(manager, 50)  # warm-up
+            results[name] = await refresh_latencies(manager, refreshes)
+            await manager.session_store.revoke_all("bench-user")
+    finally:
+        await cache.close()
+    return results
+
+
+def run(refreshes: int = 2000):
+    setup_django()
+
+    results = asyncio.run(run_variants(refreshes))
+
+    print(f"\n{refreshes:,} sequential refreshes (verify + rotate + access token)")
+    print(f"{'store':<32} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'refresh/s':>10}")
+    for name, latencies in results.items():
+        percentiles = statistics.quantiles(latencies, n=100)
+        mean = statistics.fmean(latencies)
+        print(
+            f"{name:<32} {percentiles[49] * 1000:>8.3f} {percentiles[98] * 1000:>8.3f} "
+            f"{mean * 1000:>8.3f} {1 / mean:>10,.0f}"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
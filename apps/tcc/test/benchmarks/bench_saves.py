@@ -0,0 +1,86 @@
+"""
+Per-row update cost of BaseModel.save for User and Donation.
+
+Seeds a throwaway test database and runs the same update loop three ways:
+
+* full: every column written and full_clean on the whole model - what save()
+  did before dirty tracking (unique-email SELECT for User, donor/fund
+  existence SELECTs for Donation)
+* dirty: save() - only changed columns written, full_clean scoped to them
+* trusted: save(validate=False) - the path for input already validated upstream
+
+    python -m apps.tcc.test.benchmarks.bench_saves 2000
+"""
+import sys
+from decimal import Decimal
+
+from apps.tcc.test.benchmarks.common import setup_django, test_database, time_once
+
+
+def report(name: str, rows: int, seconds: float, queries: int):
+    print(
+        f"{name:<36} {seconds * 1000:>10.1f} ms {rows / seconds if seconds else 0:>10,.0f} saves/s"
+        f" {queries / rows:>6.1f} queries/save"
+    )
+
+
+def run_loop(label: str, objects, mutate, save):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def loop():
+        for i, obj in enumerate(objects):
+            mutate(obj, i)
+            save(obj)
+
+    with CaptureQueriesContext(connection) as ctx:
+        seconds = time_once(loop)
+    report(label, len(objects), seconds, len(ctx.captured_queries))
+
+
+def compare(model_name: str, objects, mutate):
+    all_fields = [f.name for f in objects[0]._meta.concrete_fields if not f.primary_key]
+
+    print(f"\n{model_name}: {len(objects):,} updates")
+    run_loop("full: all columns + full_clean", objects, mutate, lambda obj: obj.save(update_fields=all_fields))
+    run_loop("dirty: save()", objects, mutate, lambda obj: obj.save())
+    run_loop("trusted: save(validate=False)", objects, mutate, lambda obj: obj.save(validate=False))
+
+
+def run(rows: int = 2000):
+    setup_django()
+
+    from apps.tcc.models.donations.donation import Donation, FundType
+    from apps.tcc.models.users.users import User
+    from apps.tcc.utils.audit_buffer import flush_audit_log
+
+    with test_database():
+        User.objects.bulk_create([
+            User(name=f"Member {i}", email=f"member{i}@example.com", password='!')
+            for i in range(rows)
+        ])
+        users = list(User.objects.order_by('id'))
+
+        def rename(user, i):
+            user.name = f"{user.name}!"
+
+        compare("User", users, rename)
+
+        fund = FundType.objects.create(name="General")
+        Donation.objects.bulk_create_with_ids([
+            Donation(id=None, donor=users[i % len(users)], fund=fund, amount=Decimal('10.00'))
+            for i in range(rows)
+        ])
+        donations = list(Donation.objects.order_by('id'))
+
+        def annotate(donation, i):
+            donation.notes = f"note {i}-{donation.version}"
+
+        compare("Donation", donations, annotate)
+
+        # Write the buffered audit entries while the test database still exists
+        flush_audit_log()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,122 @@
+"""
+Snowflake ID throughput: IDs per second single-threaded, across threads and
+across processes, for each sequence strategy.
+
+* per-id: a cache reservation for every ID (reserve_size=1) - the old cost
+* reserved: one INCRBY per `reserve_size` IDs per millisecond (default mode)
+* local: no network at all (process owns its machine ID)
+
+The cache is whatever CACHES['default'] is configured to; against Redis the
+per-id row shows the round-trip cost, against locmem only the Python overhead.
+Processes are forked, each with its own generator and machine ID.
+
+The batch section compares a list of IDs against allocate_array (array('q')
+and NumPy when installed), and per-ID decompose_id against decompose_ids.
+
+    python -m apps.tcc.test.benchmarks.bench_snowflake 200000
+"""
+import multiprocessing
+import sys
+import threading
+import time
+
+from apps.tcc.test.benchmarks.common import setup_django, time_once
+
+STRATEGIES = {
+    'per-id': {'sequence_mode': 'reserved', 'reserve_size': 1},
+    'reserved x64': {'sequence_mode': 'reserved', 'reserve_size': 64},
+    'local': {'sequence_mode': 'local'},
+}
+
+
+def make_generator(options, machine_id=1):
+    from apps.tcc.utils.snowflake import DjangoSnowflakeGenerator
+    return DjangoSnowflakeGenerator(machine_id=machine_id, **options)
+
+
+def single_thread(options, count):
+    generator = make_generator(options)
+    start = time.perf_counter()
+    ids = [generator.generate_id() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    assert len(set(ids)) == count, "duplicate IDs"
+    return elapsed
+
+
+def multi_thread(options, count, threads):
+    generator = make_generator(options)
+    per_thread = count // threads
+    results = [None] * threads
+
+    def work(index):
+        results[index] = [generator.generate_id() for _ in range(per_thread)]
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    ids = [snowflake_id for chunk in results for snowflake_id in chunk]
+    assert len(set(ids)) == len(ids), "duplicate IDs"
+    return elapsed
+
+
+def _process_worker(args):
+    options, count, machine_id = args
+    generator = make_generator(options, machine_id=machine_id)
+    return [generator.generate_id() for _ in range(count)]
+
+
+def multi_process(options, count, processes):
+    per_process = count // processes
+    context = multiprocessing.get_context('fork')
+    with context.Pool(processes) as pool:
+        start = time.perf_counter()
+        chunks = pool.map(_process_worker, [(options, per_process, i + 1) for i in range(processes)])
+        elapsed = time.perf_counter() - start
+
+    ids = [snowflake_id for chunk in chunks for snowflake_id in chunk]
+    assert len(set(ids)) == len(ids), "duplicate IDs"
+    return elapsed
+
+
+def report(name: str, count: int, seconds: float):
+    print(f"{name:<36} {seconds * 1000:>10.1f} ms {count / seconds:>14,.0f} ids/s")
+
+
+def batch_and_decompose(count):
+    from apps.tcc.utils.snowflake import np
+
+    generator = make_generator({'sequence_mode': 'local'})
+    report("batch: allocate_block -> list", count, time_once(lambda: generator.allocate_block(count)))
+    report("batch: allocate_array -> array('q')", count, time_once(lambda: generator.allocate_array(count)))
+    if np is not None:
+        report("batch: allocate_array -> numpy", count, time_once(lambda: generator.allocate_array(count, as_numpy=True)))
+
+    ids = generator.allocate_array(count)
+    report("decompose: decompose_id per ID", count, time_once(lambda: [generator.decompose_id(i) for i in ids]))
+    report("decompose: decompose_ids array('q')", count, time_once(lambda: generator.decompose_ids(ids)))
+    if np is not None:
+        id_array = np.frombuffer(ids, dtype=np.int64)
+        report("decompose: decompose_ids numpy", count, time_once(lambda: generator.decompose_ids(id_array)))
+
+
+def run(count: int = 200_000, threads: int = 8, processes: int = 4):
+    setup_django()
+
+    from django.conf import settings
+    print(f"\n{count:,} IDs, cache backend {settings.CACHES['default']['BACKEND']}")
+
+    for name, options in STRATEGIES.items():
+        report(f"{name}: 1 thread", count, single_thread(options, count))
+        report(f"{name}: {threads} threads", count, multi_thread(options, count, threads))
+        report(f"{name}: {processes} processes", count, multi_process(options, count, processes))
+
+    batch_and_decompose(count)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,80 @@
+"""
+Shared helpers for the micro-benchmarks in this package.
+
+Benchmarks are plain scripts (``python -m apps.tcc.test.benchmarks.<name>``)
+and are deliberately not collected by pytest.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any
+
+
+def setup_django(settings_module: str = 'config.settings.base'):
+    """Configure Django the same way manage.py does."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    os.environ.setdefault('DJANGO_ALLOW_ASYNC_UNSAFE', 'true')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity: int = 0):
+    """
+    Run the block against a throwaway test database.
+
+    Seeded benchmark data never touches the configured database; the test
+    database is created from migrations and dropped afterwards.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def time_once(func: Callable[[], Any]) -> float:
+    """Wall-clock seconds for a single call (for operations too slow to loop)."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(func: Callable[[], Any], iterations: int = 100_000, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time ``func`` and return the best run as per-call and per-second figures.
+
+    Taking the best of ``repeat`` runs filters out scheduler noise, which is
+    what we want when comparing code paths rather than machines.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'iterations': iterations,
+        'total_s': best,
+        'per_call_ns': best / iterations * 1e9,
+        'per_second': iterations / best if best else float('inf'),
+    }
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]], baseline: str = None):
+    """Print a small results table, optionally relative to a baseline row."""
+    print(f"\n{title}")
+    print("-" * len(title))
+    base = results.get(baseline, {}).get('per_call_ns') if baseline else None
+    for name, r in results.items():
+        line = f"{name:<40} {r['per_call_ns']:>12.1f} ns/call {r['per_second']:>14,.0f} ops/s"
+        if base:
+            line += f"   (+{r['per_call_ns'] - base:,.1f} ns)"
+        print(line)
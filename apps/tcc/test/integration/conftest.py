@@ -0,0 +1,14 @@
+import pytest
+
+from apps.tcc.utils import audit_buffer
+
+
+@pytest.fixture(scope='session', autouse=True)
+def audit_writer_teardown(django_db_setup, django_db_blocker):
+    """Stop the background audit flusher and write its queue before the test database is torn down."""
+    yield
+    writer = audit_buffer._audit_writer
+    if writer is not None:
+        with django_db_blocker.unblock():
+            writer.shutdown()
+        audit_buffer._audit_writer = None
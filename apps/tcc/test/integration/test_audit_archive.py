@@ -0,0 +1,91 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from apps.core.db.partitions import MonthlyPartitioner, add_months
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.models.users.users import User
+from apps.tcc.utils.audit_archive import AuditArchiveReader, AuditArchiver
+from apps.tcc.utils.snowflake import snowflake_id_floor
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(email='archived@example.com', name='Archived User', password='Archive123!@#')
+
+
+def seed(member, month, count, action='UPDATE'):
+    """Audit rows whose Snowflake IDs fall in `month`"""
+    content_type = ContentType.objects.get_for_model(User)
+    base = snowflake_id_floor(datetime(month[0], month[1], 2, tzinfo=timezone.utc))
+    start = AuditLog._base_manager.filter(pk__gte=base).count()
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            id=base + start + i, content_type=content_type, object_id=member.pk,
+            action=action, user=member, changes={'n': i}
+        )
+        for i in range(count)
+    ])
+
+
+@pytest.mark.django_db
+class TestAuditArchive:
+    def test_month_bounds_follow_snowflake_time(self):
+        """Test month bounds are consecutive Snowflake ID floors."""
+        partitioner = MonthlyPartitioner(AuditLog)
+        low, high = partitioner.month_bounds((2026, 1))
+
+        assert high == partitioner.month_bounds((2026, 2))[0]
+        assert low == snowflake_id_floor(datetime(2026, 1, 1, tzinfo=timezone.utc))
+        assert add_months((2026, 11), 3) == (2027, 2)
+
+    def test_old_months_are_exported_and_removed(self, tmp_path, member):
+        """Test months past retention move to gzip files and leave the table."""
+        AuditLog._base_manager.all().delete()
+        seed(member, (2026, 1), 3)
+        seed(member, (2026, 2), 2)
+        seed(member, (2026, 9), 4)
+
+        archiver = AuditArchiver(archive_dir=str(tmp_path), retention_months=6)
+        results = archiver.run(today=TODAY)
+
+        assert [r['rows'] for r in results] == [3, 2, 0]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            'auditlog-2026-01.jsonl.gz', 'auditlog-2026-02.jsonl.gz'
+        ]
+        assert AuditLog._base_manager.count() == 4
+
+    def test_reader_filters_by_object_and_time(self, tmp_path, member):
+        """Test archived entries can be queried by object and time range."""
+        AuditLog._base_manager.all().delete()
+        seed(member, (2026, 1), 3)
+        seed(member, (2026, 2), 2, action='DELETE')
+        AuditArchiver(archive_dir=str(tmp_path), retention_months=6).run(today=TODAY)
+
+        reader = AuditArchiveReader(archive_dir=str(tmp_path))
+        assert reader.archived_months() == [(2026, 1), (2026, 2)]
+
+        everything = list(reader.query(content_object=member))
+        assert len(everything) == 5
+        assert everything[0].changes == {'n': 0}
+
+        february = list(reader.query(
+            content_type=User, object_id=member.pk,
+            start=datetime(2026, 2, 1, tzinfo=timezone.utc), end=datetime(2026, 3, 1, tzinfo=timezone.utc)
+        ))
+        assert [entry.action for entry in february] == ['DELETE', 'DELETE']
+        assert list(reader.query(object_id=member.pk + 1)) == []
+
+    def test_rearchived_month_is_deduplicated(self, tmp_path, member):
+        """Test a month exported twice is read back once."""
+        AuditLog._base_manager.all().delete()
+        seed(member, (2026, 1), 2)
+        archiver = AuditArchiver(archive_dir=str(tmp_path), retention_months=6)
+        archiver.archive_month((2026, 1), drop=False)
+        archiver.archive_month((2026, 1))
+
+        assert (tmp_path / 'auditlog-2026-01.1.jsonl.gz').exists()
+        assert len(list(AuditArchiveReader(archive_dir=str(tmp_path)).query(content_object=member))) == 2
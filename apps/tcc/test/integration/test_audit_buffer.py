@@ -0,0 +1,80 @@
+import pytest
+
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.models.users.users import User
+from apps.tcc.utils.audit_buffer import AuditDurability, BufferedAuditWriter
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(email='audited@example.com', name='Audited User', password='Audit123!@#')
+
+
+def make_writer(tmp_path, **overrides):
+    # Long interval and large batches keep the background flusher idle during a test
+    options = {'batch_size': 1000, 'flush_interval': 3600, 'spill_dir': str(tmp_path)}
+    options.update(overrides)
+    return BufferedAuditWriter(**options)
+
+
+@pytest.mark.django_db
+class TestBufferedAuditWriter:
+    def _write(self, writer, member, count, capture):
+        with capture(execute=True):
+            for _ in range(count):
+                writer.write(content_object=member, action='READ', user=member)
+
+    def test_entries_wait_for_flush(self, tmp_path, member, django_capture_on_commit_callbacks):
+        """Test entries are queued and written in one flush."""
+        AuditLog.objects.all().delete()
+        writer = make_writer(tmp_path)
+        self._write(writer, member, 3, django_capture_on_commit_callbacks)
+
+        assert AuditLog.objects.count() == 0
+        assert writer.flush() == 3
+        assert AuditLog.objects.filter(object_id=member.pk, action='READ').count() == 3
+
+    def test_db_failure_spills_and_replays(self, tmp_path, member, monkeypatch, django_capture_on_commit_callbacks):
+        """Test a failed batch is spilled to disk and replayed once the DB is back."""
+        AuditLog.objects.all().delete()
+        writer = make_writer(tmp_path)
+        self._write(writer, member, 2, django_capture_on_commit_callbacks)
+
+        def unavailable(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(AuditLog.objects, 'bulk_create', unavailable)
+            assert writer.flush() == 0
+
+        assert writer.get_stats()['spilled'] == 2
+        assert len(list(tmp_path.glob('audit-*.jsonl'))) == 1
+
+        assert writer.replay_spilled() == 2
+        assert AuditLog.objects.filter(object_id=member.pk, action='READ').count() == 2
+        assert list(tmp_path.glob('audit-*')) == []
+
+    def test_best_effort_drops_on_overflow(self, tmp_path, member, django_capture_on_commit_callbacks):
+        """Test a full queue drops entries when durability is best effort."""
+        writer = make_writer(tmp_path, durability=AuditDurability.BEST_EFFORT, max_queue=2)
+        self._write(writer, member, 3, django_capture_on_commit_callbacks)
+
+        stats = writer.get_stats()
+        assert stats['queued'] == 2
+        assert stats['dropped'] == 1
+        writer.flush()
+
+    def test_rolled_back_writes_are_not_audited(self, tmp_path, member, django_capture_on_commit_callbacks):
+        """Test entries are only queued when the surrounding transaction commits."""
+        writer = make_writer(tmp_path)
+        with django_capture_on_commit_callbacks(execute=False):
+            writer.write(content_object=member, action='READ', user=member)
+
+        assert writer.get_stats()['queued'] == 0
+
+    def test_sync_durability_writes_inline(self, tmp_path, member):
+        """Test sync durability keeps the old inline INSERT."""
+        writer = make_writer(tmp_path, durability=AuditDurability.SYNC)
+        entry = writer.write(content_object=member, action='READ', user=member)
+
+        assert AuditLog.objects.filter(pk=entry.pk).exists()
@@ -0,0 +1,252 @@
+import pytest
+from django.apps import apps as django_apps
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.db.counting import CountMode, CountStrategy
+from apps.core.core_exceptions.domain import ConcurrencyException, DomainValidationException
+from apps.core.db.manager import SafeManager
+from apps.core.db.optimistic import cas_update
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.models.users.users import User
+from apps.tcc.utils.audit_buffer import flush_audit_log
+
+
+@pytest.mark.django_db
+class TestChangeTracking:
+    def _load_user(self):
+        user = User.objects.create_user(email='tracked@example.com', name='Tracked User', password='Track123!@#')
+        return User.objects.get(pk=user.pk)
+
+    def test_update_does_not_reread_row(self):
+        """Test a User update never re-selects the row it is saving."""
+        user = self._load_user()
+        user.name = 'Renamed User'
+
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+
+        table = User._meta.db_table
+        rereads = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and f'FROM `{table}`' in q['sql'].replace('"', '`')
+            and 'email' not in q['sql']
+        ]
+        assert rereads == []
+        # just the UPDATE - email is unchanged so its unique check is skipped, the audit entry is buffered
+        assert len(ctx.captured_queries) == 1
+
+    def test_update_audit_log_has_diff(self, django_capture_on_commit_callbacks):
+        """Test the audit entry diffs against the values loaded from the database."""
+        user = self._load_user()
+        user.name = 'Renamed User'
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        flush_audit_log()
+
+        entry = AuditLog.objects.filter(object_id=user.pk, action='UPDATE').first()
+        assert entry.changes == {'name': {'old': 'Tracked User', 'new': 'Renamed User'}}
+        assert entry.before_state['name'] == 'Tracked User'
+
+    def test_password_hash_never_reaches_audit_log(self, django_capture_on_commit_callbacks):
+        """Test password hashes are redacted in audit states and changes."""
+        with django_capture_on_commit_callbacks(execute=True):
+            user = self._load_user()
+            user.set_password('Changed123!@#')
+            user.save()
+        flush_audit_log()
+
+        entries = list(AuditLog.objects.filter(object_id=user.pk))
+        assert {entry.action for entry in entries} >= {'CREATE', 'UPDATE'}
+        for entry in entries:
+            for value in (entry.before_state, entry.after_state, entry.changes):
+                assert user.password not in str(value) and '$' not in str((value or {}).get('password', ''))
+        update = next(entry for entry in entries if entry.action == 'UPDATE')
+        assert update.changes['password'] == {'old': '[REDACTED]', 'new': '[REDACTED]'}
+        assert update.after_state['password'] == '[REDACTED]'
+
+    def test_snapshot_refreshed_after_save(self):
+        """Test a second save only reports what changed since the first."""
+        user = self._load_user()
+        user.name = 'Renamed User'
+        user.save()
+        user.phone_number = '555-0100'
+
+        assert set(user.get_changed_fields(exclude=('updated_at', 'version'))) == {'phone_number'}
+
+
+@pytest.mark.django_db
+class TestDirtyFieldSave:
+    def _load_user(self):
+        user = User.objects.create_user(email='dirty@example.com', name='Dirty User', password='Dirty123!@#')
+        return User.objects.get(pk=user.pk)
+
+    def test_update_writes_only_changed_columns(self):
+        """Test an update statement only sets the changed field plus bookkeeping columns."""
+        user = self._load_user()
+        user.phone_number = '555-0100'
+
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+
+        sql = ctx.captured_queries[-1]['sql'].replace('"', '`')
+        assert sql.startswith('UPDATE')
+        assert '`phone_number`' in sql and '`version`' in sql
+        assert '`name`' not in sql and '`email`' not in sql
+
+    def test_unchanged_save_skips_query(self):
+        """Test saving an unmodified instance issues no query."""
+        user = self._load_user()
+
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+
+        assert ctx.captured_queries == []
+
+    def test_version_starts_at_one_and_bumps_on_update(self):
+        """Test inserts keep version 1 and each update increments it."""
+        user = self._load_user()
+        assert user.version == 1
+
+        user.name = 'Renamed User'
+        user.save()
+        assert User.objects.get(pk=user.pk).version == 2
+
+    def test_changed_email_is_still_validated(self):
+        """Test full_clean still checks uniqueness of a changed unique field."""
+        User.objects.create_user(email='taken@example.com', name='Other User', password='Other123!@#')
+        user = self._load_user()
+        user.email = 'taken@example.com'
+
+        with pytest.raises(ValidationError):
+            user.save()
+
+    def test_meta_values_batched_into_one_save(self):
+        """Test set_meta_value with commit=False defers the write."""
+        user = self._load_user()
+
+        with CaptureQueriesContext(connection) as ctx:
+            user.set_meta_value('theme', 'dark', commit=False)
+            user.set_meta_value('language', 'en', commit=False)
+            user.save()
+
+        assert len(ctx.captured_queries) == 1
+        assert User.objects.get(pk=user.pk).meta_info == {'theme': 'dark', 'language': 'en'}
+
+
+@pytest.mark.django_db
+class TestCachedCountInvalidation:
+    @pytest.mark.parametrize('mode, watched', [('cached', True), ('exact', False), ('estimated', False)])
+    def test_models_watched_at_startup_only_in_cached_mode(self, settings, monkeypatch, mode, watched):
+        """Test ready() registers write receivers only when totals are cached."""
+        calls = []
+        monkeypatch.setattr(CountStrategy, 'watch', lambda *models: calls.append(models))
+        settings.PAGINATION_COUNT_MODE = mode
+
+        django_apps.get_app_config('tcc').ready()
+
+        assert bool(calls) == watched
+        if watched:
+            assert User in calls[0] and AuditLog not in calls[0]
+
+    def test_unwatched_model_invalidation_is_free(self, monkeypatch):
+        """Test invalidate() makes no cache calls for a model no cached count watches."""
+        monkeypatch.setattr(CountStrategy, '_watched_models', set())
+        monkeypatch.setattr('apps.core.db.counting.cache.add', lambda *a, **k: pytest.fail("cache touched"))
+
+        CountStrategy.invalidate(User)
+
+    def test_queryset_writes_invalidate_cached_count(self):
+        """Test bulk and CAS writes (no post_save) still refresh cached totals."""
+        strategy = CountStrategy(mode=CountMode.CACHED)
+        user = User.objects.create_user(email='counted@example.com', name='Counted User', password='Count123!@#')
+        active = User.objects.filter(is_active=True)
+        assert strategy.count(active) == 1
+
+        manager = SafeManager()
+        manager.model = User
+        manager.cas_update(user.pk, user.version, is_active=False)
+        assert strategy.count(active) == 0
+
+        manager.bulk_update_values({user.pk: {'is_active': True}})
+        assert strategy.count(active) == 1
+
+
+@pytest.mark.django_db
+class TestBulkWrites:
+    @pytest.fixture
+    def manager(self):
+        manager = SafeManager()
+        manager.model = User
+        return manager
+
+    def _user(self, email, name):
+        return User(email=email, name=name, password='!')
+
+    def test_bulk_upsert_inserts_and_updates(self, manager):
+        """Test bulk_upsert inserts new rows and updates rows colliding on the unique field."""
+        existing = User.objects.create_user(email='upsert@example.com', name='Old Name', password='Upsert123!@#')
+
+        objs = manager.bulk_upsert(
+            [self._user('upsert@example.com', 'New Name'), self._user('fresh@example.com', 'Fresh')],
+            unique_fields=['email'],
+            update_fields=['name'],
+        )
+
+        assert all(obj.pk for obj in objs)
+        assert User.objects.get(pk=existing.pk).name == 'New Name'
+        assert User.objects.filter(email='fresh@example.com', pk=objs[1].pk).exists()
+        assert User.objects.filter(email='upsert@example.com').count() == 1
+
+    def test_bulk_upsert_bumps_version_on_conflict(self, manager):
+        """Test a row updated on conflict gets a new version, so a stale CAS cannot overwrite it."""
+        existing = User.objects.create_user(email='stale@example.com', name='Old Name', password='Stale123!@#')
+
+        manager.bulk_upsert(
+            [self._user('stale@example.com', 'Upserted'), self._user('new@example.com', 'New')],
+            unique_fields=['email'],
+            update_fields=['name'],
+        )
+
+        assert User.objects.get(pk=existing.pk).version == existing.version + 1
+        assert User.objects.get(email='new@example.com').version == existing.version
+        with pytest.raises(ConcurrencyException):
+            cas_update(User._base_manager.all(), existing.pk, existing.version, name='Lost Update')
+        assert User.objects.get(pk=existing.pk).name == 'Upserted'
+
+    def test_bulk_upsert_omits_conflict_target_without_backend_support(self, manager, monkeypatch):
+        """Test unique_fields is not passed to backends that cannot name a conflict target (MySQL)."""
+        calls = []
+        monkeypatch.setattr(manager, 'bulk_create', lambda objs, **kwargs: calls.append(kwargs) or objs)
+        monkeypatch.setattr(connection.features, 'supports_update_conflicts_with_target', False)
+
+        manager.bulk_upsert([self._user('mysql@example.com', 'MySQL')], unique_fields=['email'], update_fields=['name'])
+
+        assert 'unique_fields' not in calls[0] and calls[0]['update_conflicts']
+
+    def test_bulk_upsert_rejects_unknown_fields(self, manager):
+        """Test update fields are validated against the model."""
+        with pytest.raises(DomainValidationException):
+            manager.bulk_upsert([self._user('bad@example.com', 'Bad')], unique_fields=['email'], update_fields=['nope'])
+
+    def test_bulk_update_values_sets_per_row_values(self, manager):
+        """Test per-row values are applied in one statement and version is bumped."""
+        users = [
+            User.objects.create_user(email=f'bulk{i}@example.com', name=f'Bulk {i}', password='Bulk123!@#')
+            for i in range(3)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            updated = manager.bulk_update_values({
+                users[0].pk: {'name': 'First'},
+                users[1].pk: {'name': 'Second', 'phone_number': '555-0101'},
+            })
+
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        assert updated == 2 and len(updates) == 1
+        rows = {user.pk: user for user in User.objects.filter(pk__in=[u.pk for u in users])}
+        assert rows[users[0].pk].name == 'First' and rows[users[0].pk].phone_number == users[0].phone_number
+        assert rows[users[1].pk].phone_number == '555-0101'
+        assert rows[users[2].pk].name == 'Bulk 2' and rows[users[2].pk].version == users[2].version
+        assert rows[users[0].pk].version == users[0].version + 1
@@ -0,0 +1,100 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+
+from apps.core.jwt.jwt_backend import JWTBackend, JWTManager, TokenConfig
+from apps.core.jwt.key_rotation import SigningKey
+from apps.core.jwt.middleware import JWTAuthMiddleware, compile_path_prefixes
+from apps.tcc.api.views import auth_view
+
+
+def _token():
+    return JWTBackend.get_instance().jwt_manager.generate_access_token("7", "member@example.com", ["member"])
+
+
+def _view(request):
+    return HttpResponse(getattr(request, "user_id", "anonymous"))
+
+
+async def _async_view(request):
+    return _view(request)
+
+
+def _fail_bridge(*args, **kwargs):
+    raise AssertionError("async_to_sync used on the async path")
+
+
+class TestJWTAuthMiddleware:
+    def test_sync_mode_authenticates_inline(self):
+        """Test the sync chain rejects a missing token and attaches claims for a valid one."""
+        middleware = JWTAuthMiddleware(_view)
+        factory = RequestFactory()
+
+        assert not iscoroutinefunction(middleware)
+        assert middleware(factory.get("/api/private/")).status_code == 401
+
+        response = middleware(factory.get("/api/private/", headers={"Authorization": f"Bearer {_token()}"}))
+        assert response.status_code == 200 and response.content == b"7"
+
+    def test_async_mode_is_a_coroutine_without_thread_hops(self, monkeypatch):
+        """Test the async chain awaits the view and never bridges through async_to_sync."""
+        monkeypatch.setattr("asgiref.sync.AsyncToSync.__call__", _fail_bridge)
+        middleware = JWTAuthMiddleware(_async_view)
+        factory = AsyncRequestFactory()
+
+        assert iscoroutinefunction(middleware)
+        response = asyncio.run(middleware(factory.get("/api/private/", headers={"Authorization": f"Bearer {_token()}"})))
+        assert response.status_code == 200 and response.content == b"7"
+
+        response = asyncio.run(middleware(factory.get("/api/private/", headers={"Authorization": "Bearer not-a-jwt"})))
+        assert response.status_code == 401
+
+    def test_async_mode_only_leaves_the_loop_for_unseen_tokens(self, monkeypatch):
+        """Test a token needing an epoch read is verified off the event loop and later hits stay inline."""
+        from apps.core.jwt import middleware as middleware_module
+
+        offloaded, original = [], middleware_module.sync_to_async
+
+        def counting_sync_to_async(func, **kwargs):
+            offloaded.append(func)
+            return original(func, **kwargs)
+
+        monkeypatch.setattr(middleware_module, "sync_to_async", counting_sync_to_async)
+        middleware = JWTAuthMiddleware(_async_view)
+        factory = AsyncRequestFactory()
+        token = JWTBackend.get_instance().jwt_manager.generate_access_token("8", "other@example.com")
+
+        for _ in range(3):
+            request = factory.get("/api/private/", headers={"Authorization": f"Bearer {token}"})
+            assert asyncio.run(middleware(request)).content == b"8"
+
+        assert len(offloaded) == 1
+
+    def test_public_prefix_matcher(self):
+        """Test the compiled matcher agrees with prefix semantics."""
+        matcher = compile_path_prefixes(["/static/", "/tcc/auth/login/", "/admin/"])
+
+        assert matcher.match("/static/css/site.css")
+        assert matcher.match("/tcc/auth/login/")
+        assert not matcher.match("/api/static/")
+        assert not matcher.match("/tcc/auth/logout/")
+
+
+class TestJWKSView:
+    def test_serves_keys_with_etag(self, monkeypatch):
+        """Test the JWKS endpoint returns the public key and a 304 for a matching ETag."""
+        key = SigningKey.generate("EdDSA", kid="k1")
+        manager = JWTManager(TokenConfig(algorithm="EdDSA", private_key=key.private_pem(), key_id="k1"))
+        monkeypatch.setattr(auth_view, "get_jwt_backend", lambda: SimpleNamespace(jwt_manager=manager))
+        factory = RequestFactory()
+
+        response = auth_view.jwks_view(factory.get("/tcc/auth/jwks/"))
+        assert response.status_code == 200
+        assert [jwk["kid"] for jwk in json.loads(response.content)["keys"]] == ["k1"]
+
+        cached = auth_view.jwks_view(factory.get("/tcc/auth/jwks/", headers={"If-None-Match": response["ETag"]}))
+        assert cached.status_code == 304 and cached["ETag"] == response["ETag"]
@@ -0,0 +1,128 @@
+import pytest
+from decimal import Decimal
+from django.db.models import F
+
+from apps.core.core_exceptions.domain import ConcurrencyException, EntityNotFoundException
+from apps.core.db.counting import CountStrategy
+from apps.core.db.manager import UserManager
+from apps.core.db.optimistic import OPTIMISTIC_MAX_ATTEMPTS, cas_update, optimistic_update
+from apps.tcc.models.base.auditlog import AuditLog
+from apps.tcc.models.donations.donation import Donation, FundType
+from apps.tcc.models.users.users import User
+from apps.tcc.utils.audit_buffer import flush_audit_log
+
+MISSING_PK = 1
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(email='cas@example.com', name='Cas User', password='Cas123!@#')
+
+
+def _bump_version(pk):
+    """Simulate a concurrent writer"""
+    User.objects.filter(pk=pk).update(version=F('version') + 1)
+
+
+@pytest.mark.django_db
+class TestCasUpdate:
+    def test_success_bumps_version(self, member):
+        """Test a CAS against the current version writes and returns the next version."""
+        assert cas_update(User.objects.all(), member.pk, member.version, name='Swapped') == member.version + 1
+
+        row = User.objects.get(pk=member.pk)
+        assert row.name == 'Swapped' and row.version == member.version + 1
+
+    def test_stale_version_conflicts(self, member):
+        """Test a CAS against an outdated version raises without writing."""
+        _bump_version(member.pk)
+
+        with pytest.raises(ConcurrencyException):
+            cas_update(User.objects.all(), member.pk, member.version, name='Lost')
+        assert User.objects.get(pk=member.pk).name == 'Cas User'
+
+    def test_missing_row(self, db):
+        """Test a CAS on a row that does not exist raises EntityNotFoundException."""
+        with pytest.raises(EntityNotFoundException):
+            cas_update(User.objects.all(), MISSING_PK, 1, name='Nobody')
+
+
+@pytest.mark.django_db
+class TestOptimisticUpdate:
+    def test_success_is_audited_and_invalidates_counts(self, member, monkeypatch, django_capture_on_commit_callbacks):
+        """Test a successful update writes an audit entry with the diff and bumps the count tag."""
+        invalidated = []
+        monkeypatch.setattr(CountStrategy, 'invalidate', classmethod(lambda cls, model: invalidated.append(model)))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            obj = optimistic_update(User.objects.all(), member.pk, lambda user: {'name': 'Updated'})
+        flush_audit_log()
+
+        assert obj.name == 'Updated' and obj.version == member.version + 1
+        assert User in invalidated
+        entry = AuditLog.objects.filter(object_id=member.pk, action='UPDATE').latest('created_at')
+        assert entry.changes == {'name': {'old': 'Cas User', 'new': 'Updated'}}
+
+    def test_conflict_is_retried_with_a_fresh_read(self, member):
+        """Test a lost race re-reads the row and applies the mutation again."""
+        seen_versions = []
+
+        def mutate(user):
+            seen_versions.append(user.version)
+            if len(seen_versions) == 1:
+                _bump_version(member.pk)
+            return {'name': f'Attempt {len(seen_versions)}'}
+
+        obj = optimistic_update(User.objects.all(), member.pk, mutate)
+
+        # each attempt runs in its own savepoint, so the simulated writer's bump
+        # is rolled back with the failed attempt here
+        assert len(seen_versions) == 2
+        assert obj.name == 'Attempt 2' and User.objects.get(pk=member.pk).name == 'Attempt 2'
+
+    def test_exhausted_retries_raise(self, member):
+        """Test a row that keeps changing raises ConcurrencyException after the last attempt."""
+        attempts = []
+
+        def mutate(user):
+            attempts.append(user.version)
+            _bump_version(member.pk)
+            return {'name': 'Never'}
+
+        with pytest.raises(ConcurrencyException):
+            optimistic_update(User.objects.all(), member.pk, mutate)
+        assert len(attempts) == OPTIMISTIC_MAX_ATTEMPTS
+
+    def test_missing_row(self, db):
+        """Test updating a row that does not exist raises EntityNotFoundException."""
+        with pytest.raises(EntityNotFoundException):
+            optimistic_update(User.objects.all(), MISSING_PK, lambda user: {'name': 'Nobody'})
+
+
+@pytest.mark.django_db
+class TestOptimisticCallers:
+    def test_deactivate_user_is_audited(self, member, django_capture_on_commit_callbacks):
+        """Test UserManager.deactivate_user writes through CAS and leaves an audit entry."""
+        manager = UserManager()
+        manager.model = User
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert manager.deactivate_user(member.pk)
+        flush_audit_log()
+
+        assert not User.objects.get(pk=member.pk).is_active
+        entry = AuditLog.objects.filter(object_id=member.pk, action='UPDATE').latest('created_at')
+        assert entry.changes == {'is_active': {'old': True, 'new': False}}
+
+    def test_process_payment_credits_fund(self, member, django_capture_on_commit_callbacks):
+        """Test a completed payment adds its amount to the fund balance via CAS."""
+        fund = FundType.objects.create(name='Building', current_balance=Decimal('10.00'))
+        donation = Donation.objects.create(donor=member, fund=fund, amount=Decimal('25.50'))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert donation.process_payment()
+        flush_audit_log()
+
+        fund_row = FundType.objects.get(pk=fund.pk)
+        assert fund_row.current_balance == Decimal('35.50') and fund_row.version == fund.version + 1
+        assert AuditLog.objects.filter(object_id=fund.pk, action='UPDATE').exists()
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from apps.core.cache.async_cache import AsyncRedisCache
+from apps.core.jwt import throttling
+from apps.core.jwt.middleware import RateLimitMiddleware
+from apps.core.jwt.rate_limiter import RateLimiter
+from apps.core.jwt.throttling import LoginRateThrottle
+
+fakeredis = pytest.importorskip("fakeredis")
+aioredis = pytest.importorskip("fakeredis.aioredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def limiter(monkeypatch, settings):
+    settings.RATE_LIMIT_ENABLED = True
+    settings.RATE_LIMIT_STRATEGY = "sliding_window"
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {"ip": "3/min", "user": "2/min", "login": "10/min", "login_email": "2/min"},
+    }
+    server = fakeredis.FakeServer()
+    cache = AsyncRedisCache()
+    cache.redis_client = aioredis.FakeRedis(server=server)
+    cache._is_connected = True
+    rate_limiter = RateLimiter(cache, sync_client=fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(throttling, "_rate_limiter", rate_limiter)
+    return rate_limiter
+
+
+def _view(request):
+    return HttpResponse("ok")
+
+
+async def _async_view(request):
+    return _view(request)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
+def _login_view(request):
+    return Response({"ok": True})
+
+
+class TestRateLimitMiddleware:
+    def test_sync_mode_returns_429_with_retry_after(self, limiter):
+        """Test the IP dimension denies past its rate and the response carries Retry-After."""
+        middleware = RateLimitMiddleware(_view)
+        factory = RequestFactory()
+
+        responses = [middleware(factory.get("/api/items/")) for _ in range(4)]
+
+        assert [r.status_code for r in responses] == [200, 200, 200, 429]
+        assert [r["X-RateLimit-Remaining"] for r in responses[:3]] == ["2", "1", "0"]
+        assert int(responses[-1]["Retry-After"]) > 0
+        assert limiter._metrics["errors"] == 0
+
+    def test_sync_mode_shares_counts_with_async_mode(self, limiter):
+        """Test sync checks run on the sync client, outside any event loop, against the same counters."""
+        sync_middleware = RateLimitMiddleware(_view)
+        async_middleware = RateLimitMiddleware(_async_view)
+
+        statuses = [sync_middleware(RequestFactory().get("/api/items/")).status_code for _ in range(2)]
+        statuses.append(asyncio.run(async_middleware(AsyncRequestFactory().get("/api/items/"))).status_code)
+        statuses.append(sync_middleware(RequestFactory().get("/api/items/")).status_code)
+
+        assert statuses == [200, 200, 200, 429]
+        assert limiter.cache._metrics["operations"] == 1
+        assert limiter._metrics["errors"] == 0
+
+    def test_async_mode_limits_by_user_and_exempts_paths(self, limiter):
+        """Test the user dimension is the tighter one for authenticated requests; exempt paths skip Redis."""
+        middleware = RateLimitMiddleware(_async_view)
+        factory = AsyncRequestFactory()
+
+        async def scenario():
+            statuses = []
+            for _ in range(3):
+                request = factory.get("/api/items/")
+                request.user_id = "7"
+                statuses.append((await middleware(request)).status_code)
+            statuses.append((await middleware(factory.get("/tcc/health/"))).status_code)
+            return statuses
+
+        assert asyncio.run(scenario()) == [200, 200, 429, 200]
+        assert limiter.cache._metrics["operations"] == 3
+
+
+class TestLoginRateThrottle:
+    def test_login_is_limited_per_target_email(self, limiter):
+        """Test one IP and email pair is denied at the email rate while another email still gets through."""
+        factory = RequestFactory()
+
+        def login(email):
+            return _login_view(
+                factory.post("/tcc/auth/login/", {"email": email}, content_type="application/json")
+            ).status_code
+
+        assert [login("Victim@Example.com ") for _ in range(3)] == [200, 200, 429]
+        assert login("other@example.com") == 200
+        assert limiter._metrics["errors"] == 0
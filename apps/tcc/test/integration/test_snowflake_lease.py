@@ -0,0 +1,125 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.tcc.models.base.worker_lease import SnowflakeWorkerLease
+from apps.tcc.utils.snowflake import DjangoSnowflakeGenerator
+from apps.tcc.utils.snowflake_lease import DatabaseLeaseRegistry, WorkerLease, WorkerLeaseManager
+
+
+# transaction=True: lease managers talk to the database from their heartbeat thread
+@pytest.mark.django_db(transaction=True)
+class TestDatabaseLeaseRegistry:
+    def test_slot_is_held_by_one_owner(self):
+        """Test a live slot cannot be taken by a second owner."""
+        registry = DatabaseLeaseRegistry()
+
+        assert registry.try_acquire(1, 3, 'owner-a', ttl=30)
+        assert not registry.try_acquire(1, 3, 'owner-b', ttl=30)
+        assert registry.try_acquire(1, 4, 'owner-b', ttl=30)
+
+    def test_expired_slot_is_taken_over(self):
+        """Test an unrenewed slot goes to the next owner and the old owner can no longer renew it."""
+        registry = DatabaseLeaseRegistry()
+        registry.try_acquire(1, 3, 'owner-a', ttl=30)
+        SnowflakeWorkerLease.objects.filter(worker_id=35).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        assert registry.try_acquire(1, 3, 'owner-b', ttl=30)
+        assert not registry.renew(WorkerLease(1, 3, 'owner-a', ttl=30))
+        assert registry.renew(WorkerLease(1, 3, 'owner-b', ttl=30))
+
+    def test_managers_get_distinct_machine_ids_and_release_them(self):
+        """Test concurrent managers lease distinct slots, skip the static ID and free them on stop."""
+        managers = [WorkerLeaseManager(DatabaseLeaseRegistry(), datacenter_id=1, exclude_machine_id=1) for _ in range(4)]
+        leases = [manager.start() for manager in managers]
+
+        machine_ids = {lease.machine_id for lease in leases}
+        assert len(machine_ids) == 4
+        assert 1 not in machine_ids
+        assert SnowflakeWorkerLease.objects.count() == 4
+
+        for manager in managers:
+            manager.stop()
+        assert SnowflakeWorkerLease.objects.count() == 0
+
+
+class TestLeaseCallbacks:
+    def test_lost_lease_is_reacquired_or_dropped(self):
+        """Test a heartbeat that finds its lease gone re-leases, and reports None when nothing is free."""
+        class Registry:
+            free = True
+
+            def try_acquire(self, datacenter_id, machine_id, token, ttl):
+                return self.free
+
+            def renew(self, lease):
+                return False
+
+        registry, changes = Registry(), []
+        manager = WorkerLeaseManager(registry, datacenter_id=2, on_change=changes.append)
+        manager._set_lease(manager._acquire())
+
+        manager._heartbeat()
+        assert changes[-1] is not None and changes[-1] is not changes[0]
+
+        registry.free = False
+        manager._heartbeat()
+        assert changes[-1] is None
+
+    def test_set_worker_switches_pair_and_mode(self):
+        """Test IDs carry the new pair after set_worker."""
+        generator = DjangoSnowflakeGenerator(datacenter_id=1, machine_id=1, sequence_mode='reserved')
+        generator.generate_id()
+
+        generator.set_worker(2, 17, DjangoSnowflakeGenerator.MODE_LOCAL)
+        parts = generator.decompose_id(generator.generate_id())
+
+        assert (parts['datacenter_id'], parts['machine_id']) == (2, 17)
+        assert generator.sequence_mode == 'local'
+
+    def test_generator_leaves_local_mode_inside_the_margin(self):
+        """Test local IDs stop before expiry even if the heartbeat never reports a problem."""
+        generator = DjangoSnowflakeGenerator(datacenter_id=1, machine_id=1, sequence_mode='reserved')
+        lease = WorkerLease(2, 17, 'owner', ttl=30)
+        generator.set_worker(2, 17, DjangoSnowflakeGenerator.MODE_LOCAL, lease=lease)
+        assert generator.decompose_id(generator.generate_id())['machine_id'] == 17
+
+        lease.expires_at = time.monotonic() + lease.margin - 0.001
+        time.sleep(0.002)
+        parts = generator.decompose_id(generator.generate_id())
+        assert (parts['datacenter_id'], parts['machine_id']) == (1, 1)
+        assert generator.sequence_mode == 'reserved'
+
+        lease.expires_at = time.monotonic() + lease.ttl
+        time.sleep(0.002)
+        assert generator.decompose_id(generator.generate_id())['machine_id'] == 17
+
+    def test_hung_renewal_times_out_and_drops_the_lease(self):
+        """Test a renew call that blocks is abandoned after call_timeout and the lease is dropped near expiry."""
+        release = threading.Event()
+
+        class Registry:
+            def try_acquire(self, datacenter_id, machine_id, token, ttl):
+                return True
+
+            def renew(self, lease):
+                release.wait(5)
+                return True
+
+        changes = []
+        manager = WorkerLeaseManager(Registry(), datacenter_id=2, ttl=3, on_change=changes.append, call_timeout=0.05)
+        manager._set_lease(manager._acquire())
+        try:
+            manager.lease.expires_at = time.monotonic() + manager.lease.margin - 0.01
+
+            started = time.monotonic()
+            manager._heartbeat()
+
+            assert time.monotonic() - started < 1
+            assert changes[-1] is None
+        finally:
+            release.set()
+
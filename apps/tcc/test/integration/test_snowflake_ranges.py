@@ -0,0 +1,79 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.db.manager import DonationManager
+from apps.tcc.models.donations.donation import Donation, FundType
+from apps.tcc.models.users.users import User
+from apps.tcc.utils.snowflake import snowflake_id_floor
+
+DAYS = 60
+PER_DAY = 20
+
+
+def _plan(queryset) -> str:
+    return queryset.explain()
+
+
+def _is_key_range_seek(plan: str) -> bool:
+    """True when the plan seeks a range of the primary key rather than scanning"""
+    if connection.vendor == 'sqlite':
+        # a bigint primary key is backed by sqlite's automatic unique index
+        return 'SEARCH' in plan and ('sqlite_autoindex_donations' in plan or 'PRIMARY KEY' in plan)
+    return 'PRIMARY' in plan and 'range' in plan
+
+
+@pytest.fixture
+def donations(db):
+    """Donations spread over 60 days, IDs minted at their created_at like live rows."""
+    donor = User.objects.create_user(email='donor@example.com', name='Donor User', password='Donor123!@#')
+    fund = FundType.objects.create(name='General')
+    now = timezone.now()
+    rows = []
+    for day in range(DAYS):
+        for n in range(PER_DAY):
+            created_at = now - timedelta(days=day, minutes=n)
+            rows.append(Donation(
+                id=snowflake_id_floor(created_at) + n, donor=donor, fund=fund, amount=Decimal('10.00'),
+                donation_date=created_at - timedelta(days=3), created_at=created_at, updated_at=created_at
+            ))
+    Donation.objects.bulk_create(rows, batch_size=500)
+    return now
+
+
+@pytest.mark.django_db
+class TestCreatedBetween:
+    def test_matches_created_at_window(self, donations):
+        """Test the ID range selects exactly the rows of the created_at range."""
+        start, end = donations - timedelta(days=20), donations - timedelta(days=5)
+
+        by_id = set(Donation.objects.created_between(start, end).values_list('pk', flat=True))
+        by_column = set(Donation.objects.filter(created_at__gte=start, created_at__lt=end).values_list('pk', flat=True))
+
+        assert by_id == by_column
+        assert len(by_id) == 15 * PER_DAY
+
+    def test_plan_is_primary_key_range(self, donations):
+        """Test the ID range is a key seek while the created_at filter scans."""
+        start = donations - timedelta(days=7)
+
+        # Meta.ordering would sort on donation_date; order by the key both ways for a fair plan
+        id_plan = _plan(Donation.objects.created_since(start).order_by('-pk'))
+        column_plan = _plan(Donation.objects.filter(created_at__gte=start).order_by('-pk'))
+
+        assert _is_key_range_seek(id_plan), id_plan
+        assert not _is_key_range_seek(column_plan), column_plan
+
+    def test_recently_recorded_donations(self, donations):
+        """Test the donation finder returns the last days newest first through the key."""
+        manager = DonationManager()
+        manager.model = Donation
+
+        recent = list(manager.find_recently_recorded_donations(days=7))
+
+        assert len(recent) == 7 * PER_DAY
+        assert [d.pk for d in recent] == sorted((d.pk for d in recent), reverse=True)
+        assert _is_key_range_seek(_plan(manager.find_recently_recorded_donations(days=7)))
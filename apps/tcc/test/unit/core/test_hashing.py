@@ -0,0 +1,52 @@
+import asyncio
+
+import bcrypt
+
+from apps.core.jwt.hashing import BcryptHasher, HasherOverloaded, bcrypt_rounds
+
+
+class TestBcryptHasher:
+    def test_process_pool_round_trip(self):
+        """Test hashing and verification in worker processes, with timings recorded."""
+        hasher = BcryptHasher(rounds=4, max_workers=2)
+
+        async def scenario():
+            hashed = await hasher.hash("s3cret!")
+            return hashed, await hasher.verify("s3cret!", hashed), await hasher.verify("wrong", hashed)
+
+        try:
+            hashed, valid, invalid = asyncio.run(scenario())
+        finally:
+            hasher.shutdown()
+
+        assert valid and not invalid
+        assert bcrypt_rounds(hashed) == 4
+        stats = hasher.get_stats()
+        assert stats["completed"] == 3 and stats["pending"] == 0
+        assert stats["hash_time"]["avg_ms"] > 0
+
+    def test_burst_beyond_capacity_is_shed(self):
+        """Test work beyond workers + queue fails fast with a Retry-After instead of queueing."""
+        hasher = BcryptHasher(rounds=8, max_workers=1, max_queue=1, shed_status=429, use_processes=False)
+        hashed = bcrypt.hashpw(b"pw", bcrypt.gensalt(8)).decode()
+
+        async def scenario():
+            return await asyncio.gather(*(hasher.verify("pw", hashed) for _ in range(5)), return_exceptions=True)
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            hasher.shutdown()
+
+        shed = [r for r in results if isinstance(r, HasherOverloaded)]
+        assert results.count(True) == 2 and len(shed) == 3
+        assert shed[0].status_code == 429 and shed[0].retry_after >= 1
+        assert hasher.get_stats()["shed"] == 3
+
+    def test_needs_rehash_when_rounds_change(self):
+        """Test hashes made at another cost are flagged and non-bcrypt hashes are left alone."""
+        hasher = BcryptHasher(rounds=12)
+
+        assert hasher.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode())
+        assert not hasher.needs_rehash("$2b$12$" + "a" * 53)
+        assert not hasher.needs_rehash("pbkdf2_sha256$600000$salt$hash")
@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from apps.core.jwt.jwt_backend import JWTManager, TokenConfig, TokenType
+from apps.core.jwt.token_cache import VerifiedTokenCache
+from apps.core.jwt.token_epochs import UserTokenEpochs
+
+SECRET = "unit-test-secret-key-that-is-long-enough-for-hs256"
+
+
+def make_manager(maxsize=100, ttl=60):
+    config = TokenConfig(secret_key=SECRET, algorithm="HS256", issuer="tests", audience=["api"])
+    store = LocMemCache("jwt-tests", {})
+    store.clear()
+    return JWTManager(
+        config,
+        token_cache=VerifiedTokenCache(maxsize=maxsize, ttl=ttl),
+        token_epochs=UserTokenEpochs(store=store, use_pubsub=False)
+    )
+
+
+class FailingStore:
+    def get(self, *args, **kwargs):
+        raise ConnectionError("cache down")
+
+
+def wait_until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def manager():
+    return make_manager()
+
+
+class TestVerifiedTokenCache:
+    def test_repeat_verification_skips_decode(self, manager, monkeypatch):
+        """Test the second verify of a token is served from the cache."""
+        token = manager.generate_access_token("1", "a@example.com", ["member"])
+        assert manager.verify_token(token, TokenType.ACCESS)[0]
+
+        monkeypatch.setattr("apps.core.jwt.jwt_backend.jwt.decode", lambda *a, **k: pytest.fail("decoded again"))
+        is_valid, payload = manager.verify_token(token, TokenType.ACCESS)
+
+        assert is_valid and payload["sub"] == "1"
+        assert manager.get_verify_cache_stats()["hits"] == 1
+
+    def test_cached_token_still_checks_type(self, manager):
+        """Test a cached access token is not accepted as a refresh token."""
+        token = manager.generate_access_token("1", "a@example.com")
+        manager.verify_token(token, TokenType.ACCESS)
+
+        assert manager.verify_token(token, TokenType.REFRESH) == (False, None)
+
+    def test_cached_hit_reads_no_shared_state(self, manager):
+        """Test a cache hit for an unrevoked user costs no cache reads beyond the user's epoch."""
+        token = manager.generate_access_token("1", "a@example.com")
+        manager.verify_token(token)
+        reads = manager.token_epochs.get_stats()["cache_reads"]
+
+        for _ in range(5):
+            assert manager.verify_token(token)[0]
+
+        assert manager.token_epochs.get_stats()["cache_reads"] == reads
+        assert manager.get_verify_cache_stats()["hits"] == 5
+
+    def test_entries_expire_and_lru_is_bounded(self):
+        """Test entries expire after the TTL and the least recently used is evicted."""
+        manager = make_manager(maxsize=2, ttl=0.05)
+        tokens = [manager.generate_access_token(str(i), f"{i}@example.com") for i in range(3)]
+        for token in tokens:
+            manager.verify_token(token)
+
+        stats = manager.get_verify_cache_stats()
+        assert stats["size"] == 2 and stats["evictions"] == 1
+
+        time.sleep(0.06)
+        manager.verify_token(tokens[2])
+        assert manager.get_verify_cache_stats()["expired"] == 1
+
+    def test_hit_rate(self, manager):
+        """Test the hit rate reflects repeated presentations."""
+        token = manager.generate_access_token("1", "a@example.com")
+        for _ in range(4):
+            manager.verify_token(token)
+
+        assert manager.get_verify_cache_stats()["hit_rate"] == pytest.approx(0.75)
+
+
+class TestUserTokenEpochs:
+    def test_revocation_rejects_earlier_tokens_of_that_user_only(self, manager):
+        """Test bumping a user's epoch rejects their cached and uncached tokens but not other users'."""
+        cached = manager.generate_access_token("1", "a@example.com")
+        uncached = manager.generate_access_token("1", "a@example.com", session_id="phone")
+        other = manager.generate_access_token("2", "b@example.com")
+        manager.verify_token(cached)
+
+        manager.revoke_user_tokens("1")
+
+        assert manager.verify_token(cached) == (False, None)
+        assert manager.verify_token(uncached) == (False, None)
+        assert manager.verify_token(other)[0]
+
+    def test_tokens_issued_after_revocation_are_valid(self, manager):
+        """Test a login right after "logout everywhere" gets a working token."""
+        manager.revoke_user_tokens("1")
+        time.sleep(0.002)
+
+        assert manager.verify_token(manager.generate_access_token("1", "a@example.com"))[0]
+
+    def test_epoch_is_shared_through_the_cache(self, manager):
+        """Test a second process (separate in-process copy) sees the bump through the cache."""
+        token = manager.generate_access_token("1", "a@example.com")
+        peer = UserTokenEpochs(store=manager.token_epochs.store, max_age=0, use_pubsub=False)
+        assert not peer.is_revoked(manager.verify_token(token)[1])
+
+        manager.revoke_user_tokens("1")
+
+        # the stale copy is served while a background read picks up the bump
+        assert wait_until(lambda: peer.is_revoked(manager.decode_token(token)))
+
+    def test_unavailable_store_serves_last_known_epoch(self, manager):
+        """Test a cache outage keeps the last epoch read and fails open only for unseen users."""
+        epochs = UserTokenEpochs(store=manager.token_epochs.store, max_age=0, use_pubsub=False)
+        epochs.store.set(epochs._key("1"), 123.0)
+        assert epochs.valid_after("1") == 123.0
+
+        epochs._store = FailingStore()
+
+        assert epochs.valid_after("1") == 123.0
+        assert epochs.valid_after("2") == 0.0
+        assert wait_until(lambda: epochs.get_stats()["store_errors"] == 2)
+        assert epochs.valid_after("1") == 123.0
+
+    def test_async_verify_reads_unknown_epochs_off_the_event_loop(self, manager, monkeypatch):
+        """Test async verification hops to a thread only while the user's epoch is not held locally."""
+        from apps.core.jwt import jwt_backend
+
+        offloaded, original = [], jwt_backend.sync_to_async
+
+        def counting_sync_to_async(func, **kwargs):
+            offloaded.append(func)
+            return original(func, **kwargs)
+
+        monkeypatch.setattr(jwt_backend, "sync_to_async", counting_sync_to_async)
+        token = manager.generate_access_token("1", "a@example.com")
+
+        async def verify_three_times():
+            return [await manager.averify_token(token, TokenType.ACCESS) for _ in range(3)]
+
+        assert all(is_valid for is_valid, _ in asyncio.run(verify_three_times()))
+        assert len(offloaded) == 1
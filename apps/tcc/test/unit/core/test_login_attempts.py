@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from apps.core.cache.async_cache import AsyncRedisCache
+from apps.core.jwt.login_attempts import LoginAttemptTracker
+
+aioredis = pytest.importorskip("fakeredis.aioredis")
+pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+
+
+def make_tracker(**kwargs):
+    cache = AsyncRedisCache()
+    cache.redis_client = aioredis.FakeRedis()
+    cache._is_connected = True
+    return LoginAttemptTracker(cache, **kwargs)
+
+
+class TestLoginAttemptTracker:
+    def test_lockouts_back_off_exponentially(self):
+        """Test each lockout doubles the previous one up to the cap."""
+        async def scenario():
+            tracker = make_tracker(max_attempts=3, lockout_seconds=60, max_lockout_seconds=200)
+            locks = []
+            for _ in range(4):
+                failures = [await tracker.record_failure(7) for _ in range(3)]
+                locks.append([f.locked_for for f in failures])
+                await tracker.cache.delete("login_lockout:7")  # let the lock run out
+            return locks
+
+        assert asyncio.run(scenario()) == [[0, 0, 60], [0, 0, 120], [0, 0, 200], [0, 0, 200]]
+
+    def test_concurrent_failures_lock_exactly_once(self):
+        """Test a burst of failures crosses the threshold once (the count is one script)."""
+        async def scenario():
+            tracker = make_tracker(max_attempts=5)
+            failures = await asyncio.gather(*(tracker.record_failure(7) for _ in range(5)))
+            return tracker, failures, await tracker.get_state(7)
+
+        tracker, failures, state = asyncio.run(scenario())
+
+        assert sum(f.locked for f in failures) == 1
+        assert state.is_locked and 0 < state.locked_for <= 60
+        assert tracker.get_stats()["lockouts"] == 1
+
+    def test_success_state_and_clear(self):
+        """Test a clean account reads as unlocked without history, and clear reports a past lock."""
+        async def scenario():
+            tracker = make_tracker(max_attempts=2)
+            clean = await tracker.get_state(7)
+            await tracker.record_failure(7)
+            failed_once = await tracker.get_state(7)
+            was_locked = await tracker.clear(7)
+            await tracker.record_failure(7)
+            await tracker.record_failure(7)
+            locked_then_cleared = await tracker.clear(7)
+            return clean, failed_once, was_locked, locked_then_cleared, await tracker.get_state(7)
+
+        clean, failed_once, was_locked, locked_then_cleared, after = asyncio.run(scenario())
+
+        assert not clean.is_locked and not clean.has_history
+        assert not failed_once.is_locked and failed_once.has_history
+        assert not was_locked and locked_then_cleared
+        assert not after.is_locked and not after.has_history
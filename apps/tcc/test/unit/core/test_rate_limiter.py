@@ -0,0 +1,210 @@
+import asyncio
+
+import pytest
+
+from apps.core.cache.async_cache import AsyncRedisCache
+from apps.core.jwt.local_limiter import LocalPreLimiter
+from apps.core.jwt.rate_limiter import RateLimitConfig, RateLimiter, RateLimitStrategy
+
+aioredis = pytest.importorskip("fakeredis.aioredis")
+pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+
+
+def make_limiter(local_limiter=None):
+    cache = AsyncRedisCache()
+    cache.redis_client = aioredis.FakeRedis()
+    cache._is_connected = True
+    return RateLimiter(cache, local_limiter=local_limiter)
+
+
+@pytest.mark.parametrize("strategy", list(RateLimitStrategy))
+class TestRateLimitStrategies:
+    def test_concurrent_burst_admits_exactly_the_limit(self, strategy):
+        """Test simultaneous checks cannot over-admit (the read-decide-write is one script)."""
+        async def scenario():
+            limiter = make_limiter()
+            config = RateLimitConfig(strategy=strategy, max_requests=10, window_seconds=60)
+            return await asyncio.gather(*(limiter.check_rate_limit("1.2.3.4", "login", config) for _ in range(40)))
+
+        results = asyncio.run(scenario())
+
+        assert sum(r.allowed for r in results) == 10
+        denied = next(r for r in results if not r.allowed)
+        assert denied.remaining == 0 and denied.retry_after > 0
+
+    def test_info_does_not_consume(self, strategy):
+        """Test get_rate_limit_info reports usage without recording a request."""
+        async def scenario():
+            limiter = make_limiter()
+            config = RateLimitConfig(strategy=strategy, max_requests=5, window_seconds=60)
+            await limiter.check_rate_limit("user", "api", config)
+            first = await limiter.get_rate_limit_info("user", "api", config)
+            second = await limiter.get_rate_limit_info("user", "api", config)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first == second
+        assert first["remaining"] == 4 and first["current_requests"] == 1
+
+
+class TestRateLimiter:
+    def test_check_is_one_round_trip(self):
+        """Test a check runs its script without a connection-check PING first."""
+        pings = []
+
+        async def scenario():
+            limiter = make_limiter()
+
+            async def ping():
+                pings.append(1)
+                return True
+
+            limiter.cache.redis_client.ping = ping
+            config = RateLimitConfig(strategy=RateLimitStrategy.SLIDING_WINDOW, max_requests=5, window_seconds=60)
+            for _ in range(3):
+                await limiter.check_rate_limit("user", "api", config)
+            return await limiter.get_rate_limit_info("user", "api", config)
+
+        assert asyncio.run(scenario())["current_requests"] == 3
+        assert pings == []
+
+    def test_token_bucket_refills_one_request_per_interval(self):
+        """Test GCRA admits a new request once window / limit has elapsed."""
+        async def scenario():
+            limiter = make_limiter()
+            config = RateLimitConfig(strategy=RateLimitStrategy.TOKEN_BUCKET, max_requests=20, window_seconds=1)
+            for _ in range(20):
+                await limiter.check_rate_limit("user", "api", config)
+            exhausted = await limiter.check_rate_limit("user", "api", config)
+            await asyncio.sleep(0.06)
+            refilled = await limiter.check_rate_limit("user", "api", config)
+            return exhausted, refilled
+
+        exhausted, refilled = asyncio.run(scenario())
+
+        assert not exhausted.allowed
+        assert refilled.allowed
+
+    def test_strategies_use_separate_keys_and_reset_clears_all(self):
+        """Test switching an action's strategy does not hit WRONGTYPE and reset clears every variant."""
+        async def scenario():
+            limiter = make_limiter()
+            for strategy in RateLimitStrategy:
+                config = RateLimitConfig(strategy=strategy, max_requests=1, window_seconds=60)
+                assert (await limiter.check_rate_limit("user", "api", config)).allowed
+
+            assert await limiter.reset_rate_limit("user", "api")
+            config = RateLimitConfig(strategy=RateLimitStrategy.FIXED_WINDOW, max_requests=1, window_seconds=60)
+            return await limiter.check_rate_limit("user", "api", config), limiter._metrics["errors"]
+
+        result, errors = asyncio.run(scenario())
+
+        assert result.allowed and errors == 0
+
+
+class TestLocalPreLimiter:
+    def test_burst_is_shed_without_redis_round_trips(self):
+        """Test an identifier Redis has denied is rejected locally until the next sync."""
+        async def scenario():
+            limiter = make_limiter(LocalPreLimiter(sync_interval=60))
+            config = RateLimitConfig(max_requests=5, window_seconds=60)
+            results = [await limiter.check_rate_limit("1.2.3.4", "login", config) for _ in range(100)]
+            return limiter, results
+
+        limiter, results = asyncio.run(scenario())
+
+        assert sum(r.allowed for r in results) == 5
+        assert limiter.cache._metrics["operations"] == 6  # 5 admitted + the first denial
+        local = limiter.local_limiter.get_stats()
+        assert local["local_denied"] == 94
+        assert results[-1].details["local"] and results[-1].retry_after > 0
+
+    def test_local_block_resyncs_with_redis(self):
+        """Test a locally denied key is re-checked after sync_interval and follows a Redis reset."""
+        async def scenario():
+            limiter = make_limiter(LocalPreLimiter(sync_interval=0.05))
+            config = RateLimitConfig(max_requests=2, window_seconds=60)
+            for _ in range(4):
+                await limiter.check_rate_limit("user", "api", config)
+            await limiter.reset_rate_limit("user", "api")
+
+            blocked = await limiter.check_rate_limit("user", "api", config)
+            await asyncio.sleep(0.06)
+            resynced = await limiter.check_rate_limit("user", "api", config)
+            return limiter, blocked, resynced
+
+        limiter, blocked, resynced = asyncio.run(scenario())
+
+        assert not blocked.allowed and blocked.details["local"]
+        assert resynced.allowed
+        assert limiter.local_limiter.get_stats()["syncs"] == 1
+
+    def test_traffic_under_the_limit_is_never_denied_locally(self):
+        """Test the pre-limiter only forwards while identifiers stay within their limit."""
+        async def scenario():
+            limiter = make_limiter(LocalPreLimiter(maxsize=8))
+            config = RateLimitConfig(strategy=RateLimitStrategy.FIXED_WINDOW, max_requests=3, window_seconds=60)
+            results = [
+                await limiter.check_rate_limit(f"user-{i % 20}", "api", config)
+                for i in range(60)
+            ]
+            return limiter, results
+
+        limiter, results = asyncio.run(scenario())
+
+        assert all(r.allowed for r in results)
+        stats = limiter.local_limiter.get_stats()
+        assert stats["local_denied"] == 0 and stats["size"] == 8 and stats["evictions"] == 52
+
+
+class TestCheckMany:
+    def test_dimensions_are_all_or_nothing(self):
+        """Test a denial in one dimension does not consume the others."""
+        async def scenario():
+            limiter = make_limiter()
+            by_ip = RateLimitConfig(max_requests=10, window_seconds=60)
+            by_email = RateLimitConfig(max_requests=2, window_seconds=60)
+            results = [
+                await limiter.check_many([("1.2.3.4", "login", by_ip), ("a@example.com", "login_email", by_email)])
+                for _ in range(5)
+            ]
+            operations = limiter.cache._metrics["operations"]
+            ip_info = await limiter.get_rate_limit_info("1.2.3.4", "login", by_ip)
+            return results, operations, ip_info
+
+        results, operations, ip_info = asyncio.run(scenario())
+
+        assert [r.allowed for r in results] == [True, True, False, False, False]
+        assert operations == 5  # one round trip per call
+        assert ip_info["current_requests"] == 2
+
+    def test_most_restrictive_dimension_wins(self):
+        """Test the result reports the dimension with the fewest remaining requests."""
+        async def scenario():
+            limiter = make_limiter()
+            return await limiter.check_many([
+                ("1.2.3.4", "ip", RateLimitConfig(max_requests=100, window_seconds=60)),
+                ("7", "user", RateLimitConfig(max_requests=3, window_seconds=60)),
+            ])
+
+        result = asyncio.run(scenario())
+
+        assert result.allowed and result.remaining == 2
+        assert result.details["dimension"] == "user:7"
+        assert result.details["dimensions"]["ip:1.2.3.4"]["remaining"] == 99
+
+
+class TestAsyncRedisCache:
+    def test_connect_builds_a_client_on_the_pinned_redis(self, monkeypatch):
+        """Test _connect wires the client to its pool (redis 4.6 has no Redis.from_pool)."""
+        from redis.asyncio import Redis
+
+        async def ping(self):
+            return True
+
+        monkeypatch.setattr(Redis, "ping", ping)
+        cache = AsyncRedisCache()
+
+        assert asyncio.run(cache._connect()) is True
+        assert cache.redis_client.connection_pool is cache.connection_pool
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from apps.core.jwt.jwt_backend import JWTManager, TokenConfig
+from apps.core.jwt.session_store import RefreshSessionStore, RefreshTokenReused
+from apps.core.jwt.token_epochs import UserTokenEpochs
+
+SECRET = "unit-test-secret-key-that-is-long-enough-for-hs256"
+
+
+class InMemoryPipeline:
+    """Queues the Redis commands the session store uses and applies them in order."""
+
+    def __init__(self, data):
+        self.data = data
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def _apply(self, name, args, kwargs):
+        data = self.data
+        if name == "set":
+            data[args[0]] = args[1]
+            return True
+        if name == "sadd":
+            members = data.setdefault(args[0], set())
+            added = len(set(args[1:]) - members)
+            members.update(args[1:])
+            return added
+        if name == "srem":
+            members = data.get(args[0], set())
+            removed = len(members & set(args[1:]))
+            members.difference_update(args[1:])
+            return removed
+        if name == "smembers":
+            return set(data.get(args[0], set()))
+        if name == "mget":
+            return [data.get(key) for key in args[0]]
+        if name == "delete":
+            return sum(data.pop(key, None) is not None for key in args)
+        if name == "expire":
+            return args[0] in data
+        raise AssertionError(f"unexpected command {name}")
+
+
+class InMemoryAsyncCache:
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    async def pipeline(self, build, transaction=True):
+        self.round_trips += 1
+        pipe = InMemoryPipeline(self.data)
+        build(pipe)
+        return [pipe._apply(*command) for command in pipe.commands]
+
+
+def make_manager(cache):
+    config = TokenConfig(secret_key=SECRET, algorithm="HS256", issuer="tests", audience=["api"])
+    return JWTManager(
+        config,
+        token_epochs=UserTokenEpochs(store=LocMemCache("session-tests", {}), use_pubsub=False),
+        session_store=RefreshSessionStore(cache, ttl=config.refresh_token_expiry)
+    )
+
+
+class TestRefreshSessionStore:
+    def test_create_rotate_and_revoke_are_one_round_trip_each(self):
+        """Test each write is a single pipeline and list_sessions follows the active JTIs."""
+        async def scenario():
+            cache = InMemoryAsyncCache()
+            store = RefreshSessionStore(cache)
+
+            await store.create("1", "a", "phone")
+            await store.create("1", "b", "laptop")
+            await store.rotate("1", "a", "a2", "phone")
+            assert await store.revoke("1", "b")
+            writes = cache.round_trips
+
+            return writes, await store.list_sessions("1")
+
+        writes, sessions = asyncio.run(scenario())
+
+        assert writes == 4
+        assert [(s["jti"], s["session_id"]) for s in sessions] == [("a2", "phone")]
+
+    def test_reuse_revokes_the_session_only(self):
+        """Test presenting a rotated JTI again revokes its session's successor but not other sessions."""
+        async def scenario():
+            store = RefreshSessionStore(InMemoryAsyncCache())
+            await store.create("1", "a", "phone")
+            await store.create("1", "b", "laptop")
+            await store.rotate("1", "a", "a2", "phone")
+
+            with pytest.raises(RefreshTokenReused):
+                await store.rotate("1", "a", "a3", "phone")
+
+            return store, await store.list_sessions("1")
+
+        store, sessions = asyncio.run(scenario())
+
+        assert [s["jti"] for s in sessions] == ["b"]
+        assert store.get_stats()["reuse_detected"] == 1
+
+    def test_list_sessions_prunes_expired_records(self):
+        """Test a JTI whose record expired is dropped from the index."""
+        async def scenario():
+            cache = InMemoryAsyncCache()
+            store = RefreshSessionStore(cache)
+            await store.create("1", "a", "phone")
+            await store.create("1", "b", "laptop")
+            del cache.data[store._token_key("1", "a").encode()]
+
+            sessions = await store.list_sessions("1")
+            return cache, store, sessions
+
+        cache, store, sessions = asyncio.run(scenario())
+
+        assert [s["jti"] for s in sessions] == ["b"]
+        assert cache.data[store._index_key("1").encode()] == {b"b"}
+
+
+class TestRefreshFlow:
+    def test_refresh_token_is_stored_and_rotates_once(self):
+        """Test an issued refresh token is awaited into the store and can be exchanged exactly once."""
+        async def scenario():
+            manager = make_manager(InMemoryAsyncCache())
+            token = await manager.generate_refresh_token("1", "a@example.com", session_id="phone")
+            assert [s["session_id"] for s in await manager.list_sessions("1")] == ["phone"]
+
+            payload = await manager.verify_refresh_token(token)
+            successor = await manager.rotate_refresh_token(payload)
+            assert (await manager.verify_refresh_token(successor))["session_id"] == "phone"
+
+            with pytest.raises(RefreshTokenReused):
+                await manager.rotate_refresh_token(payload)
+            return await manager.list_sessions("1")
+
+        assert asyncio.run(scenario()) == []
+
+    def test_revoke_all_sessions_clears_the_index_and_rejects_tokens(self):
+        """Test "logout everywhere" empties list_sessions and the epoch rejects outstanding tokens."""
+        async def scenario():
+            manager = make_manager(InMemoryAsyncCache())
+            tokens = [await manager.generate_refresh_token("1", "a@example.com") for _ in range(3)]
+
+            await manager.revoke_all_sessions("1")
+
+            assert await manager.list_sessions("1") == []
+            return [await manager.verify_refresh_token(t) for t in tokens]
+
+        assert asyncio.run(scenario()) == [None, None, None]
@@ -0,0 +1,76 @@
+import jwt
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from apps.core.jwt.jwt_backend import JWTManager, TokenConfig, TokenType
+from apps.core.jwt.key_rotation import KeySet, SigningKey
+from apps.core.jwt.token_cache import VerifiedTokenCache
+from apps.core.jwt.token_epochs import UserTokenEpochs
+
+SECRET = "unit-test-secret-key-that-is-long-enough-for-hs256"
+
+
+def make_manager(config):
+    store = LocMemCache("signing-key-tests", {})
+    store.clear()
+    return JWTManager(
+        config,
+        token_cache=VerifiedTokenCache(maxsize=0, ttl=60),
+        token_epochs=UserTokenEpochs(store=store, use_pubsub=False)
+    )
+
+
+def eddsa_config(key: SigningKey, verify_only=False):
+    return TokenConfig(
+        algorithm="EdDSA",
+        secret_key=SECRET,
+        private_key=None if verify_only else key.private_pem(),
+        public_key=key.public_pem(),
+        key_id=key.kid,
+        issuer="tests",
+        audience=["api"],
+    )
+
+
+@pytest.fixture
+def key():
+    return SigningKey.generate("EdDSA", kid="k1")
+
+
+class TestEdDSATokens:
+    def test_signs_with_kid_and_verifies(self, key):
+        """Test EdDSA tokens carry the kid and verify with the public key alone."""
+        token = make_manager(eddsa_config(key)).generate_access_token("1", "a@example.com")
+
+        assert jwt.get_unverified_header(token) == {"alg": "EdDSA", "kid": "k1", "typ": "JWT"}
+        is_valid, payload = make_manager(eddsa_config(key, verify_only=True)).verify_token(token, TokenType.ACCESS)
+        assert is_valid and payload["sub"] == "1"
+
+    def test_unknown_kid_is_rejected(self, key):
+        """Test a token signed by a key outside the key set does not verify."""
+        other = SigningKey.generate("EdDSA", kid="k2")
+        token = make_manager(eddsa_config(other)).generate_access_token("1", "a@example.com")
+
+        assert make_manager(eddsa_config(key)).verify_token(token) == (False, None)
+
+    def test_hs256_token_is_rejected(self, key):
+        """Test the algorithm is pinned to the key, so an HS256 token is refused."""
+        hs_config = TokenConfig(secret_key=SECRET, algorithm="HS256", issuer="tests", audience=["api"])
+        token = make_manager(hs_config).generate_access_token("1", "a@example.com")
+
+        assert make_manager(eddsa_config(key)).verify_token(token) == (False, None)
+
+
+class TestKeySet:
+    def test_jwks_is_precomputed_and_etag_tracks_changes(self, key):
+        """Test the JWKS and its ETag are reused until a key is added or removed."""
+        key_set = KeySet([key])
+        jwks, etag = key_set.jwks_json, key_set.jwks_etag
+        assert key_set.jwks["keys"][0]["kty"] == "OKP" and key_set.jwks["keys"][0]["kid"] == "k1"
+        assert KeySet([key]).jwks_etag == etag
+
+        key_set.add(SigningKey.generate("EdDSA", kid="k2"), current=True)
+        assert key_set.jwks_etag != etag and key_set.current_kid == "k2"
+
+        key_set.remove("k1")
+        assert key_set.kids() == ["k2"] and key_set.jwks_json != jwks
@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime, timezone
+from apps.core.db.counting import CountResult
+from apps.core.schemas.common.pagination import (
+    PaginationParams,
+    PaginatedResponse,
+    CursorPage,
+    CursorPaginationParams,
+    CursorPaginatedResponse,
+    encode_cursor,
+    decode_cursor,
+)
+
+class TestCursorPagination:
+    def test_id_cursor_round_trip(self):
+        """Test an id-only cursor decodes to the same position."""
+        cursor = encode_cursor(7312345678901234567)
+        assert decode_cursor(cursor) == {'f': 'id', 'id': 7312345678901234567}
+    
+    def test_sort_key_cursor_round_trip(self):
+        """Test a cursor keeps the sort key value for the last row."""
+        created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        position = decode_cursor(encode_cursor(42, 'updated_at', created))
+        
+        assert position['f'] == 'updated_at'
+        assert position['id'] == 42
+        assert position['v'] == created.isoformat()
+    
+    def test_cursor_is_opaque(self):
+        """Test cursors are URL-safe and do not expose raw JSON."""
+        cursor = encode_cursor(42, 'name', 'Ma Hla')
+        assert '{' not in cursor
+        assert '=' not in cursor
+    
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', 'eyJmIjoibmFtZSIsImlkIjo0Mn0', '!!!'])
+    def test_invalid_cursor(self, cursor):
+        """Test malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    
+    def test_empty_cursor_means_first_page(self):
+        """Test an empty cursor parameter starts from the beginning."""
+        assert CursorPaginationParams(cursor='').cursor is None
+    
+    def test_cursor_response_has_next(self):
+        """Test has_next follows the presence of a next cursor."""
+        params = CursorPaginationParams(page_size=2)
+        
+        more = CursorPaginatedResponse.create(items=[1, 2], next_cursor=encode_cursor(2), params=params)
+        last = CursorPaginatedResponse.create(items=[3], next_cursor=None, params=params)
+        
+        assert more.pagination.has_next is True
+        assert last.pagination.has_next is False
+
+    def test_cursor_page_is_not_a_count_tuple(self):
+        """Test a use case's keyset page keeps its cursor apart from any total."""
+        page = CursorPage(items=[1, 2], next_cursor=encode_cursor(2))
+
+        assert page.has_next is True
+        assert not isinstance(page, tuple)
+        assert CursorPage().has_next is False
+
+
+class TestCountResult:
+    def test_behaves_as_int(self):
+        """Test a CountResult can stand in for the plain int total."""
+        total = CountResult(41, exact=False, has_next=True)
+        assert total == 41
+        assert (total + 19) // 20 == 3
+        assert total.exact is False and total.has_next is True
+    
+    def test_exact_total_drives_has_next(self):
+        """Test an exact total without has_next keeps the page arithmetic."""
+        response = PaginatedResponse.create(items=[1], total=CountResult(41), params=PaginationParams(page=2))
+        assert response.pagination.has_next is True
+        assert response.pagination.total_is_exact is True
+    
+    def test_estimated_total_uses_fetched_has_next(self):
+        """Test an estimated total defers has_next to the limit + 1 fetch."""
+        total = CountResult(100, exact=False, has_next=False)
+        response = PaginatedResponse.create(items=[1], total=total, params=PaginationParams(page=2))
+        assert response.pagination.has_next is False
+        assert response.pagination.total_is_exact is False
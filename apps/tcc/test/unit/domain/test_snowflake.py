@@ -49,3 +49,66 @@ class TestSnowflakeGenerator:
         assert 'sequence' in components
         assert components['datacenter_id'] == 1
         assert components['machine_id'] == 1
+    
+    def test_local_mode_ids_are_unique_and_ascending(self):
+        """Test local sequencing stays unique across millisecond rollovers."""
+        generator = SnowflakeGenerator(datacenter_id=1, machine_id=2, sequence_mode='local')
+        ids = [generator.generate_id() for _ in range(10000)]
+        
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+    
+    def test_reserved_ranges_are_handed_out_locally(self, monkeypatch):
+        """Test one reservation serves reserve_size IDs within a millisecond."""
+        generator = SnowflakeGenerator(datacenter_id=1, machine_id=3, reserve_size=16)
+        calls = []
+        
+        def reserve(timestamp, wanted):
+            calls.append(wanted)
+            return generator._reserve_local(timestamp, wanted)
+        
+        monkeypatch.setattr(generator, '_reserve_sequence_range', reserve)
+        monkeypatch.setattr(generator, '_current_timestamp', lambda: 1000)
+        ids = [generator.generate_id() for _ in range(40)]
+        
+        assert calls == [16, 16, 16]
+        assert len(set(ids)) == 40
+    
+    def test_invalid_reserve_size(self):
+        """Test reserve size must fit in the sequence bits."""
+        with pytest.raises(ValueError):
+            SnowflakeGenerator(datacenter_id=1, machine_id=1, reserve_size=5000)
+    
+    def test_allocate_array_is_packed_and_unique(self):
+        """Test array allocation spans millisecond windows and returns int64 IDs."""
+        generator = SnowflakeGenerator(datacenter_id=1, machine_id=4, sequence_mode='local')
+        ids = generator.allocate_array(10000)
+        
+        assert ids.typecode == 'q'
+        assert len(ids) == 10000
+        assert list(ids) == sorted(set(ids))
+    
+    def test_decompose_ids_matches_decompose_id(self):
+        """Test the column decomposition agrees with the per-ID one."""
+        generator = SnowflakeGenerator(datacenter_id=3, machine_id=5, sequence_mode='local')
+        ids = generator.allocate_array(5000)
+        columns = generator.decompose_ids(ids)
+        
+        for index in (0, 2500, 4999):
+            parts = generator.decompose_id(ids[index])
+            assert columns['timestamp'][index] == parts['timestamp']
+            assert columns['sequence'][index] == parts['sequence']
+        assert set(columns['datacenter_id']) == {3}
+        assert set(columns['worker_id']) == {3 * 32 + 5}
+    
+    def test_numpy_allocation_and_decomposition(self):
+        """Test the NumPy variants return int64 arrays and vectorized columns."""
+        np = pytest.importorskip('numpy')
+        generator = SnowflakeGenerator(datacenter_id=1, machine_id=6, sequence_mode='local')
+        ids = generator.allocate_array(5000, as_numpy=True)
+        columns = generator.decompose_ids(ids)
+        
+        assert ids.dtype == np.int64
+        assert bool((np.diff(ids) > 0).all())
+        assert set(columns['machine_id'].tolist()) == {6}
+        assert columns['unix_ms'][0] == generator.decompose_id(int(ids[0]))['timestamp'] + generator.epoch
@@ -9,12 +9,14 @@ from apps.tcc.usecase.usecases.auth.reset_password import ResetPasswordUseCase
 from apps.tcc.usecase.usecases.auth.verify_uc import VerifyTokenUseCase
 from apps.tcc.usecase.usecases.base.password_service import PasswordService
 from apps.core.jwt.jwt_backend import JWTManager
+from apps.core.jwt.login_attempts import LoginAttemptTracker
 
 # Lazy-loaded singletons
 _user_repository = None
 _auth_service = None
 _jwt_service = None
 _password_service = None
+_login_tracker = None
 
 async def get_user_repository() -> UserRepository:
     global _user_repository
@@ -57,13 +59,26 @@ async def get_password_service() -> PasswordService:
         _password_service = PasswordService()
     return _password_service
 
+async def get_login_tracker() -> LoginAttemptTracker:
+    global _login_tracker
+    if _login_tracker is None:
+        from django.conf import settings
+        _login_tracker = LoginAttemptTracker(
+            max_attempts=getattr(settings, "MAX_LOGIN_ATTEMPTS", 5),
+            failure_window=getattr(settings, "LOGIN_FAILURE_WINDOW_SECONDS", 900),
+            lockout_seconds=getattr(settings, "LOGIN_LOCKOUT_SECONDS", 60),
+            max_lockout_seconds=getattr(settings, "LOGIN_LOCKOUT_MAX_SECONDS", 3600),
+        )
+    return _login_tracker
+
 # Use case factories (create new instances each time)
 async def get_login_uc() -> LoginUseCase:
     return LoginUseCase(
         user_repository=await get_user_repository(),
         jwt_service=await get_jwt_service(),
         password_service=await get_password_service(),
-        auth_service=await get_auth_service()
+        auth_service=await get_auth_service(),
+        login_tracker=await get_login_tracker()
     )
 
 async def get_logout_uc() -> LogoutUseCase:
@@ -88,7 +103,8 @@ async def get_reset_password_uc() -> ResetPasswordUseCase:
     return ResetPasswordUseCase(
         user_repository=await get_user_repository(),
         auth_service=await get_auth_service(),
-        password_service=await get_password_service()
+        password_service=await get_password_service(),
+        login_tracker=await get_login_tracker()
     )
 
 async def get_verify_token_uc() -> VerifyTokenUseCase:
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, TypeVar, Generic
+from typing import List, Optional, Dict, Any, TypeVar, Generic, Tuple
 from django.db import models
 from django.core.exceptions import PermissionDenied
 from django.db.models import Q
 from apps.tcc.models.base.base_model import BaseModel
 from apps.tcc.utils.audit_logging import AuditLogger
+from apps.core.schemas.common.pagination import encode_cursor, decode_cursor
+from apps.core.db.counting import CountStrategy, CountResult
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +20,9 @@ class BaseRepository(Generic[T, E], ABC):
     No implementation, only abstract methods and common utilities
     """
     
-    def __init__(self, model_class):
+    def __init__(self, model_class, count_strategy: Optional[CountStrategy] = None):
         self.model_class = model_class
+        self.count_strategy = count_strategy or CountStrategy.from_settings()
     
     # ============ ABSTRACT METHODS (must be implemented by child) ============
     
@@ -81,6 +84,74 @@ class BaseRepository(Generic[T, E], ABC):
         
         return queryset
     
+    def _offset_page(
+        self,
+        queryset,
+        offset: int,
+        limit: int,
+        ordering: Tuple[str, ...] = ('-created_at',)
+    ) -> Tuple[List[T], CountResult]:
+        """
+        OFFSET-paginate a queryset - common to all repos.
+        
+        ``has_next`` comes from fetching ``limit + 1`` rows, so it stays correct
+        when the total is cached or estimated by ``self.count_strategy``.
+        Synchronous: call through sync_to_async from async repositories.
+        """
+        rows = list(queryset.order_by(*ordering)[offset:offset + limit + 1])
+        has_next = len(rows) > limit
+        
+        total = self.count_strategy.count(queryset)
+        # A page we can see beyond trumps a low estimate
+        floor = offset + min(len(rows), limit) + (1 if has_next else 0)
+        return rows[:limit], CountResult(max(total, floor), exact=total.exact, has_next=has_next)
+    
+    def _keyset_page(
+        self,
+        queryset,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        sort_field: str = 'id',
+        descending: bool = True
+    ) -> Tuple[List[T], Optional[str]]:
+        """
+        Seek-paginate a queryset on (sort_field, id) - common to all repos.
+        
+        Snowflake IDs are time-ordered, so ``id`` is both the default sort key
+        and the tie-breaker; ``created_at`` is served from the primary key.
+        Fetches ``limit + 1`` rows to detect a next page without a COUNT.
+        Synchronous: call through sync_to_async from async repositories.
+        """
+        if sort_field == 'created_at':
+            sort_field = 'id'
+        
+        op = 'lt' if descending else 'gt'
+        prefix = '-' if descending else ''
+        ordering = [f'{prefix}id'] if sort_field == 'id' else [f'{prefix}{sort_field}', f'{prefix}id']
+        
+        if cursor:
+            position = decode_cursor(cursor)
+            if position['f'] != sort_field:
+                raise ValueError("Cursor does not match the requested sort order")
+            
+            if sort_field == 'id':
+                queryset = queryset.filter(**{f'id__{op}': position['id']})
+            else:
+                field = queryset.model._meta.get_field(sort_field)
+                value = field.to_python(position['v'])
+                queryset = queryset.filter(
+                    Q(**{f'{sort_field}__{op}': value}) |
+                    Q(**{sort_field: value, f'id__{op}': position['id']})
+                )
+        
+        rows = list(queryset.order_by(*ordering)[:limit + 1])
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(last.id, sort_field, getattr(last, sort_field))
+    
     def _prepare_audit_fields(self, data: Dict, user=None) -> Dict:
         """Prepare audit fields for create/update"""
         if not user or not hasattr(user, 'id'):
@@ -5,6 +5,7 @@ from django.db import IntegrityError
 from django.db.models import Q
 from asgiref.sync import sync_to_async 
 from django.core.cache import cache
+from django.utils import timezone
 from pydantic import ValidationError
 from apps.core.core_exceptions.domain import DomainValidationException
 from apps.tcc.models.users.users import User
@@ -24,6 +25,12 @@ class UserRepository(BaseRepository[User, UserEntity]):
     Includes caching, retry, and error handling
     """
     
+    # Non-nullable columns that keyset pagination may sort on
+    CURSOR_SORT_FIELDS = {'id', 'created_at', 'updated_at', 'name', 'email'}
+    
+    # Request context added by BaseUseCase._add_audit_context, not model fields
+    AUDIT_CONTEXT_KEYS = {'user', 'ip_address', 'user_agent'}
+    
     def __init__(self):
         super().__init__(User)
         self.cache_prefix = "user"
@@ -71,7 +78,8 @@ class UserRepository(BaseRepository[User, UserEntity]):
             try:
                 user = self.model_class(**data)
                 user.full_clean()
-                user.save()
+                # Already validated above - don't run full_clean (and its unique-email SELECT) twice
+                user.save(validate=False)
                 return user
             except ValidationError as e:
                 logger.debug(f"Django ValidationError: {e.message_dict}")
@@ -171,8 +179,48 @@ class UserRepository(BaseRepository[User, UserEntity]):
     async def update(self, object_id: int, data: Dict, user=None, request=None) -> Optional[UserEntity]:
         """Update user - with cache invalidation (PURE data update)"""
         # NO password hashing here - use case handles that
-        return await super().update(object_id, data, user, request)
-    
+        def sync_update():
+            instance = self.model_class.objects.filter(pk=object_id).first()
+            if instance is None:
+                return None
+            
+            writable = {
+                f.name for f in self.model_class._meta.concrete_fields
+                if f.editable and not f.primary_key
+            }
+            for key, value in data.items():
+                if key in writable:
+                    setattr(instance, key, value)
+            
+            ignored = set(data) - writable - self.AUDIT_CONTEXT_KEYS
+            if ignored:
+                logger.debug(f"UserRepository.update ignored unknown fields: {sorted(ignored)}")
+            
+            acting_user = data.get('user') or user
+            if not isinstance(acting_user, self.model_class):
+                acting_user = None
+            
+            # Input was validated by the use case schemas: skip full_clean and write only changed columns
+            instance.save(validate=False, user=acting_user)
+            return instance
+        
+        user_model = await sync_to_async(sync_update, thread_sensitive=False)()
+        return self._model_to_entity(user_model)
+
+    @with_db_error_handling
+    @with_retry(max_attempts=3)
+    async def record_login(self, user_id: int, when: Optional[datetime] = None) -> bool:
+        """
+        Stamp last_login with a single UPDATE (no SELECT, no save signals).
+        UserEntity does not carry last_login, so cached entities stay valid.
+        """
+        when = when or timezone.now()
+
+        def sync_record():
+            return self.model_class.objects.filter(pk=user_id).update(last_login=when)
+
+        return bool(await sync_to_async(sync_record, thread_sensitive=False)())
+
     @with_db_error_handling
     @with_retry(max_attempts=3)
     @cache_invalidate(
@@ -194,14 +242,14 @@ class UserRepository(BaseRepository[User, UserEntity]):
     
     @with_db_error_handling
     @with_retry(max_attempts=3)
-    @cached(
-        key_template="users:list:{filters_hash}:{page}:{per_page}",
-        ttl=900,  # 15 minutes for list views
-        namespace="users",
-        version="1"
-    )
     async def get_paginated(self, filters: Dict = None, page: int = 1, per_page: int = 20) -> Tuple[List[UserEntity], int]:
-        """Get paginated users - with caching (PURE data query)"""
+        """
+        Get paginated users (PURE data query)
+        
+        Not result-cached: the total is a CountResult whose exact/has_next
+        flags would not survive JSON encoding. In cached mode the count
+        strategy caches the total itself, invalidated on writes.
+        """
         try:
             # Define synchronous functions for database operations
             def sync_get_queryset():
@@ -213,21 +261,14 @@ class UserRepository(BaseRepository[User, UserEntity]):
                             base_queryset = base_queryset.filter(**{key: value})
                 return base_queryset
             
-            def sync_get_count(queryset):
-                return queryset.count()
-            
-            def sync_get_users(queryset, offset, limit):
-                return list(queryset.order_by('-created_at')[offset:offset + limit])
-            
             # Get queryset
             base_queryset = await sync_to_async(sync_get_queryset, thread_sensitive=True)()
             
-            # Get total count
-            total_count = await sync_to_async(sync_get_count, thread_sensitive=True)(base_queryset)
-            
-            # Apply pagination
+            # Apply pagination - total via the configured count strategy, has_next via limit + 1
             offset = (page - 1) * per_page
-            users_list = await sync_to_async(sync_get_users, thread_sensitive=True)(base_queryset, offset, per_page)
+            users_list, total_count = await sync_to_async(self._offset_page, thread_sensitive=True)(
+                base_queryset, offset, per_page
+            )
             
             # Convert to entities
             users = []
@@ -240,6 +281,33 @@ class UserRepository(BaseRepository[User, UserEntity]):
             logger.error(f"Error in get_paginated: {str(e)}", exc_info=True)
             return [], 0
     
+    @with_db_error_handling
+    @with_retry(max_attempts=3)
+    async def get_cursor_page(
+        self,
+        filters: Dict = None,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None
+    ) -> Tuple[List[UserEntity], Optional[str]]:
+        """Get a keyset page of users - returns (users, next_cursor) (PURE data query)"""
+        def sync_get_page():
+            queryset = User.objects.filter(is_active=True)
+            if filters:
+                for key, value in filters.items():
+                    if value is not None:
+                        queryset = queryset.filter(**{key: value})
+            return self._keyset_page(
+                queryset,
+                cursor=cursor,
+                limit=per_page,
+                **self._cursor_sort(sort_by, sort_order)
+            )
+        
+        users_list, next_cursor = await self._run_cursor_query(sync_get_page)
+        return [self._model_to_entity(user) for user in users_list], next_cursor
+    
     # ============ SPECIALIZED QUERIES ============
     
     @with_db_error_handling
@@ -254,21 +322,14 @@ class UserRepository(BaseRepository[User, UserEntity]):
                     (Q(name__icontains=search_term) | Q(email__icontains=search_term))
                 )
             
-            def sync_get_count(queryset):
-                return queryset.count()
-            
-            def sync_get_users(queryset, offset, limit):
-                return list(queryset.order_by('-created_at')[offset:offset + limit])
-            
             # Get queryset
             queryset = await sync_to_async(sync_search, thread_sensitive=True)()
             
-            # Get total count
-            total_count = await sync_to_async(sync_get_count, thread_sensitive=True)(queryset)
-            
-            # Apply pagination
+            # Apply pagination - total via the configured count strategy, has_next via limit + 1
             offset = (page - 1) * per_page
-            users_list = await sync_to_async(sync_get_users, thread_sensitive=True)(queryset, offset, per_page)
+            users_list, total_count = await sync_to_async(self._offset_page, thread_sensitive=True)(
+                queryset, offset, per_page
+            )
             
             # Convert to entities
             users = []
@@ -281,6 +342,25 @@ class UserRepository(BaseRepository[User, UserEntity]):
             logger.error(f"Error in search_users: {str(e)}", exc_info=True)
             return [], 0
     
+    @with_db_error_handling
+    @with_retry(max_attempts=3)
+    async def search_users_by_cursor(
+        self,
+        search_term: str,
+        cursor: Optional[str] = None,
+        per_page: int = 20
+    ) -> Tuple[List[UserEntity], Optional[str]]:
+        """Search users with keyset pagination - returns (users, next_cursor) (PURE data query)"""
+        def sync_search_page():
+            queryset = User.objects.filter(
+                Q(is_active=True) &
+                (Q(name__icontains=search_term) | Q(email__icontains=search_term))
+            )
+            return self._keyset_page(queryset, cursor=cursor, limit=per_page)
+        
+        users_list, next_cursor = await self._run_cursor_query(sync_search_page)
+        return [self._model_to_entity(user) for user in users_list], next_cursor
+    
     @with_db_error_handling
     @with_retry(max_attempts=3)
     @cached(key_template="user:exists:email:{email}", ttl=300, namespace="users", version="1")
@@ -314,6 +394,23 @@ class UserRepository(BaseRepository[User, UserEntity]):
             await self._invalidate_user_cache(instance.id, instance.email if hasattr(instance, 'email') else None)
         return await super().save(instance, user, request)
     
+    # ============ PAGINATION UTILITY METHODS ============
+    
+    def _cursor_sort(self, sort_by: Optional[str], sort_order: Optional[str]) -> Dict[str, Any]:
+        """Map list sort options onto keyset sort arguments"""
+        sort_field = sort_by if sort_by in self.CURSOR_SORT_FIELDS else 'id'
+        return {'sort_field': sort_field, 'descending': sort_order != 'asc'}
+    
+    async def _run_cursor_query(self, sync_query):
+        """Run a keyset query, surfacing bad cursors as validation errors"""
+        try:
+            return await sync_to_async(sync_query, thread_sensitive=True)()
+        except ValueError as e:
+            raise DomainValidationException(
+                message=str(e),
+                field_errors={'cursor': [str(e)]}
+            )
+    
     # ============ CACHE UTILITY METHODS ============
     
     async def _invalidate_user_cache(self, user_id: int, email: str = None):
@@ -8,6 +8,7 @@ from apps.core.schemas.out_schemas.aut_out_schemas import (
     RegisterResponseSchema,
 )
 
+from apps.core.jwt.hashing import HasherOverloaded
 from apps.tcc.usecase.domain_exception.auth_exceptions import InvalidAuthInputException
 from apps.tcc.usecase.services.auth.base_controller import BaseController
 # REMOVE THIS IMPORT: from apps.tcc.usecase.services.exceptions.auth_exceptions import AuthExceptionHandler
@@ -74,6 +75,9 @@ class AuthController(BaseController):
             # Log more details about invalid auth
             logger.warning(f"Invalid login attempt: {e.user_message} for {input_data.get('email')}")
             raise
+        except HasherOverloaded:
+            # Shed by the password hasher: the view answers 503/429 with Retry-After
+            raise
         except Exception as e:
             logger.error(f"Unexpected login error: {e}", exc_info=True)
             # Wrap unexpected errors
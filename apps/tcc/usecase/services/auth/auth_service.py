@@ -4,9 +4,12 @@ from typing import Dict, Any, Optional
 
 from asgiref.sync import sync_to_async
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 
-from apps.tcc.models.base.auditlog import AuditLog, SecurityEvent
+from apps.tcc.models.base.auditlog import SecurityEvent
+from apps.tcc.utils.audit_buffer import write_audit_log
 
 logger = logging.getLogger(__name__)
 
@@ -63,13 +66,16 @@ class AsyncAuthDomainService:
                     'server_name': request_meta.get('SERVER_NAME', ''),
                 }
             
-            # Infrastructure: Database operation
-            AuditLog.objects.create(
+            # Infrastructure: Buffered audit write (the user is the audited object)
+            write_audit_log(
+                content_type=ContentType.objects.get_for_model(get_user_model()),
+                object_id=user_id,
                 user_id=user_id,
                 action=action,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                metadata=metadata,
+                resource_type='User',
+                meta_info=metadata,
                 timestamp=timezone.now()
             )
         except Exception as e:
@@ -82,6 +88,36 @@ class AsyncAuthDomainService:
                 severity='MEDIUM'
             )
 
+    @sync_to_async
+    def record_lockout_async(self, user_id: int, locked_for: int, request_meta: Optional[Dict] = None) -> None:
+        """
+        Infrastructure: Persist an applied login lockout (the lock itself lives in Redis)
+        """
+        try:
+            SecurityEvent.objects.create(
+                user_id=user_id,
+                event_type='ACCOUNT_LOCKOUT',
+                severity='HIGH',
+                ip_address=(self._get_client_ip(request_meta) if request_meta else None) or None,
+                description=f'Account locked for {locked_for}s after repeated failed logins',
+                timestamp=timezone.now()
+            )
+        except Exception as e:
+            logger.error(f"Lockout event creation failed: {str(e)}")
+
+    @sync_to_async
+    def resolve_lockouts_async(self, user_id: int) -> int:
+        """
+        Infrastructure: Mark a user's open lockout events resolved once the lock is cleared
+        """
+        try:
+            return SecurityEvent.objects.filter(
+                user_id=user_id, event_type='ACCOUNT_LOCKOUT', resolved=False
+            ).update(resolved=True)
+        except Exception as e:
+            logger.error(f"Lockout resolution failed: {str(e)}")
+            return 0
+
     def _get_client_ip(self, request_meta: Dict) -> str:
         """
         Infrastructure: Extract client IP
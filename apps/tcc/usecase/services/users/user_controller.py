@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 from functools import wraps
 
 from apps.core.schemas.input_schemas.users import (
@@ -9,6 +9,7 @@ from apps.core.schemas.input_schemas.users import (
     UserSearchInputSchema,
     EmailCheckInputSchema,
 )
+from apps.core.schemas.common.pagination import CursorPage
 from apps.tcc.usecase.services.auth.base_controller import BaseController
 from apps.core.schemas.validator.user_deco import (
     # Validation decorators
@@ -214,8 +215,8 @@ class UserController(BaseController):
         validated_data: UserQueryInputSchema,
         current_user: Any = None,
         context: Dict[str, Any] = None
-    ) -> Tuple[List[UserEntity], int]:
-        """Get all users with pagination"""
+    ) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Get all users with pagination (a CursorPage when validated_data.cursor is set)"""
         get_all_users_uc = await self._get_use_case('get_all_users')
         
         # FIXED: Pass filters in input_data
@@ -339,14 +340,15 @@ class UserController(BaseController):
         page: int = 1,
         per_page: int = 20,
         current_user: Any = None,
-        context: Dict[str, Any] = None
-    ) -> Tuple[List[UserEntity], int]:
-        """Get users by role"""
+        context: Dict[str, Any] = None,
+        cursor: Optional[str] = None
+    ) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Get users by role (pass cursor for keyset pagination, returned as a CursorPage)"""
         get_users_by_role_uc = await self._get_use_case('get_users_by_role')
         
         # FIXED: Pass parameters in input_data
         return await get_users_by_role_uc.execute(
-            input_data={'role': role, 'page': page, 'per_page': per_page},
+            input_data={'role': role, 'page': page, 'per_page': per_page, 'cursor': cursor},
             user=current_user,
             context=context
         )
@@ -359,8 +361,8 @@ class UserController(BaseController):
         validated_data: UserSearchInputSchema,
         current_user: Any = None,
         context: Dict[str, Any] = None
-    ) -> Tuple[List[UserEntity], int]:
-        """Search users"""
+    ) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Search users (a CursorPage when validated_data.cursor is set)"""
         search_users_uc = await self._get_use_case('search_users')
         
         # FIXED: Pass search data in input_data
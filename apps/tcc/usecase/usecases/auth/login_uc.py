@@ -12,24 +12,39 @@ from apps.tcc.usecase.domain_exception.auth_exceptions import (
 from apps.tcc.usecase.domain_exception.u_exceptions import AccountLockedException
 from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
 from apps.core.jwt.jwt_backend import JWTManager
+from apps.core.jwt.login_attempts import LoginAttemptTracker
 from apps.tcc.usecase.usecases.base.password_service import PasswordService
 
 import logging
 logger = logging.getLogger(__name__)
 
+# The event loop only keeps weak references to tasks; hold fire-and-forget
+# work here until it finishes so it cannot be garbage-collected mid-flight
+_background_tasks = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
 class LoginUseCase(BaseUseCase):
 
     def __init__(self, user_repository: UserRepository, 
                  jwt_service: JWTManager, 
                  password_service: PasswordService,
-                 auth_service=None):
+                 auth_service=None,
+                 login_tracker: LoginAttemptTracker = None):
 
         super().__init__()
         self.user_repository = user_repository
         self.jwt_service = jwt_service
         self.password_service = password_service
         self.auth_service = auth_service
+        # Failure counters and lockouts live in Redis; the users row is not touched on failures
+        self.login_tracker = login_tracker or LoginAttemptTracker()
 
     def _setup_configuration(self):
         self.config.require_authentication = False
@@ -92,7 +107,7 @@ class LoginUseCase(BaseUseCase):
                 user_message="Invalid email or password.",
             )
 
-        # 2. Check status
+        # 2. Check status (before bcrypt, so a locked account costs no hashing)
         if getattr(user_entity, "is_locked", False):
             raise AccountLockedException(
                 user_id=str(user_entity.id),
@@ -100,6 +115,15 @@ class LoginUseCase(BaseUseCase):
                 user_message="Your account is locked."
             )
 
+        login_state = await self.login_tracker.get_state(user_entity.id)
+        if login_state.is_locked:
+            lock_until = datetime.utcnow() + timedelta(seconds=login_state.locked_for)
+            raise AccountLockedException(
+                user_id=str(user_entity.id),
+                lock_reason="Too many failed attempts",
+                lock_until=lock_until.isoformat(timespec="seconds") + "Z",
+            )
+
         if not getattr(user_entity, "is_active", True):
             raise AccountInactiveException(
                 username=user_entity.email,
@@ -113,13 +137,17 @@ class LoginUseCase(BaseUseCase):
         )
 
         if not password_valid:
-            await self._track_failed_login(user_entity.id)
+            await self._track_failed_login(user_entity.id, ctx)
             raise InvalidAuthInputException(
                 field_errors={"credentials": ["Invalid email or password"]},
                 user_message="Invalid email or password.",
             )
 
-        await self._reset_failed_logins(user_entity.id)
+        if login_state.has_history:
+            await self._reset_failed_logins(user_entity.id, ctx)
+
+        if await self.password_service.password_needs_rehash(user_entity.password_hash):
+            _spawn(self._rehash_password(user_entity.id, login_input.password))
 
         # 4. Prepare roles
         roles = getattr(user_entity, "roles", [])
@@ -133,32 +161,16 @@ class LoginUseCase(BaseUseCase):
             roles=roles
         )
 
-        refresh_token =  self.jwt_service.generate_refresh_token(
+        refresh_token = await self.jwt_service.generate_refresh_token(
             user_id=user_entity.id,
             email=user_entity.email
         )
 
-        # 6. Update last login
-        await self.user_repository.update(user_entity.id, {
-            "last_login": datetime.utcnow(),
-            "login_count": getattr(user_entity, "login_count", 0) + 1,
-            "failed_login_attempts": 0
-        })
+        # 6. Update last login (the only write on a successful login)
+        await self.user_repository.record_login(user_entity.id)
 
         # 7. Audit log (fire-and-forget)
-        if self.auth_service:
-            # Safely get request_meta from context
-            request_meta = {}
-            if hasattr(ctx, 'request_meta'):
-                request_meta = ctx.request_meta
-            elif isinstance(ctx, dict):
-                request_meta = ctx.get("request_meta", {})
-            
-            asyncio.create_task(
-                self.auth_service.audit_login_async(
-                    user_entity.id, "LOGIN", request_meta
-                )
-            )
+        self._audit(user_entity.id, "LOGIN", ctx)
 
         user_name = getattr(user_entity, 'name', '')
         if not user_name:
@@ -200,24 +212,43 @@ class LoginUseCase(BaseUseCase):
         )
             
             
-    async def _track_failed_login(self, user_id: int):
-        user = await self.user_repository.get_by_id(user_id)
-        attempts = getattr(user, "failed_login_attempts", 0)
-
-        if attempts + 1 >= 5:
-            await self.user_repository.update(user_id, {
-                "is_locked": True,
-                "lock_reason": "Too many failed attempts",
-                "failed_login_attempts": attempts + 1
-            })
-        else:
-            await self.user_repository.update(user_id, {
-                "failed_login_attempts": attempts + 1
-            })
-
-    async def _reset_failed_logins(self, user_id: int):
-        await self.user_repository.update(user_id, {
-            "failed_login_attempts": 0,
-            "is_locked": False,
-            "lock_reason": None
-        })
+    @staticmethod
+    def _request_meta(ctx) -> dict:
+        # Safely get request_meta from context
+        if hasattr(ctx, 'request_meta'):
+            return ctx.request_meta
+        if isinstance(ctx, dict):
+            return ctx.get("request_meta", {})
+        return {}
+
+    def _audit(self, user_id, action: str, ctx):
+        """Fire-and-forget audit entry for the user"""
+        if self.auth_service:
+            _spawn(
+                self.auth_service.audit_login_async(user_id, action, self._request_meta(ctx))
+            )
+
+    async def _track_failed_login(self, user_id: int, ctx=None):
+        """Count the failure in Redis; the DB is only written when a lock is applied"""
+        failure = await self.login_tracker.record_failure(user_id)
+        if failure.locked and self.auth_service:
+            _spawn(
+                self.auth_service.record_lockout_async(user_id, failure.locked_for, self._request_meta(ctx))
+            )
+
+    async def _reset_failed_logins(self, user_id: int, ctx=None):
+        """Clear Redis state; the DB is only written when a lock is cleared"""
+        if await self.login_tracker.clear(user_id) and self.auth_service:
+            _spawn(self.auth_service.resolve_lockouts_async(user_id))
+
+    async def _rehash_password(self, user_id: int, password: str):
+        """Re-hash at the current BCRYPT_ROUNDS while the plaintext is at hand (best effort)"""
+        hasher = self.password_service.hasher
+        if not hasher.has_headroom():
+            return  # optional work: leave capacity for logins, retry on a later login
+        try:
+            new_hash = await self.password_service.hash_password(password)
+            await self.user_repository.update(user_id, {"password": new_hash})
+            logger.info(f"Rehashed password for user {user_id} at cost {hasher.rounds}")
+        except Exception as e:
+            logger.warning(f"Password rehash for user {user_id} skipped: {e}")
@@ -62,22 +62,12 @@ class LogoutUseCase(BaseUseCase):
 
     async def _on_execute(self, data, user, ctx):
         """Execute logout business logic"""
-        token_str = self.validated_input.refresh_token
         request_meta = ctx.get('request_meta', {}) if ctx else {}
         
-        # Business Rule: Token revocation (if provided)
-        if token_str:
-            # Verify token belongs to user before revoking
-            try:
-                token_payload = await self.jwt_service.verify_token(token_str)
-                if token_payload.get('user_id') == user.id:
-                    # Revoke token asynchronously
-                    asyncio.create_task(
-                        self.auth_service.revoke_token_async(token_str, user.id)
-                    )
-            except Exception as e:
-                # Log but don't fail logout if token verification fails
-                logger.warning(f"Token verification failed during logout for user {user.id}: {e}")
+        # Business Rule: Token revocation - bumping the user's epoch invalidates
+        # every access and refresh token issued so far (the submitted refresh
+        # token included), with one cache write instead of a blacklist entry per JTI
+        await self.jwt_service.revoke_all_sessions(user.id)
         
         # Business Rule: Audit logging
         asyncio.create_task(
@@ -1,12 +1,14 @@
 from typing import Dict, Any
+from datetime import datetime, timedelta
 from pydantic import ValidationError
 
 from apps.core.schemas.input_schemas.auth import RefreshTokenInputSchema
-from apps.core.schemas.out_schemas.aut_out_schemas import TokenRefreshResponseSchema
+from apps.core.schemas.out_schemas.aut_out_schemas import TokenRefreshResponseSchema, TokenResponseSchema
 from apps.tcc.usecase.domain_exception.u_exceptions import InvalidUserInputException
 from apps.tcc.usecase.usecases.base.base_uc import BaseUseCase
 from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
 from apps.core.jwt.jwt_backend import JWTManager
+from apps.core.jwt.session_store import RefreshTokenReused
 import logging
 
 logger = logging.getLogger(__name__)
@@ -69,39 +71,25 @@ class RefreshTokenUseCase(BaseUseCase):
             )
 
     async def _on_execute(self, data, user, ctx):
-        """Generate new access token using refresh token"""
+        """Rotate the refresh token and issue a new access token"""
         refresh_token = self.validated_input.refresh_token
         
-        # 1. Verify refresh token
+        # 1. Verify refresh token (signature, type, expiry, user revocation epoch)
         try:
             token_payload = await self.jwt_service.verify_refresh_token(refresh_token)
-            if not token_payload:
-                raise InvalidUserInputException(
-                    field_errors={"refresh_token": ["Invalid or expired refresh token"]},
-                    user_message="Refresh token is invalid or expired."
-                )
         except Exception as e:
             logger.error(f"Token verification failed: {e}")
-            raise InvalidUserInputException(
-                field_errors={"refresh_token": ["Invalid refresh token"]},
-                user_message="Refresh token is invalid."
-            )
-        
-        user_id = token_payload.get('user_id')
-        
-        # 2. Check if token is blacklisted
-        is_blacklisted = await self.jwt_service.is_token_blacklisted(
-            user_id=user_id,
-            token_id=token_payload.get('jti')
-        )
+            token_payload = None
         
-        if is_blacklisted:
+        if not token_payload:
             raise InvalidUserInputException(
-                field_errors={"refresh_token": ["Token has been revoked"]},
-                user_message="Refresh token has been revoked. Please login again."
+                field_errors={"refresh_token": ["Invalid or expired refresh token"]},
+                user_message="Refresh token is invalid or expired."
             )
         
-        # 3. Get user data
+        user_id = token_payload.get('sub')
+        
+        # 2. Get user data
         user_entity = await self.user_repository.get_by_id(user_id)
         if not user_entity:
             raise InvalidUserInputException(
@@ -109,7 +97,7 @@ class RefreshTokenUseCase(BaseUseCase):
                 user_message="User account not found."
             )
         
-        # 4. Check account status
+        # 3. Check account status
         if getattr(user_entity, 'is_locked', False):
             raise InvalidUserInputException(
                 field_errors={"account": ["Account is locked"]},
@@ -122,19 +110,34 @@ class RefreshTokenUseCase(BaseUseCase):
                 user_message="Your account is inactive."
             )
         
-        # 5. Generate new access token
+        # 4. Rotate: the presented token stops working; presenting it again
+        # (a replayed or stolen token) revokes the whole session
+        try:
+            new_refresh_token = await self.jwt_service.rotate_refresh_token(token_payload)
+        except RefreshTokenReused:
+            raise InvalidUserInputException(
+                field_errors={"refresh_token": ["Token has been revoked"]},
+                user_message="Refresh token has been revoked. Please login again."
+            )
+        
+        # 5. Generate new access token for the same session
         user_roles = getattr(user_entity, 'roles', [])
         if not user_roles and hasattr(user_entity, 'role'):
             user_roles = [user_entity.role]
         
-        new_access_token = await self.jwt_service.generate_access_token(
+        new_access_token = self.jwt_service.generate_access_token(
             user_id=user_entity.id,
             email=user_entity.email,
-            roles=user_roles
+            roles=user_roles,
+            session_id=token_payload.get('session_id')
         )
         
         return TokenRefreshResponseSchema(
-            access_token=new_access_token,
-            expires_in=900,  # 15 minutes
-            token_type="bearer"
-        )
\ No newline at end of file
+            tokens=TokenResponseSchema(
+                access_token=new_access_token,
+                refresh_token=new_refresh_token,
+                token_type="bearer",
+                expires_in=900,  # 15 minutes
+                expires_at=datetime.utcnow() + timedelta(seconds=900)
+            )
+        )
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Dict, Any
 from pydantic import ValidationError
 
+from apps.core.jwt.login_attempts import LoginAttemptTracker
 from apps.core.schemas.input_schemas.auth import ResetPasswordInputSchema
 from apps.core.schemas.out_schemas.aut_out_schemas import ResetPasswordResponseSchema
 from apps.tcc.usecase.domain_exception.u_exceptions import InvalidUserInputException
@@ -19,11 +20,13 @@ class ResetPasswordUseCase(BaseUseCase):
 
     def __init__(self, user_repository: UserRepository,
                  auth_service: AsyncAuthDomainService,
-                 password_service: PasswordService):
+                 password_service: PasswordService,
+                 login_tracker: LoginAttemptTracker = None):
         super().__init__()
         self.user_repository = user_repository
         self.auth_service = auth_service
         self.password_service = password_service
+        self.login_tracker = login_tracker
 
     def _setup_configuration(self):
         self.config.require_authentication = False
@@ -147,6 +150,10 @@ class ResetPasswordUseCase(BaseUseCase):
             'requires_password_change': False
         })
         
+        # Lockouts live in Redis, not on the users row
+        if self.login_tracker is not None:
+            await self.login_tracker.clear(user_id)
+        
         # 7. Invalidate reset token
         await self.auth_service.invalidate_reset_token(reset_token)
         
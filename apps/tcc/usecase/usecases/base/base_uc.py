@@ -410,13 +410,15 @@ class GenericListUseCase(GenericCRUDUseCase[T, S]):
         
         # Calculate pagination info
         total_pages = (total_count + per_page - 1) // per_page if per_page > 0 else 1
+        has_next = getattr(total_count, 'has_next', None)
         
         return {
             "items": items,
-            "total": total_count,
+            "total": int(total_count),
+            "total_is_exact": getattr(total_count, 'exact', True),
             "page": page,
             "page_size": per_page,
             "total_pages": total_pages,
-            "has_next": page < total_pages,
+            "has_next": page < total_pages if has_next is None else has_next,
             "has_prev": page > 1
         }
\ No newline at end of file
@@ -1,26 +1,31 @@
-import bcrypt
 import secrets
 import string
 from typing import Optional, Tuple
 import logging
-from asgiref.sync import sync_to_async
+
+from apps.core.jwt.hashing import BcryptHasher, HasherOverloaded, get_password_hasher
 
 logger = logging.getLogger(__name__)
 
 class PasswordService:
     """Service for password hashing and verification"""
     
+    def __init__(self, hasher: BcryptHasher = None):
+        self._hasher = hasher
+    
+    @property
+    def hasher(self) -> BcryptHasher:
+        # bcrypt runs on a dedicated process pool, not the shared thread executor
+        if self._hasher is None:
+            self._hasher = get_password_hasher()
+        return self._hasher
+    
     async def hash_password(self, password: str) -> str:
         """Hash password using bcrypt"""
         try:
-            # Generate salt and hash password
-            salt = bcrypt.gensalt()
-            # Use sync_to_async for bcrypt operations since they're CPU intensive
-            def _hash():
-                return bcrypt.hashpw(password.encode('utf-8'), salt)
-            
-            hashed = await sync_to_async(_hash)()
-            return hashed.decode('utf-8')
+            return await self.hasher.hash(password)
+        except HasherOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Password hashing failed: {str(e)}")
             raise ValueError("Failed to hash password")
@@ -31,13 +36,10 @@ class PasswordService:
             if not plain_password or not hashed_password:
                 return False
             
-            def _verify():
-                return bcrypt.checkpw(
-                    plain_password.encode('utf-8'),
-                    hashed_password.encode('utf-8')
-                )
-            
-            return await sync_to_async(_verify)()
+            return await self.hasher.verify(plain_password, hashed_password)
+        except HasherOverloaded:
+            # shed, not a wrong password: must not count as a failed login
+            raise
         except Exception as e:
             logger.error(f"Password verification failed: {str(e)}")
             return False
@@ -70,10 +72,8 @@ class PasswordService:
         return temp_password
     
     async def password_needs_rehash(self, hashed_password: str) -> bool:
-        """Check if password needs rehashing (e.g., after algorithm updates)"""
+        """Check if password needs rehashing (bcrypt cost differs from BCRYPT_ROUNDS)"""
         try:
-            # bcrypt automatically handles this, but we can add custom logic
-            # For now, just return False as bcrypt handles it
+            return self.hasher.needs_rehash(hashed_password)
+        except Exception:
             return False
-        except:
-            return False
\ No newline at end of file
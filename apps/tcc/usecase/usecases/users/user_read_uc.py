@@ -1,5 +1,6 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union
 from apps.core.core_exceptions.domain import DomainValidationException
+from apps.core.schemas.common.pagination import CursorPage
 from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
 from apps.tcc.usecase.domain_exception.u_exceptions import UserNotFoundException
 from apps.tcc.usecase.usecases.base.base_uc import BaseUseCase
@@ -127,7 +128,7 @@ class GetUserByEmailUseCase(BaseUseCase):
 
 
 class ListUsersUseCase(BaseUseCase):
-    """Get all users with pagination - Returns Tuple[List[UserEntity], int]"""
+    """Get all users with pagination - Returns Tuple[List[UserEntity], int] or CursorPage"""
     
     def __init__(self, user_repository: UserRepository, **dependencies):
         super().__init__(**dependencies)
@@ -138,17 +139,27 @@ class ListUsersUseCase(BaseUseCase):
         self.config.required_permissions = ['can_view_users']
         self.config.validate_input = True
 
-    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Tuple[List[UserEntity], int]:
-        """Get all users - Returns Tuple of UserEntities and total count"""
+    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Get all users - Returns Tuple of UserEntities and total count (a CursorPage in keyset mode)"""
         query_input = UserQueryInputSchema(**input_data)
         
         # Apply business rules to filters
-        filters = query_input.model_dump(exclude={'page', 'per_page', 'sort_by', 'sort_order'})
+        filters = query_input.model_dump(exclude={'page', 'per_page', 'cursor', 'sort_by', 'sort_order'})
         
         # Business rule: Non-admins can only see active users
         if not (hasattr(user, 'is_superuser') and user.is_superuser):
             filters['is_active'] = True
         
+        # Keyset mode: a CursorPage instead of (items, total)
+        if query_input.cursor is not None:
+            return CursorPage(*await self.user_repository.get_cursor_page(
+                filters=filters,
+                cursor=query_input.cursor or None,
+                per_page=query_input.per_page,
+                sort_by=query_input.sort_by,
+                sort_order=query_input.sort_order
+            ))
+        
         # Get paginated results from repository
         users, total_count = await self.user_repository.get_paginated(
             filters=filters,
@@ -160,7 +171,7 @@ class ListUsersUseCase(BaseUseCase):
 
 
 class GetUsersByRoleUseCase(BaseUseCase):
-    """Get users by role with pagination - Returns Tuple[List[UserEntity], int]"""
+    """Get users by role with pagination - Returns Tuple[List[UserEntity], int] or CursorPage"""
     
     def __init__(self, user_repository: UserRepository, **dependencies):
         super().__init__(**dependencies)
@@ -171,8 +182,8 @@ class GetUsersByRoleUseCase(BaseUseCase):
         self.config.required_permissions = ['can_view_users']
         self.config.validate_input = True
 
-    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Tuple[List[UserEntity], int]:
-        """Get users by role - Returns Tuple of UserEntities and total count"""
+    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Get users by role - Returns Tuple of UserEntities and total count (a CursorPage in keyset mode)"""
         role = input_data.get('role')
         page = input_data.get('page', 1)
         per_page = input_data.get('per_page', 20)
@@ -187,6 +198,15 @@ class GetUsersByRoleUseCase(BaseUseCase):
         if not (hasattr(user, 'is_superuser') and user.is_superuser):
             filters['is_active'] = True
         
+        # Keyset mode: a CursorPage instead of (items, total)
+        cursor = input_data.get('cursor')
+        if cursor is not None:
+            return CursorPage(*await self.user_repository.get_cursor_page(
+                filters=filters,
+                cursor=cursor or None,
+                per_page=per_page
+            ))
+        
         # Get paginated results from repository
         users, total_count = await self.user_repository.get_paginated(
             filters=filters,
@@ -198,7 +218,7 @@ class GetUsersByRoleUseCase(BaseUseCase):
 
 
 class SearchUsersUseCase(BaseUseCase):
-    """Search users - Returns Tuple[List[UserEntity], int]"""
+    """Search users - Returns Tuple[List[UserEntity], int] or CursorPage"""
     
     def __init__(self, user_repository: UserRepository, **dependencies):
         super().__init__(**dependencies)
@@ -209,10 +229,18 @@ class SearchUsersUseCase(BaseUseCase):
         self.config.required_permissions = ['can_view_users']
         self.config.validate_input = True
 
-    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Tuple[List[UserEntity], int]:
-        """Search users - Returns Tuple of UserEntities and total count"""
+    async def _on_execute(self, input_data: Dict[str, Any], user, ctx) -> Union[Tuple[List[UserEntity], int], CursorPage[UserEntity]]:
+        """Search users - Returns Tuple of UserEntities and total count (a CursorPage in keyset mode)"""
         search_input = UserSearchInputSchema(**input_data)
         
+        # Keyset mode: a CursorPage instead of (items, total)
+        if search_input.cursor is not None:
+            return CursorPage(*await self.user_repository.search_users_by_cursor(
+                search_input.search_term,
+                cursor=search_input.cursor or None,
+                per_page=search_input.per_page
+            ))
+        
         # Search using repository
         users, total_count = await self.user_repository.search_users(
             search_input.search_term,
@@ -1,6 +1,9 @@
 import asyncio
 from typing import Dict, Any
+from asgiref.sync import sync_to_async
 from apps.core.core_exceptions.domain import DomainException, DomainValidationException
+from apps.core.jwt.token_epochs import revoke_user_tokens
+from apps.tcc.models.base.enums import UserStatus
 from apps.tcc.usecase.repo.domain_repo.user_repo import UserRepository
 from apps.tcc.usecase.domain_exception.u_exceptions import UserNotFoundException
 from apps.tcc.usecase.usecases.base.base_uc import BaseUseCase
@@ -166,6 +169,10 @@ class ChangeUserStatusUseCase(BaseUseCase):
         if not updated_entity:
             raise DomainException("Failed to change user status")
         
+        # Business rule: a user who is no longer active loses every session at once
+        if new_status != UserStatus.ACTIVE:
+            await sync_to_async(revoke_user_tokens)(user_id)
+        
         # Async: Log status change
         if hasattr(self, 'notification_service') and self.notification_service:
             asyncio.create_task(
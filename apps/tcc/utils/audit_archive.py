@@ -0,0 +1,218 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.core.db.partitions import MonthlyPartitioner, Month, add_months, iter_months, month_of
+from apps.tcc.utils.audit_buffer import row_to_record
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATTERN = re.compile(r"^auditlog-(\d{4})-(\d{2})(?:\.(\d+))?\.jsonl\.gz$")
+
+
+def _audit_model():
+    from apps.tcc.models.base.auditlog import AuditLog
+    return AuditLog
+
+
+def archive_path(archive_dir: Path, month: Month, part: int = 0) -> Path:
+    suffix = f".{part}" if part else ""
+    return archive_dir / f"auditlog-{month[0]:04d}-{month[1]:02d}{suffix}.jsonl.gz"
+
+
+class AuditArchiver:
+    """
+    Moves old AuditLog months out of the database.
+
+    Each month is streamed in primary-key order to a gzipped JSONL file
+    (written under a temp name, fsync'd, then renamed) and only then removed:
+    with DROP PARTITION when the month has its own partition, otherwise with
+    batched primary-key range DELETEs. A month archived twice (e.g. after an
+    interrupted delete) gets a numbered part file; the reader de-duplicates.
+    """
+
+    def __init__(
+        self,
+        archive_dir: Optional[str] = None,
+        retention_months: Optional[int] = None,
+        batch_size: int = 5000,
+        partitioner: Optional[MonthlyPartitioner] = None
+    ):
+        self.archive_dir = Path(archive_dir or settings.AUDIT_LOG_ARCHIVE_DIR)
+        self.retention_months = (
+            retention_months if retention_months is not None
+            else getattr(settings, 'AUDIT_LOG_RETENTION_MONTHS', 6)
+        )
+        self.batch_size = batch_size
+        self.partitioner = partitioner or MonthlyPartitioner(_audit_model())
+
+    def cutoff_month(self, today: Optional[date] = None) -> Month:
+        """Oldest month that is kept; everything before it is archived"""
+        return add_months(month_of(today or date.today()), -self.retention_months)
+
+    def months_to_archive(self, today: Optional[date] = None) -> List[Month]:
+        oldest = self.partitioner.oldest_month()
+        if oldest is None:
+            return []
+        return list(iter_months(oldest, add_months(self.cutoff_month(today), -1)))
+
+    def run(self, today: Optional[date] = None, drop: bool = True) -> List[Dict[str, Any]]:
+        """Archive (and unless drop=False, remove) every month older than the retention window"""
+        return [self.archive_month(month, drop=drop) for month in self.months_to_archive(today)]
+
+    def archive_month(self, month: Month, drop: bool = True) -> Dict[str, Any]:
+        low, high = self.partitioner.month_bounds(month)
+        queryset = _audit_model()._base_manager.filter(pk__gte=low, pk__lt=high)
+
+        path, rows = self._export(month, queryset)
+        result = {'month': f"{month[0]:04d}-{month[1]:02d}", 'rows': rows, 'path': str(path) if path else None}
+
+        if drop and rows:
+            result['removed_by'] = self._remove(month, queryset, low)
+        logger.info(f"Archived audit month {result['month']}: {result}")
+        return result
+
+    # ============ EXPORT ============
+
+    def _export(self, month: Month, queryset):
+        model = queryset.model
+        columns = [field.attname for field in model._meta.concrete_fields]
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        part = 0
+        while archive_path(self.archive_dir, month, part).exists():
+            part += 1
+        path = archive_path(self.archive_dir, month, part)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+
+        rows = 0
+        with open(tmp_path, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as fh:
+                for values in queryset.order_by('pk').values_list(*columns).iterator(chunk_size=self.batch_size):
+                    fh.write(json.dumps(dict(zip(columns, values)), cls=DjangoJSONEncoder).encode('utf-8'))
+                    fh.write(b"\n")
+                    rows += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        if not rows:
+            tmp_path.unlink()
+            return None, 0
+
+        tmp_path.rename(path)
+        return path, rows
+
+    # ============ REMOVAL ============
+
+    def _remove(self, month: Month, queryset, low: int) -> str:
+        partitioner = self.partitioner
+        # The first partition also holds anything below its month - only drop it once that is gone
+        if (
+            partitioner.is_supported
+            and partitioner.has_partition(month)
+            and not partitioner.model._base_manager.filter(pk__lt=low).exists()
+        ):
+            partitioner.drop_partition(month)
+            return 'drop_partition'
+
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:self.batch_size])
+            if not pks:
+                break
+            # Raw range DELETE: nothing references audit rows, so skip the collector and per-row signals
+            queryset.filter(pk__lte=pks[-1])._raw_delete(queryset.db)
+        return 'delete'
+
+
+class AuditArchiveReader:
+    """
+    Query archived audit months without loading them back into the database.
+
+    Time bounds are matched against the Snowflake ID (when the entry was
+    written), so files outside [start, end) are never opened.
+    """
+
+    def __init__(self, archive_dir: Optional[str] = None):
+        self.archive_dir = Path(archive_dir or settings.AUDIT_LOG_ARCHIVE_DIR)
+        self.partitioner = MonthlyPartitioner(_audit_model())
+
+    def archived_months(self) -> List[Month]:
+        if not self.archive_dir.exists():
+            return []
+        months = set()
+        for path in self.archive_dir.iterdir():
+            match = ARCHIVE_PATTERN.match(path.name)
+            if match:
+                months.add((int(match.group(1)), int(match.group(2))))
+        return sorted(months)
+
+    def query(
+        self,
+        content_object=None,
+        content_type=None,
+        object_id: Optional[int] = None,
+        start=None,
+        end=None,
+        actions: Optional[List[str]] = None,
+        user_id: Optional[int] = None
+    ) -> Iterator:
+        """
+        Yield archived entries as unsaved AuditLog instances, oldest first.
+
+        Filter by `content_object` (any model instance) or by
+        `content_type` (ContentType, model class or id) and `object_id`,
+        by the [start, end) datetime range, by action and by user id.
+        """
+        if content_object is not None:
+            content_type = ContentType.objects.get_for_model(content_object)
+            object_id = content_object.pk
+        if content_type is not None and not isinstance(content_type, int):
+            if not isinstance(content_type, ContentType):
+                content_type = ContentType.objects.get_for_model(content_type)
+            content_type = content_type.pk
+
+        low = self.partitioner.key_floor(start) if start is not None else None
+        high = self.partitioner.key_floor(end) if end is not None else None
+        actions = set(actions) if actions else None
+
+        model = _audit_model()
+        for month in self.archived_months():
+            month_low, month_high = self.partitioner.month_bounds(month)
+            if (low is not None and month_high <= low) or (high is not None and month_low >= high):
+                continue
+
+            seen = set()
+            for row in self._read_month(month):
+                pk = row['id']
+                if (low is not None and pk < low) or (high is not None and pk >= high):
+                    continue
+                if object_id is not None and row['object_id'] != object_id:
+                    continue
+                if content_type is not None and row['content_type_id'] != content_type:
+                    continue
+                if actions is not None and row['action'] not in actions:
+                    continue
+                if user_id is not None and row['user_id'] != user_id:
+                    continue
+                if pk in seen:
+                    continue
+                seen.add(pk)
+                yield row_to_record(model, row)
+
+    def _read_month(self, month: Month) -> Iterator[Dict[str, Any]]:
+        part = 0
+        while archive_path(self.archive_dir, month, part).exists():
+            with gzip.open(archive_path(self.archive_dir, month, part), 'rt', encoding='utf-8') as fh:
+                for line in fh:
+                    if line.strip():
+                        yield json.loads(line)
+            part += 1
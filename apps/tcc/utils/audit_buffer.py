@@ -0,0 +1,332 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def record_to_row(record) -> Dict[str, Any]:
+    """Column values of an audit record by attname, ready for JSON encoding"""
+    return {field.attname: field.value_from_object(record) for field in record._meta.concrete_fields}
+
+
+def row_to_record(model, row: Dict[str, Any]):
+    """Rebuild an (unsaved) model instance from a row decoded from JSON"""
+    return model(**{
+        field.attname: field.to_python(row[field.attname])
+        for field in model._meta.concrete_fields
+        if field.attname in row
+    })
+
+
+class AuditDurability(str, Enum):
+    """What an audit record may suffer when it cannot be written right away"""
+    SYNC = "sync"                # INSERT inside the request, as before buffering existed
+    SPILL = "spill"              # overflow / DB failures go to fsync'd spill files, replayed later
+    BEST_EFFORT = "best_effort"  # overflow / DB failures are dropped and counted
+
+
+class BufferedAuditWriter:
+    """
+    Batches AuditLog rows in memory and writes them with bulk_create.
+
+    Records are queued once the surrounding transaction commits and are
+    flushed by a background thread when `batch_size` rows are waiting or
+    every `flush_interval` seconds, and once more at interpreter exit.
+    Buffered rows skip save()/full_clean and get their Snowflake IDs from one
+    block allocation per batch.
+    """
+
+    SPILL_PREFIX = "audit-"
+
+    def __init__(
+        self,
+        durability: AuditDurability = AuditDurability.SPILL,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        spill_dir: Optional[str] = None
+    ):
+        self.durability = AuditDurability(durability)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+        self._has_spill = False
+
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'spilled': 0,
+            'replayed': 0,
+            'flushes': 0,
+            'failures': 0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> 'BufferedAuditWriter':
+        """Build the writer configured by AUDIT_LOG_* settings"""
+        return cls(
+            durability=getattr(settings, 'AUDIT_LOG_DURABILITY', AuditDurability.SPILL),
+            batch_size=getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 200),
+            flush_interval=getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 1.0),
+            max_queue=getattr(settings, 'AUDIT_LOG_MAX_QUEUE', 10000),
+            spill_dir=getattr(settings, 'AUDIT_LOG_SPILL_DIR', None),
+        )
+
+    # ============ PUBLIC API ============
+
+    def write(self, **fields):
+        """
+        Record an audit entry; accepts the same fields as AuditLog.objects.create.
+
+        Returns the AuditLog instance - unsaved unless durability is 'sync'.
+        Entries written inside a transaction are only queued if it commits.
+        """
+        from apps.tcc.models.base.auditlog import AuditLog
+
+        if self.durability == AuditDurability.SYNC:
+            return AuditLog.objects.create(**fields)
+
+        record = AuditLog(id=None, **fields)
+        transaction.on_commit(lambda: self._enqueue(record))
+        return record
+
+    def flush(self) -> int:
+        """Write everything queued right now; returns the number of rows written"""
+        with self._flush_lock:
+            written, failed = 0, False
+
+            while True:
+                with self._lock:
+                    size = min(self.batch_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(size)]
+                if not batch:
+                    break
+                count = self._write_batch(batch)
+                written += count
+                failed = failed or count == 0
+
+            with self._lock:
+                self._stats['flushes'] += 1
+
+            if self._has_spill and not failed:
+                self.replay_spilled()
+
+            return written
+
+    def replay_spilled(self) -> int:
+        """Re-insert spilled records; files are claimed by rename so workers never replay twice"""
+        from apps.tcc.models.base.auditlog import AuditLog
+
+        if self.spill_dir is None or not self.spill_dir.exists():
+            self._has_spill = False
+            return 0
+
+        replayed = 0
+        for path in sorted(self.spill_dir.glob(f"{self.SPILL_PREFIX}*.jsonl")):
+            claimed = path.with_name(f"{path.name}.{os.getpid()}.replaying")
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue  # claimed by another worker
+
+            try:
+                records = [
+                    row_to_record(AuditLog, json.loads(line))
+                    for line in claimed.read_text(encoding='utf-8').splitlines()
+                    if line.strip()
+                ]
+                # ignore_conflicts: a batch may have been partially written before it spilled
+                AuditLog.objects.bulk_create(records, batch_size=self.batch_size, ignore_conflicts=True)
+            except Exception as e:
+                claimed.rename(path)
+                logger.warning(f"Audit spill replay deferred for {path.name}: {e}")
+                break
+
+            claimed.unlink()
+            replayed += len(records)
+        else:
+            self._has_spill = False
+
+        if replayed:
+            with self._lock:
+                self._stats['replayed'] += replayed
+            logger.info(f"Replayed {replayed} spilled audit records")
+        return replayed
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the background flusher and write whatever is still queued"""
+        self._stop.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self._atexit_registered:
+            atexit.unregister(self.shutdown)
+            self._atexit_registered = False
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for monitoring: queue depth, writes, drops, spills"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._queue)
+        stats['durability'] = self.durability.value
+        stats['flusher_alive'] = bool(self._thread and self._thread.is_alive())
+        return stats
+
+    # ============ QUEUE ============
+
+    def _enqueue(self, record) -> None:
+        self._ensure_flusher()
+
+        with self._lock:
+            accepted = len(self._queue) < self.max_queue
+            if accepted:
+                self._queue.append(record)
+                self._stats['enqueued'] += 1
+                full = len(self._queue) >= self.batch_size
+
+        if not accepted:
+            self._overflow([record], reason="queue full")
+        elif full:
+            self._wakeup.set()
+
+    def _ensure_flusher(self) -> None:
+        """Start the flusher lazily - and again in a forked worker, which inherits no threads"""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='audit-log-flusher', daemon=True)
+            self._thread.start()
+
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+            if self.spill_dir is not None and self.spill_dir.exists():
+                self._has_spill = any(self.spill_dir.glob(f"{self.SPILL_PREFIX}*.jsonl"))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.error(f"Audit flusher iteration failed: {e}", exc_info=True)
+        connections.close_all()
+
+    # ============ WRITING ============
+
+    def _write_batch(self, batch: List) -> int:
+        from apps.tcc.models.base.auditlog import AuditLog
+
+        try:
+            self._assign_ids(batch)
+            AuditLog.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception as e:
+            with self._lock:
+                self._stats['failures'] += 1
+            logger.error(f"Audit batch of {len(batch)} records failed: {e}")
+            self._overflow(batch, reason=str(e))
+            return 0
+
+        with self._lock:
+            self._stats['written'] += len(batch)
+        return len(batch)
+
+    def _overflow(self, records: List, reason: str) -> None:
+        if self.durability == AuditDurability.SPILL and self.spill_dir is not None:
+            self._spill(records)
+            return
+
+        with self._lock:
+            self._stats['dropped'] += len(records)
+        logger.warning(f"Dropped {len(records)} audit records ({reason})")
+
+    def _spill(self, records: List) -> None:
+        """Append records to a new spill file; written under a temp name and renamed once fsync'd"""
+        try:
+            self._assign_ids(records)
+            lines = [json.dumps(record_to_row(record), cls=DjangoJSONEncoder) for record in records]
+
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{self.SPILL_PREFIX}{os.getpid()}-{time.time_ns()}.jsonl"
+            tmp_path = self.spill_dir / f"{name}.tmp"
+
+            with self._spill_lock:
+                with open(tmp_path, 'w', encoding='utf-8') as fh:
+                    fh.write('\n'.join(lines) + '\n')
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                tmp_path.rename(self.spill_dir / name)
+        except Exception as e:
+            with self._lock:
+                self._stats['dropped'] += len(records)
+            logger.critical(f"Audit spill failed, {len(records)} records lost: {e}")
+            return
+
+        self._has_spill = True
+        with self._lock:
+            self._stats['spilled'] += len(records)
+
+    @staticmethod
+    def _assign_ids(records: List) -> None:
+        from apps.tcc.utils.snowflake import allocate_snowflake_id_block
+
+        missing = [record for record in records if record.pk is None]
+        if missing:
+            for record, snowflake_id in zip(missing, allocate_snowflake_id_block(len(missing))):
+                record.pk = snowflake_id
+
+
+# ------------ Singleton Functions ------------ #
+
+_audit_writer = None
+
+
+def get_audit_writer() -> BufferedAuditWriter:
+    """Get or create the process-wide audit writer."""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = BufferedAuditWriter.from_settings()
+    return _audit_writer
+
+
+def write_audit_log(**fields):
+    return get_audit_writer().write(**fields)
+
+
+def flush_audit_log() -> int:
+    return get_audit_writer().flush()
@@ -13,7 +13,7 @@ class AuditLogger:
         """
         Log user actions to the audit system
         """
-        from apps.tcc.models.base.auditlog import AuditLog
+        from apps.tcc.utils.audit_buffer import write_audit_log
         
         if not user or not user.is_authenticated:
             return None
@@ -30,7 +30,8 @@ class AuditLogger:
             # This would require storing the previous state, which we can do via signals
             after_state = model_instance.to_dict(include_meta=True)
         
-        audit_log = AuditLog.objects.create(
+        # Buffered: returns the (possibly not yet written) entry
+        audit_log = write_audit_log(
             content_object=model_instance,
             action=action,
             user=user,
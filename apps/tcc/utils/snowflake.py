@@ -1,9 +1,11 @@
+import datetime
+import os
 import time
 import threading
 import logging
+from array import array
 from django.conf import settings
 from django.core.cache import cache
-from asgiref.local import Local
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,11 @@ try:
 except Exception:
     get_redis_connection = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class SnowflakeException(Exception):
     """Custom exception for Snowflake generator errors"""
@@ -23,6 +30,11 @@ class ClockDriftException(SnowflakeException):
     pass
 
 
+def _setting(name, default):
+    """Read a setting without requiring configured settings (plain unit tests)."""
+    return getattr(settings, name, default) if settings.configured else default
+
+
 class DjangoSnowflakeGenerator:
     """
     Distributed Snowflake ID generator for Django.
@@ -32,6 +44,18 @@ class DjangoSnowflakeGenerator:
     - 5 bits datacenter ID
     - 5 bits machine ID
     - 12 bits sequence
+
+    Sequence modes (SNOWFLAKE_SEQUENCE_MODE):
+    - "reserved": processes sharing a (datacenter, machine) pair reserve
+      sequence ranges per millisecond from the cache, `reserve_size` numbers
+      per INCRBY; IDs are then handed out locally until the range or the
+      millisecond runs out.
+    - "local": the process owns its (datacenter, machine) pair (see
+      snowflake_lease) and sequences without any network call. With a lease
+      attached (set_worker(..., lease=)), every local reservation first
+      checks lease.is_valid(); once the lease is inside its expiry margin
+      the generator moves to the static pair in reserved mode, and back
+      when the lease is renewed.
     """
 
     # bit allocation
@@ -50,38 +74,101 @@ class DjangoSnowflakeGenerator:
     DATACENTER_SHIFT = SEQUENCE_BITS + MACHINE_BITS
     MACHINE_SHIFT = SEQUENCE_BITS
 
-    def __init__(self):
-        """Initialize generator using Django settings."""
-        self.datacenter_id = getattr(settings, "SNOWFLAKE_DATACENTER_ID", 1)
-        self.machine_id = getattr(settings, "SNOWFLAKE_MACHINE_ID", 1)
-        self.epoch = getattr(settings, "SNOWFLAKE_EPOCH", 1672531200000)  # Jan 1, 2023
+    MODE_RESERVED = "reserved"
+    MODE_LOCAL = "local"
+
+    def __init__(
+        self,
+        datacenter_id: int = None,
+        machine_id: int = None,
+        epoch: int = None,
+        sequence_mode: str = None,
+        reserve_size: int = None
+    ):
+        """Initialize generator; arguments default to the SNOWFLAKE_* settings."""
+        self.datacenter_id = datacenter_id if datacenter_id is not None else _setting("SNOWFLAKE_DATACENTER_ID", 1)
+        self.machine_id = machine_id if machine_id is not None else _setting("SNOWFLAKE_MACHINE_ID", 1)
+        self.epoch = epoch if epoch is not None else _setting("SNOWFLAKE_EPOCH", 1672531200000)  # Jan 1, 2023
+        self.sequence_mode = sequence_mode or _setting("SNOWFLAKE_SEQUENCE_MODE", self.MODE_RESERVED)
+        self.reserve_size = reserve_size or _setting("SNOWFLAKE_RESERVE_SIZE", 64)
 
         # validate IDs
         if not (0 <= self.datacenter_id <= self.MAX_DATACENTER_ID):
             raise ValueError(f"Datacenter ID must be between 0 and {self.MAX_DATACENTER_ID}")
         if not (0 <= self.machine_id <= self.MAX_MACHINE_ID):
             raise ValueError(f"Machine ID must be between 0 and {self.MAX_MACHINE_ID}")
+        if self.sequence_mode not in (self.MODE_RESERVED, self.MODE_LOCAL):
+            raise ValueError(f"Unknown sequence mode: {self.sequence_mode}")
+        if not (1 <= self.reserve_size <= self.MAX_SEQUENCE + 1):
+            raise ValueError(f"Reserve size must be between 1 and {self.MAX_SEQUENCE + 1}")
+
+        # process-wide state, guarded by the lock
+        self._lock = threading.Lock()
+        self._last_timestamp = -1
+        self._next_sequence = 0      # next number of the range reserved for _last_timestamp
+        self._sequence_limit = -1    # last number of that range (-1: nothing reserved)
+        self._local_timestamp = -1   # local counter, used in local mode and as fallback
+        self._local_next = 0
+        self._redis = None
+        self._redis_checked = False
+        self._lease = None
+        # shared pair used (in reserved mode) whenever the lease cannot be trusted
+        self._static_worker = (self.datacenter_id, self.machine_id)
 
-        # thread-local variables
-        self._local = Local()
-        self._lock = threading.RLock()
-
-        # corrected cache key prefix
         self._cache_key_prefix = f"snowflake_{self.datacenter_id}_{self.machine_id}_seq"
 
         logger.info(
-            "DjangoSnowflake initialized datacenter=%s machine=%s epoch=%s",
+            "DjangoSnowflake initialized datacenter=%s machine=%s epoch=%s mode=%s",
             self.datacenter_id,
             self.machine_id,
             self.epoch,
+            self.sequence_mode,
         )
 
-    def _init_local(self):
-        """Prepare thread-local defaults."""
-        if not hasattr(self._local, "sequence"):
-            self._local.sequence = 0
-        if not hasattr(self._local, "last_timestamp"):
-            self._local.last_timestamp = -1
+    def set_worker(self, datacenter_id: int, machine_id: int, sequence_mode: str, lease=None) -> None:
+        """
+        Switch to another (datacenter, machine) pair, e.g. when a worker lease is gained or lost.
+
+        `lease` (a snowflake_lease.WorkerLease) guards local mode: its pair is
+        only used while lease.is_valid().
+        """
+        with self._lock:
+            self._lease = lease
+            self._switch_worker(datacenter_id, machine_id, sequence_mode)
+
+    def _switch_worker(self, datacenter_id: int, machine_id: int, sequence_mode: str) -> None:
+        # caller holds self._lock
+        self.datacenter_id = datacenter_id
+        self.machine_id = machine_id
+        self.sequence_mode = sequence_mode
+        self._cache_key_prefix = f"snowflake_{datacenter_id}_{machine_id}_seq"
+        # ranges belong to the old pair; the clock check still spans the switch
+        self._sequence_limit = -1
+        self._local_timestamp = -1
+        self._local_next = 0
+
+        logger.info(
+            "DjangoSnowflake worker changed datacenter=%s machine=%s mode=%s",
+            datacenter_id,
+            machine_id,
+            sequence_mode,
+        )
+
+    def _follow_lease(self) -> None:
+        """Use the leased pair only while the lease is valid; caller holds self._lock"""
+        lease = self._lease
+        if lease is None:
+            return
+        if lease.is_valid():
+            if self.sequence_mode != self.MODE_LOCAL:
+                self._switch_worker(lease.datacenter_id, lease.machine_id, self.MODE_LOCAL)
+        elif self.sequence_mode == self.MODE_LOCAL:
+            logger.warning(
+                "Snowflake lease %s/%s unconfirmed near expiry; using the shared pair",
+                lease.datacenter_id,
+                lease.machine_id,
+            )
+            self._switch_worker(*self._static_worker, self.MODE_RESERVED)
 
     def _current_timestamp(self) -> int:
         """Get current timestamp in ms relative to epoch."""
@@ -104,79 +191,183 @@ class DjangoSnowflakeGenerator:
         return timestamp
 
     def _get_redis_client(self):
-        """Return a direct Redis client if available."""
-        if get_redis_connection:
-            try:
-                return get_redis_connection("default")
-            except Exception as e:
-                logger.warning("Could not get Redis connection: %s", e)
-        return None
-
-    def _get_distributed_sequence(self, timestamp: int) -> int:
+        """Return a direct Redis client if the default cache is django-redis (checked once)."""
+        if not self._redis_checked:
+            self._redis_checked = True
+            if get_redis_connection:
+                try:
+                    self._redis = get_redis_connection("default")
+                except Exception as e:
+                    logger.info("Snowflake sequences use the Django cache API: %s", e)
+        return self._redis
+
+    def _check_clock(self, timestamp: int) -> None:
+        if timestamp < self._last_timestamp:
+            drift_ms = self._last_timestamp - timestamp
+            logger.error(f"Clock drift: {drift_ms}ms")
+            raise ClockDriftException(
+                f"Clock moved backwards by {drift_ms}ms"
+            )
+
+    def _compose(self, timestamp: int, sequence: int) -> int:
+        return (
+            (timestamp << self.TIMESTAMP_SHIFT)
+            | (self.datacenter_id << self.DATACENTER_SHIFT)
+            | (self.machine_id << self.MACHINE_SHIFT)
+            | sequence
+        )
+
+    def generate_id(self) -> int:
+        """Generate a new 64-bit Snowflake ID; no network call unless a new range is needed."""
+        with self._lock:
+            timestamp = self._current_timestamp()
+            self._check_clock(timestamp)
+
+            if timestamp != self._last_timestamp:
+                self._last_timestamp = timestamp
+                self._sequence_limit = -1
+
+            if self._sequence_limit < 0 or self._next_sequence > self._sequence_limit:
+                reserved = self._reserve_sequence_range(timestamp, self.reserve_size)
+                while reserved is None:
+                    # this millisecond is used up everywhere - move to the next one
+                    timestamp = self._wait_for_next_millis(timestamp)
+                    self._last_timestamp = timestamp
+                    reserved = self._reserve_sequence_range(timestamp, self.reserve_size)
+                self._next_sequence, self._sequence_limit = reserved
+
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            return self._compose(timestamp, sequence)
+
+    def batch_generate_ids(self, count: int) -> list:
+        """Generate multiple IDs in a batch."""
+        if not 1 <= count <= 1000:
+            raise ValueError("Count must be between 1 and 1000")
+
+        return self.allocate_block(count)
+
+    def allocate_block(self, count: int) -> list:
         """
-        Distributed sequence using Redis for uniqueness across instances.
+        Allocate `count` IDs with one sequence reservation per millisecond.
+
+        Each millisecond window hands out up to MAX_SEQUENCE IDs from a single
+        INCRBY of the number still needed, so a 100k batch costs a few dozen
+        cache round trips instead of one per ID. IDs are ascending.
         """
-        # FIXED: use correct prefix
-        cache_key = f"{self._cache_key_prefix}_{timestamp}"
+        ids = []
+        for first, last in self._reserve_id_ranges(count):
+            ids.extend(range(first, last + 1))
+        return ids
 
-        try:
-            sequence = cache.incr(cache_key)
+    def allocate_array(self, count: int, as_numpy: bool = False):
+        """
+        Allocate `count` IDs as a packed `array('q')`, or an int64 NumPy array.
 
-            if sequence > self.MAX_SEQUENCE:
-                cache.delete(cache_key)
-                sequence = cache.incr(cache_key)
+        Same reservations as allocate_block, but the IDs are written straight
+        into a typed buffer - no list of Python ints - which is what bulk
+        imports and columnar code want.
+        """
+        ranges = self._reserve_id_ranges(count)
+        if as_numpy:
+            if np is None:
+                raise ImportError("numpy is required for as_numpy=True")
+            return np.concatenate([np.arange(first, last + 1, dtype=np.int64) for first, last in ranges])
 
-            cache.expire(cache_key, 1)
-            return sequence
+        ids = array('q')
+        for first, last in ranges:
+            ids.extend(range(first, last + 1))
+        return ids
 
-        except Exception as e:
-            logger.warning(f"Redis sequence failed, using local fallback: {e}")
-            self._local.sequence = (self._local.sequence + 1) & self.MAX_SEQUENCE
-            return self._local.sequence
+    def _reserve_id_ranges(self, count: int) -> list:
+        """Reserve `count` IDs as ascending (first_id, last_id) runs, one run per millisecond window."""
+        if count < 1:
+            raise ValueError("Count must be positive")
 
-    def generate_id(self) -> int:
-        """Generate a new 64-bit Snowflake ID."""
-        self._init_local()
+        ranges = []
+        remaining = count
 
         with self._lock:
             timestamp = self._current_timestamp()
+            self._check_clock(timestamp)
 
-            # clock moved backwards
-            if timestamp < self._local.last_timestamp:
-                drift_ms = self._local.last_timestamp - timestamp
-                logger.error(f"Clock drift: {drift_ms}ms")
-                raise ClockDriftException(
-                    f"Clock moved backwards by {drift_ms}ms"
-                )
+            while True:
+                if timestamp != self._last_timestamp:
+                    self._last_timestamp = timestamp
+                    self._sequence_limit = -1
 
-            # same millisecond
-            if timestamp == self._local.last_timestamp:
-                sequence = self._get_distributed_sequence(timestamp)
+                reserved = self._reserve_sequence_range(timestamp, remaining)
+                if reserved:
+                    first, last = reserved
+                    base = self._compose(timestamp, 0)
+                    # sequence occupies the low bits, so a range of IDs is a range of ints
+                    ranges.append((base + first, base + last))
+                    remaining -= last - first + 1
 
-                if sequence == 0:
-                    timestamp = self._wait_for_next_millis(self._local.last_timestamp)
-                    sequence = self._get_distributed_sequence(timestamp)
+                if remaining <= 0:
+                    return ranges
 
-            else:
-                sequence = self._get_distributed_sequence(timestamp)
+                timestamp = self._wait_for_next_millis(timestamp)
 
-            self._local.last_timestamp = timestamp
+    def _reserve_sequence_range(self, timestamp: int, wanted: int):
+        """
+        Reserve up to `wanted` sequence numbers in one millisecond window.
 
-            snowflake_id = (
-                (timestamp << self.TIMESTAMP_SHIFT)
-                | (self.datacenter_id << self.DATACENTER_SHIFT)
-                | (self.machine_id << self.MACHINE_SHIFT)
-                | sequence
-            )
+        Reserved mode takes them from the per-millisecond counter shared by all
+        processes with this (datacenter, machine) pair - one INCRBY+PEXPIRE
+        pipeline with django-redis. Returns (first, last) or None when the
+        window is exhausted.
+        """
+        self._follow_lease()
+        if self.sequence_mode == self.MODE_LOCAL:
+            return self._reserve_local(timestamp, wanted)
 
-            return snowflake_id
+        cache_key = f"{self._cache_key_prefix}_{timestamp}"
 
-    def batch_generate_ids(self, count: int) -> list:
-        """Generate multiple IDs in a batch."""
-        if not 1 <= count <= 1000:
-            raise ValueError("Count must be between 1 and 1000")
+        try:
+            client = self._get_redis_client()
+            if client is not None:
+                key = cache.make_key(cache_key)
+                pipe = client.pipeline(transaction=False)
+                pipe.incrby(key, wanted)
+                pipe.pexpire(key, 1000)
+                end = pipe.execute()[0]
+            else:
+                cache.add(cache_key, 0, 1)
+                end = cache.incr(cache_key, wanted)
+        except Exception as e:
+            logger.warning(f"Redis sequence reservation failed, using local fallback: {e}")
+            return self._reserve_local(timestamp, wanted)
+
+        start = end - wanted + 1
+        if start > self.MAX_SEQUENCE:
+            return None
+        return start, min(end, self.MAX_SEQUENCE)
+
+    def _reserve_local(self, timestamp: int, wanted: int):
+        """Process-local sequence range; unique only if this process owns its machine ID."""
+        if timestamp != self._local_timestamp:
+            self._local_timestamp = timestamp
+            self._local_next = 0
+
+        start = self._local_next
+        if start > self.MAX_SEQUENCE:
+            return None
+        end = min(start + wanted - 1, self.MAX_SEQUENCE)
+        self._local_next = end + 1
+        return start, end
+
+    def id_floor(self, when) -> int:
+        """
+        Smallest ID that can be generated at or after `when` (an aware or UTC datetime).
 
-        return [self.generate_id() for _ in range(count)]
+        IDs grow with time, so `floor(a) <= id < floor(b)` selects rows written
+        in [a, b) with a primary-key range scan.
+        """
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        timestamp = int(when.timestamp() * 1000) - int(self.epoch)
+        return max(timestamp, 0) << self.TIMESTAMP_SHIFT
 
     def decompose_id(self, snowflake_id: int) -> dict:
         """Break a Snowflake ID into readable parts."""
@@ -201,20 +392,108 @@ class DjangoSnowflakeGenerator:
             "snowflake_id": snowflake_id,
         }
 
+    def decompose_ids(self, ids, as_numpy: bool = None) -> dict:
+        """
+        Break many IDs into columns: timestamp (ms since epoch), unix_ms,
+        datacenter_id, machine_id, worker_id and sequence.
+
+        With NumPy (the default for ndarray input) each column is one vectorized
+        shift/mask over an int64 array; otherwise columns are `array('q')`.
+        Either way no per-ID dicts or strings are built.
+        """
+        if as_numpy is None:
+            as_numpy = np is not None and isinstance(ids, np.ndarray)
+
+        if as_numpy:
+            if np is None:
+                raise ImportError("numpy is required for as_numpy=True")
+            ids = np.asarray(ids, dtype=np.int64)
+            timestamp = ids >> self.TIMESTAMP_SHIFT
+            datacenter_id = (ids >> self.DATACENTER_SHIFT) & self.MAX_DATACENTER_ID
+            machine_id = (ids >> self.MACHINE_SHIFT) & self.MAX_MACHINE_ID
+            return {
+                "timestamp": timestamp,
+                "unix_ms": timestamp + int(self.epoch),
+                "datacenter_id": datacenter_id,
+                "machine_id": machine_id,
+                "worker_id": (datacenter_id << self.MACHINE_BITS) | machine_id,
+                "sequence": ids & self.MAX_SEQUENCE,
+            }
+
+        if not isinstance(ids, array):
+            ids = array('q', ids)
+        epoch = int(self.epoch)
+        worker_mask = (1 << (self.DATACENTER_BITS + self.MACHINE_BITS)) - 1
+        timestamp = array('q', [i >> self.TIMESTAMP_SHIFT for i in ids])
+        return {
+            "timestamp": timestamp,
+            "unix_ms": array('q', [t + epoch for t in timestamp]),
+            "datacenter_id": array('q', [(i >> self.DATACENTER_SHIFT) & self.MAX_DATACENTER_ID for i in ids]),
+            "machine_id": array('q', [(i >> self.MACHINE_SHIFT) & self.MAX_MACHINE_ID for i in ids]),
+            "worker_id": array('q', [(i >> self.MACHINE_SHIFT) & worker_mask for i in ids]),
+            "sequence": array('q', [i & self.MAX_SEQUENCE for i in ids]),
+        }
+
 
 # ------------ Singleton Functions ------------ #
 
 _snowflake_instance = None
+_snowflake_lease = None
+_singleton_lock = threading.Lock()
+
+
+def _apply_lease(lease) -> None:
+    """Lease callback: sequence locally on a leased pair, else share the static pair through the cache."""
+    generator = _snowflake_instance
+    if generator is None:
+        return
+    if lease is not None:
+        generator.set_worker(lease.datacenter_id, lease.machine_id, DjangoSnowflakeGenerator.MODE_LOCAL, lease=lease)
+    else:
+        generator.set_worker(
+            _setting("SNOWFLAKE_DATACENTER_ID", 1),
+            _setting("SNOWFLAKE_MACHINE_ID", 1),
+            DjangoSnowflakeGenerator.MODE_RESERVED
+        )
 
 
 def get_snowflake_generator():
-    """Get or create singleton handler."""
-    global _snowflake_instance
+    """
+    Get or create singleton handler.
+
+    With SNOWFLAKE_LEASE_BACKEND set, the process leases a machine ID on first
+    use and generates IDs without network calls; without a lease it falls back
+    to the configured SNOWFLAKE_MACHINE_ID in reserved mode.
+    """
+    global _snowflake_instance, _snowflake_lease
     if _snowflake_instance is None:
-        _snowflake_instance = DjangoSnowflakeGenerator()
+        with _singleton_lock:
+            if _snowflake_instance is None:
+                generator = DjangoSnowflakeGenerator()
+                if _setting("SNOWFLAKE_LEASE_BACKEND", "none") != "none":
+                    from apps.tcc.utils.snowflake_lease import start_worker_lease
+
+                    _snowflake_instance = generator
+                    _snowflake_lease = start_worker_lease(_apply_lease)
+                    if _snowflake_lease is None or _snowflake_lease.lease is None:
+                        logger.warning("No Snowflake worker lease; using the configured machine ID")
+                        _apply_lease(None)
+                _snowflake_instance = generator
     return _snowflake_instance
 
 
+def _reset_after_fork() -> None:
+    # the parent still holds its lease; the child leases its own on first use
+    global _snowflake_instance, _snowflake_lease, _singleton_lock
+    _snowflake_instance = None
+    _snowflake_lease = None
+    _singleton_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def generate_snowflake_id():
     return get_snowflake_generator().generate_id()
 
@@ -223,5 +502,41 @@ def batch_generate_snowflake_ids(count: int):
     return get_snowflake_generator().batch_generate_ids(count)
 
 
+def allocate_snowflake_id_block(count: int):
+    return get_snowflake_generator().allocate_block(count)
+
+
+def allocate_snowflake_id_array(count: int, as_numpy: bool = False):
+    return get_snowflake_generator().allocate_array(count, as_numpy=as_numpy)
+
+
 def decompose_snowflake_id(snowflake_id: int):
     return get_snowflake_generator().decompose_id(snowflake_id)
+
+
+def decompose_snowflake_ids(ids, as_numpy: bool = None) -> dict:
+    return get_snowflake_generator().decompose_ids(ids, as_numpy=as_numpy)
+
+
+def snowflake_id_floor(when) -> int:
+    return get_snowflake_generator().id_floor(when)
+
+
+def snowflake_range_lookup(start=None, end=None) -> dict:
+    """
+    Primary-key lookups selecting rows whose IDs were generated in [start, end).
+
+    `queryset.filter(**snowflake_range_lookup(a, b))` is a range scan on the
+    clustered key instead of a secondary-index lookup on a timestamp column.
+    Either bound may be None.
+    """
+    lookup = {}
+    if start is not None:
+        lookup['pk__gte'] = snowflake_id_floor(start)
+    if end is not None:
+        lookup['pk__lt'] = snowflake_id_floor(end)
+    return lookup
+
+
+# Older name, kept for callers that construct generators directly
+SnowflakeGenerator = DjangoSnowflakeGenerator
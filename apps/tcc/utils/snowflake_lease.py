@@ -0,0 +1,315 @@
+import atexit
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as CallTimeout
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MACHINES_PER_DATACENTER = 32
+
+
+class WorkerLease:
+    """
+    A (datacenter, machine) slot held by this process until `expires_at`
+    (monotonic seconds, counted from before the registry call that set it, so
+    it never outlasts the registry's own expiry).
+
+    IDs may only be sequenced locally while is_valid(): `margin` seconds
+    before expiry the generator stops using the slot, whether or not the
+    heartbeat has noticed anything.
+    """
+
+    def __init__(
+        self,
+        datacenter_id: int,
+        machine_id: int,
+        token: str,
+        ttl: float,
+        margin: Optional[float] = None,
+        granted_at: Optional[float] = None
+    ):
+        self.datacenter_id = datacenter_id
+        self.machine_id = machine_id
+        self.token = token
+        self.ttl = ttl
+        self.margin = ttl / 3 if margin is None else margin
+        self.expires_at = (time.monotonic() if granted_at is None else granted_at) + ttl
+
+    @property
+    def worker_id(self) -> int:
+        return self.datacenter_id * MACHINES_PER_DATACENTER + self.machine_id
+
+    def is_valid(self) -> bool:
+        """True while the slot is held for at least another `margin` seconds"""
+        return time.monotonic() < self.expires_at - self.margin
+
+    def __repr__(self):
+        return f"<WorkerLease {self.datacenter_id}/{self.machine_id}>"
+
+
+class RedisLeaseRegistry:
+    """Slots are keys set with NX and a TTL; renew and release check the owner token atomically"""
+
+    KEY = "snowflake:lease:{datacenter}:{machine}"
+
+    RENEW_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, client=None):
+        if client is None:
+            from django_redis import get_redis_connection
+            client = get_redis_connection("default")
+        self.client = client
+
+    def _key(self, datacenter_id: int, machine_id: int) -> str:
+        return self.KEY.format(datacenter=datacenter_id, machine=machine_id)
+
+    def try_acquire(self, datacenter_id: int, machine_id: int, token: str, ttl: float) -> bool:
+        return bool(self.client.set(self._key(datacenter_id, machine_id), token, nx=True, px=int(ttl * 1000)))
+
+    def renew(self, lease: WorkerLease) -> bool:
+        key = self._key(lease.datacenter_id, lease.machine_id)
+        return bool(self.client.eval(self.RENEW_SCRIPT, 1, key, lease.token, int(lease.ttl * 1000)))
+
+    def release(self, lease: WorkerLease) -> None:
+        self.client.eval(self.RELEASE_SCRIPT, 1, self._key(lease.datacenter_id, lease.machine_id), lease.token)
+
+
+class DatabaseLeaseRegistry:
+    """
+    Slots are SnowflakeWorkerLease rows; an expired row is taken over with a
+    conditional UPDATE, a never-used slot with an INSERT on its primary key.
+    Expiry uses the app servers' clocks, so keep the TTL well above their skew.
+    """
+
+    def _model(self):
+        from apps.tcc.models.base.worker_lease import SnowflakeWorkerLease
+        return SnowflakeWorkerLease
+
+    def try_acquire(self, datacenter_id: int, machine_id: int, token: str, ttl: float) -> bool:
+        model = self._model()
+        now = timezone.now()
+        values = {
+            'owner': token,
+            'hostname': socket.gethostname()[:255],
+            'pid': os.getpid(),
+            'acquired_at': now,
+            'expires_at': now + timedelta(seconds=ttl),
+        }
+        worker_id = datacenter_id * MACHINES_PER_DATACENTER + machine_id
+
+        if model.objects.filter(worker_id=worker_id, expires_at__lt=now).update(**values):
+            return True
+        try:
+            with transaction.atomic():
+                model.objects.create(worker_id=worker_id, datacenter_id=datacenter_id, machine_id=machine_id, **values)
+            return True
+        except IntegrityError:
+            return False
+
+    def renew(self, lease: WorkerLease) -> bool:
+        expires_at = timezone.now() + timedelta(seconds=lease.ttl)
+        return bool(
+            self._model().objects.filter(worker_id=lease.worker_id, owner=lease.token).update(expires_at=expires_at)
+        )
+
+    def release(self, lease: WorkerLease) -> None:
+        self._model().objects.filter(worker_id=lease.worker_id, owner=lease.token).delete()
+
+
+class WorkerLeaseManager:
+    """
+    Holds one machine-ID lease for this process and keeps it alive.
+
+    Registry calls run off the caller's thread: their own DB connection
+    keeps lease rows out of the caller's transaction, and acquisition works
+    from async code. The heartbeat renews every ttl/3. Each registry call is
+    abandoned after `call_timeout` (default ttl/6, well inside the lease
+    margin of ttl/3), so a hung Redis socket or DB lock wait cannot stall
+    it. The generator checks WorkerLease.is_valid() itself before every
+    local reservation, so a renewal that fails or hangs stops local
+    sequencing `margin` seconds before another process can take the slot.
+    If the lease is lost, `on_change` gets the replacement or None.
+    `exclude_machine_id` is never leased: it is the static fallback pair
+    shared through the cache.
+    """
+
+    def __init__(
+        self,
+        registry,
+        datacenter_id: int,
+        ttl: float = 30.0,
+        on_change: Optional[Callable[[Optional[WorkerLease]], None]] = None,
+        exclude_machine_id: Optional[int] = None,
+        call_timeout: Optional[float] = None
+    ):
+        self.registry = registry
+        self.datacenter_id = datacenter_id
+        self.ttl = ttl
+        self.call_timeout = ttl / 6 if call_timeout is None else call_timeout
+        self.exclude_machine_id = exclude_machine_id
+        self.on_change = on_change
+        self.lease: Optional[WorkerLease] = None
+
+        self._token = uuid.uuid4().hex
+        self._acquired = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def start(self, timeout: float = 5.0) -> Optional[WorkerLease]:
+        """Acquire a lease on the heartbeat thread; returns it, or None if none was available in time"""
+        self._thread = threading.Thread(target=self._run, name='snowflake-lease', daemon=True)
+        self._thread.start()
+        self._acquired.wait(timeout)
+        return self.lease
+
+    def stop(self) -> None:
+        """Stop heartbeats and give the slot back"""
+        self._stop.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(self.ttl)
+
+    # ============ HEARTBEAT THREAD ============
+
+    def _run(self) -> None:
+        try:
+            self._set_lease(self._acquire())
+            self._acquired.set()
+
+            while not self._stop.wait(self.ttl / 3):
+                close_old_connections()
+                self._heartbeat()
+
+            if self.lease is not None:
+                # stop sequencing locally before the slot can go to someone else
+                lease = self.lease
+                self._set_lease(None)
+                self._call(self.registry.release, lease)
+        except Exception as e:
+            logger.error(f"Snowflake lease thread failed: {e}", exc_info=True)
+            self._set_lease(None)
+        finally:
+            self._acquired.set()
+            if self._executor is not None:
+                self._executor.submit(connections.close_all)
+                self._executor.shutdown(wait=False)
+
+    def _call(self, func, *args):
+        """Run a registry call with a deadline; a call still running after it is abandoned"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snowflake-lease-call')
+        future = self._executor.submit(self._run_call, func, *args)
+        try:
+            return future.result(timeout=self.call_timeout)
+        except CallTimeout:
+            future.cancel()
+            raise TimeoutError(f"lease registry call exceeded {self.call_timeout:.2f}s")
+
+    @staticmethod
+    def _run_call(func, *args):
+        close_old_connections()
+        return func(*args)
+
+    def _acquire(self) -> Optional[WorkerLease]:
+        # Random start spreads simultaneous starters over the slots
+        offset = random.randrange(MACHINES_PER_DATACENTER)
+        for step in range(MACHINES_PER_DATACENTER):
+            machine_id = (offset + step) % MACHINES_PER_DATACENTER
+            if machine_id == self.exclude_machine_id:
+                continue
+            started = time.monotonic()
+            try:
+                if self._call(self.registry.try_acquire, self.datacenter_id, machine_id, self._token, self.ttl):
+                    lease = WorkerLease(self.datacenter_id, machine_id, self._token, self.ttl, granted_at=started)
+                    logger.info(f"Acquired Snowflake worker lease {lease.datacenter_id}/{lease.machine_id}")
+                    return lease
+            except Exception as e:
+                logger.warning(f"Snowflake lease registry unavailable: {e}")
+                return None
+
+        logger.warning(f"No free Snowflake machine ID in datacenter {self.datacenter_id}")
+        return None
+
+    def _heartbeat(self) -> None:
+        lease = self.lease
+        if lease is None:
+            self._set_lease(self._acquire())
+            return
+
+        started = time.monotonic()
+        try:
+            renewed = self._call(self.registry.renew, lease)
+        except Exception as e:
+            # the generator already stops sequencing locally once the lease is inside its margin
+            logger.warning(f"Snowflake lease renewal failed: {e}")
+            if not lease.is_valid():
+                logger.error("Snowflake lease about to expire unrenewed; leaving local sequencing")
+                self._set_lease(None)
+            return
+
+        if renewed:
+            lease.expires_at = started + lease.ttl
+        else:
+            logger.error(f"Snowflake worker lease {lease.datacenter_id}/{lease.machine_id} was lost")
+            self._set_lease(self._acquire())
+
+    def _set_lease(self, lease: Optional[WorkerLease]) -> None:
+        changed = lease is not self.lease
+        self.lease = lease
+        if changed and self.on_change is not None:
+            self.on_change(lease)
+
+
+def build_lease_registry():
+    """Registry selected by SNOWFLAKE_LEASE_BACKEND ('redis', 'database'), or None when leasing is off"""
+    backend = getattr(settings, 'SNOWFLAKE_LEASE_BACKEND', 'none')
+    if backend == 'redis':
+        return RedisLeaseRegistry()
+    if backend == 'database':
+        return DatabaseLeaseRegistry()
+    return None
+
+
+def start_worker_lease(on_change: Callable[[Optional[WorkerLease]], None]) -> Optional[WorkerLeaseManager]:
+    """Start leasing for this process if configured; the manager is stopped at exit"""
+    try:
+        registry = build_lease_registry()
+    except Exception as e:
+        logger.warning(f"Snowflake lease registry could not be created: {e}")
+        return None
+    if registry is None:
+        return None
+
+    manager = WorkerLeaseManager(
+        registry,
+        datacenter_id=getattr(settings, 'SNOWFLAKE_DATACENTER_ID', 1),
+        ttl=getattr(settings, 'SNOWFLAKE_LEASE_TTL', 30.0),
+        on_change=on_change,
+        exclude_machine_id=getattr(settings, 'SNOWFLAKE_MACHINE_ID', 1)
+    )
+    manager.start()
+    atexit.register(manager.stop)
+    return manager
@@ -68,6 +68,7 @@ MIDDLEWARE = [
     
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     'apps.core.jwt.middleware.JWTAuthMiddleware',  
+    'apps.core.jwt.middleware.RateLimitMiddleware',
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -175,9 +176,15 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
-    # Disable throttling until Redis is fixed
-    'DEFAULT_THROTTLE_CLASSES': [],
-    'DEFAULT_THROTTLE_RATES': {},
+    # Composite Redis throttling (apps.core.jwt.throttling); a None rate disables that dimension
+    'DEFAULT_THROTTLE_CLASSES': ['apps.core.jwt.throttling.CompositeRateThrottle'],
+    'DEFAULT_THROTTLE_RATES': {
+        'ip': env('THROTTLE_RATE_IP', default='300/min'),
+        'user': env('THROTTLE_RATE_USER', default='600/min'),
+        'global': env('THROTTLE_RATE_GLOBAL', default=None),
+        'login': env('THROTTLE_RATE_LOGIN', default='20/min'),
+        'login_email': env('THROTTLE_RATE_LOGIN_EMAIL', default='5/min'),
+    },
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
@@ -216,7 +223,9 @@ JWT_CONFIG = {
     'ACCESS_TOKEN_EXPIRY': env.int('JWT_ACCESS_EXPIRY', default=900),
     'REFRESH_TOKEN_EXPIRY': env.int('JWT_REFRESH_EXPIRY', default=604800), 
     'RESET_TOKEN_EXPIRY': env.int('JWT_RESET_EXPIRY', default=1800),
-    'ALGORITHM': 'HS256',  # Force RS256 for RSA keys
+    # HS256 (shared secret), or EdDSA / RS256 signed with JWT_PRIVATE_KEY under JWT_KEY_ID
+    'ALGORITHM': env('JWT_ALGORITHM', default='HS256'),
+    'KEY_ID': env('JWT_KEY_ID', default=''),
     'ISSUER': env('JWT_ISSUER', default='auth-service'),
     'AUDIENCE': env.list('JWT_AUDIENCE', default=['api']),
 }
@@ -267,6 +276,28 @@ else:
     # Use database for sessions when using locmem cache
     SESSION_ENGINE = "django.contrib.sessions.backends.db"
     
+# ──────────────────────────────
+# Rate limiting (RateLimitMiddleware + DRF throttles share one Redis limiter)
+# ──────────────────────────────
+RATE_LIMIT_ENABLED = env.bool("RATE_LIMIT_ENABLED", default=True)
+RATE_LIMIT_STRATEGY = env("RATE_LIMIT_STRATEGY", default="token_bucket")
+RATE_LIMIT_EXEMPT_PATHS = ("/static/", "/media/", "/tcc/health/")
+
+# Login lockouts (Redis): the n-th lockout lasts LOGIN_LOCKOUT_SECONDS * 2**(n-1), capped
+MAX_LOGIN_ATTEMPTS = env.int("MAX_LOGIN_ATTEMPTS", default=5)
+LOGIN_FAILURE_WINDOW_SECONDS = env.int("LOGIN_FAILURE_WINDOW_SECONDS", default=900)
+LOGIN_LOCKOUT_SECONDS = env.int("LOGIN_LOCKOUT_SECONDS", default=60)
+LOGIN_LOCKOUT_MAX_SECONDS = env.int("LOGIN_LOCKOUT_MAX_SECONDS", default=3600)
+
+# Password hashing: bcrypt on a dedicated process pool (apps.core.jwt.hashing).
+# Hashes beyond workers + queue are shed with PASSWORD_HASHER_SHED_STATUS and Retry-After;
+# changing BCRYPT_ROUNDS rehashes passwords on their next successful login.
+BCRYPT_ROUNDS = env.int("BCRYPT_ROUNDS", default=12)
+PASSWORD_HASHER_WORKERS = env.int("PASSWORD_HASHER_WORKERS", default=None)
+PASSWORD_HASHER_MAX_QUEUE = env.int("PASSWORD_HASHER_MAX_QUEUE", default=32)
+PASSWORD_HASHER_MAX_WAIT = env.float("PASSWORD_HASHER_MAX_WAIT", default=5.0)
+PASSWORD_HASHER_SHED_STATUS = env.int("PASSWORD_HASHER_SHED_STATUS", default=503)
+
 # ──────────────────────────────
 # CORS
 # ──────────────────────────────
@@ -372,12 +403,43 @@ ASYNC_TIMEOUT = env.int('ASYNC_TIMEOUT', default=30)
 SNOWFLAKE_DATACENTER_ID = env.int('SNOWFLAKE_DATACENTER_ID', default=1)
 SNOWFLAKE_MACHINE_ID = env.int('SNOWFLAKE_MACHINE_ID', default=1)
 SNOWFLAKE_EPOCH = env.int('SNOWFLAKE_EPOCH', default=1672531200000)
+# 'reserved': per-millisecond sequence ranges reserved from the cache, SNOWFLAKE_RESERVE_SIZE per INCRBY
+# 'local': no network at all - only safe when every process has its own machine ID
+SNOWFLAKE_SEQUENCE_MODE = env.str('SNOWFLAKE_SEQUENCE_MODE', default='reserved')
+SNOWFLAKE_RESERVE_SIZE = env.int('SNOWFLAKE_RESERVE_SIZE', default=64)
+# 'redis' or 'database': lease a machine ID per process (local sequencing); 'none': static IDs above
+SNOWFLAKE_LEASE_BACKEND = env.str('SNOWFLAKE_LEASE_BACKEND', default='none')
+SNOWFLAKE_LEASE_TTL = env.float('SNOWFLAKE_LEASE_TTL', default=30.0)
+
+# ──────────────────────────────
+# Audit Logging
+# ──────────────────────────────
+# 'sync': INSERT inside the request (no loss window)
+# 'spill': buffered; overflow and DB failures are appended to spill files and replayed
+# 'best_effort': buffered; overflow and DB failures are dropped (counted in stats)
+AUDIT_LOG_DURABILITY = env.str('AUDIT_LOG_DURABILITY', default='spill')
+AUDIT_LOG_BATCH_SIZE = env.int('AUDIT_LOG_BATCH_SIZE', default=200)
+AUDIT_LOG_FLUSH_INTERVAL = env.float('AUDIT_LOG_FLUSH_INTERVAL', default=1.0)
+AUDIT_LOG_MAX_QUEUE = env.int('AUDIT_LOG_MAX_QUEUE', default=10000)
+AUDIT_LOG_SPILL_DIR = env.str('AUDIT_LOG_SPILL_DIR', default=str(LOGS_DIR / 'audit_spill'))
+
+# Audit log retention: monthly partitions (MySQL) keyed on the Snowflake ID;
+# `manage.py archive_audit_logs` moves months older than the retention window
+# to gzipped JSONL in AUDIT_LOG_ARCHIVE_DIR and drops them from the table.
+# Point AUDIT_LOG_ARCHIVE_DIR at durable storage outside the checkout in production
+AUDIT_LOG_RETENTION_MONTHS = env.int('AUDIT_LOG_RETENTION_MONTHS', default=6)
+AUDIT_LOG_PARTITIONS_AHEAD = env.int('AUDIT_LOG_PARTITIONS_AHEAD', default=3)
+AUDIT_LOG_ARCHIVE_DIR = env.str('AUDIT_LOG_ARCHIVE_DIR', default=str(LOGS_DIR / 'audit_archive'))
 
 # ──────────────────────────────
 # Application Constants
 # ──────────────────────────────
 MAX_FILE_UPLOAD_SIZE = env.int('MAX_FILE_UPLOAD_SIZE', default=10)
 DEFAULT_PAGE_SIZE = env.int('DEFAULT_PAGE_SIZE', default=20)
+# Paginated totals: 'exact' (COUNT(*)), 'cached' (tag-invalidated) or 'estimated'
+PAGINATION_COUNT_MODE = env.str('PAGINATION_COUNT_MODE', default='exact')
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', default=300)
+PAGINATION_ESTIMATE_THRESHOLD = env.int('PAGINATION_ESTIMATE_THRESHOLD', default=100000)
 
 # ──────────────────────────────
 # Security Settings
@@ -59,7 +59,7 @@ REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
 )
 
 # No throttling in development
-REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {'anon': None, 'user': None}
+RATE_LIMIT_ENABLED = env.bool("RATE_LIMIT_ENABLED", default=False)
 
 # More permissive permissions in development
 REST_FRAMEWORK['DEFAULT_PERMISSION_CLASSES'] = [
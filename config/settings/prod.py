@@ -56,9 +56,6 @@ REST_FRAMEWORK['DEFAULT_PERMISSION_CLASSES'] = [
 ]
 
 # Enable throttling in production
-REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {
-    'anon': '100/day', 
-    'user': '1000/day'
-}
+RATE_LIMIT_ENABLED = True
 
 print("🔒 Production mode: All security features enabled")
\ No newline at end of file